@@ -0,0 +1,387 @@
+/**
+ * Storage for rate limits and connection counts
+ *
+ * Request limits use sliding-window counters: the count of the previous
+ * window is weighted by how much of it still overlaps the sliding window,
+ * which removes the 2× bursts fixed windows allow at their edges.
+ *
+ * Two implementations:
+ * - createMemoryRateLimitStore: per process, bounded and swept periodically
+ * - createSharedRateLimitStore: counters in a shared backend, so limits hold
+ *   across PM2 workers and machines
+ */
+
+export interface RateLimitRule {
+  key: string;
+  limit: number;
+  windowMs: number;
+}
+
+export interface RateLimitResult {
+  allowed: boolean;
+  /** The first rule that rejected the request */
+  rule?: RateLimitRule;
+  retryAfterMs?: number;
+}
+
+export interface RateLimitStore {
+  /** Count one request against every rule, or against none if any rejects. */
+  consume(rules: RateLimitRule[]): Promise<RateLimitResult>;
+  /** Current (weighted) request count for each rule. */
+  usage(rules: RateLimitRule[]): Promise<number[]>;
+  /** Take one of `max` concurrent slots for a key; returns its lease, or null if all are taken. */
+  acquire(key: string, max: number): Promise<string | null>;
+  /**
+   * Keep a lease alive; shared slots expire unless renewed. Resolves to
+   * false if the slot expired and another connection has taken it.
+   */
+  renew(lease: string): Promise<boolean>;
+  release(lease: string): Promise<void>;
+  /** Slots currently held for a key with at most `max` slots. */
+  held(key: string, max: number): Promise<number>;
+  /** Stop background sweeping. */
+  close(): void;
+}
+
+// How often expired counters are swept
+const SWEEP_INTERVAL_MS = 60 * 1000;
+// Shared slot owners are drawn below this, so that the sum of a few
+// colliding claims still fits a 32-bit counter
+const MAX_SLOT_OWNER = 2 ** 28;
+
+/**
+ * Estimated requests in the sliding window ending now.
+ */
+function slidingCount(previous: number, current: number, elapsed: number, windowMs: number): number {
+  return previous * Math.max(1 - elapsed / windowMs, 0) + current;
+}
+
+/**
+ * Time until one more request fits under the limit.
+ */
+function retryAfter(previous: number, current: number, limit: number, elapsed: number, windowMs: number): number {
+  // Waiting for the previous window to slide out is enough
+  if (current < limit && previous > 0) {
+    return Math.max(Math.ceil(windowMs * (1 - (limit - current - 1) / previous)) - elapsed, 0);
+  }
+  // Otherwise the current window has to become the previous one first
+  return windowMs - elapsed + Math.ceil(windowMs * Math.max(1 - (limit - 1) / Math.max(current, 1), 0));
+}
+
+function startSweeper(sweep: () => void): () => void {
+  const timer = setInterval(sweep, SWEEP_INTERVAL_MS);
+  // Never keep the process alive just to sweep
+  timer.unref?.();
+  return () => clearInterval(timer);
+}
+
+// ---------------------------------------------------------------------------
+// In-process store
+// ---------------------------------------------------------------------------
+
+interface WindowCounter {
+  /** Start of the current window */
+  windowStart: number;
+  windowMs: number;
+  previous: number;
+  current: number;
+}
+
+export interface MemoryRateLimitStoreOptions {
+  /** Maximum tracked request keys; least recently used are dropped first (default: 10000) */
+  maxKeys?: number;
+}
+
+export function createMemoryRateLimitStore(options: MemoryRateLimitStoreOptions = {}): RateLimitStore {
+  const maxKeys = options.maxKeys ?? 10000;
+  // Map iteration order doubles as LRU order
+  const counters = new Map<string, WindowCounter>();
+  // Key -> leases held on it, and lease -> key
+  const slots = new Map<string, Set<string>>();
+  const leases = new Map<string, string>();
+  let nextLease = 1;
+
+  // Roll the counter forward to the window containing `now`
+  const advance = (rule: RateLimitRule, now: number): WindowCounter => {
+    let counter = counters.get(rule.key);
+    if (!counter || counter.windowMs !== rule.windowMs) {
+      counter = { windowStart: now, windowMs: rule.windowMs, previous: 0, current: 0 };
+    } else {
+      const windows = Math.floor((now - counter.windowStart) / counter.windowMs);
+      if (windows > 0) {
+        counter.previous = windows === 1 ? counter.current : 0;
+        counter.current = 0;
+        counter.windowStart += windows * counter.windowMs;
+      }
+    }
+    counters.delete(rule.key);
+    counters.set(rule.key, counter);
+    return counter;
+  };
+
+  const evict = () => {
+    for (const key of counters.keys()) {
+      if (counters.size <= maxKeys) break;
+      counters.delete(key);
+    }
+  };
+
+  const stopSweeper = startSweeper(() => {
+    const now = Date.now();
+    for (const [key, counter] of counters) {
+      // Both windows have slid out: the counter is back to zero
+      if (now - counter.windowStart >= 2 * counter.windowMs) counters.delete(key);
+    }
+  });
+
+  return {
+    async consume(rules) {
+      const now = Date.now();
+      const advanced = rules.map((rule) => advance(rule, now));
+
+      for (let i = 0; i < rules.length; i++) {
+        const { limit } = rules[i];
+        const { previous, current, windowStart, windowMs } = advanced[i];
+        const elapsed = now - windowStart;
+        if (slidingCount(previous, current, elapsed, windowMs) + 1 > limit) {
+          return {
+            allowed: false,
+            rule: rules[i],
+            retryAfterMs: retryAfter(previous, current, limit, elapsed, windowMs),
+          };
+        }
+      }
+
+      for (const counter of advanced) counter.current++;
+      evict();
+      return { allowed: true };
+    },
+
+    async usage(rules) {
+      const now = Date.now();
+      return rules.map((rule) => {
+        const counter = counters.get(rule.key);
+        if (!counter) return 0;
+        const { previous, current, windowStart, windowMs } = advance(rule, now);
+        return Math.ceil(slidingCount(previous, current, now - windowStart, windowMs));
+      });
+    },
+
+    async acquire(key, max) {
+      let held = slots.get(key);
+      if ((held?.size ?? 0) >= max) return null;
+      if (!held) {
+        held = new Set();
+        slots.set(key, held);
+      }
+      const lease = `${key}#${nextLease++}`;
+      held.add(lease);
+      leases.set(lease, key);
+      return lease;
+    },
+
+    async renew(lease) {
+      // In-process slots live until released
+      return leases.has(lease);
+    },
+
+    async release(lease) {
+      const key = leases.get(lease);
+      if (key === undefined) return;
+      leases.delete(lease);
+      const held = slots.get(key);
+      held?.delete(lease);
+      if (held?.size === 0) slots.delete(key);
+    },
+
+    async held(key) {
+      return slots.get(key)?.size ?? 0;
+    },
+
+    close: stopSweeper,
+  };
+}
+
+// ---------------------------------------------------------------------------
+// Shared store
+// ---------------------------------------------------------------------------
+
+/**
+ * Atomic counters with expiry, as provided by Redis or a database.
+ */
+export interface CounterBackend {
+  /** Atomically add `by` (may be negative, floors at 0) and refresh the expiry; returns the new value. */
+  increment(key: string, by: number, ttlMs: number): Promise<number>;
+  /** Values of unexpired counters (0 for missing ones). */
+  get(keys: string[]): Promise<number[]>;
+  /** Delete expired counters. */
+  sweep(): Promise<void>;
+}
+
+export interface SharedRateLimitStoreOptions {
+  /** Prefix for every counter key (default: 'ratelimit') */
+  prefix?: string;
+  /**
+   * Expiry of a connection slot (default: 3 minutes). Leases must be renewed
+   * more often than this; a worker that dies without releasing its slots
+   * holds them at most this long.
+   */
+  slotTtlMs?: number;
+}
+
+export function createSharedRateLimitStore(
+  backend: CounterBackend,
+  options: SharedRateLimitStoreOptions = {}
+): RateLimitStore {
+  const prefix = options.prefix ?? 'ratelimit';
+  const slotTtlMs = options.slotTtlMs ?? 3 * 60 * 1000;
+
+  const windowKeys = (rule: RateLimitRule, now: number) => {
+    const window = Math.floor(now / rule.windowMs);
+    return {
+      current: `${prefix}:req:${rule.key}:${window}`,
+      previous: `${prefix}:req:${rule.key}:${window - 1}`,
+      elapsed: now - window * rule.windowMs,
+    };
+  };
+  // Each slot is its own counter, so a slot left behind by a dead worker
+  // expires on its own while other connections keep renewing theirs. A held
+  // slot's value is its owner token (0 when free) and the lease is
+  // "<slot key>#<owner>", so a lease can tell whether its slot was taken
+  // over after it expired.
+  const slotKeys = (key: string, max: number) =>
+    Array.from({ length: max }, (_, i) => `${prefix}:slots:${key}:${i}`);
+
+  const parseLease = (lease: string) => {
+    const separator = lease.lastIndexOf('#');
+    return { slot: lease.slice(0, separator), owner: Number(lease.slice(separator + 1)) };
+  };
+
+  // Add the owner to a free slot; a concurrent claim makes the sum differ
+  // from either owner, and the loser backs out
+  const claim = async (slot: string, owner: number): Promise<boolean> => {
+    if ((await backend.increment(slot, owner, slotTtlMs)) === owner) return true;
+    await backend.increment(slot, -owner, slotTtlMs);
+    return false;
+  };
+
+  const stopSweeper = startSweeper(() => {
+    backend.sweep().catch(() => {
+      // Best-effort; the next sweep retries
+    });
+  });
+
+  return {
+    async consume(rules) {
+      const now = Date.now();
+      const keys = rules.map((rule) => windowKeys(rule, now));
+
+      // Count first, then check: concurrent workers can never both slip
+      // under the limit, and a rejected request is taken back out
+      const [currents, previous] = await Promise.all([
+        Promise.all(rules.map((rule, i) => backend.increment(keys[i].current, 1, 2 * rule.windowMs))),
+        backend.get(keys.map((k) => k.previous)),
+      ]);
+
+      const rejected = rules.findIndex(
+        (rule, i) => slidingCount(previous[i], currents[i], keys[i].elapsed, rule.windowMs) > rule.limit
+      );
+      if (rejected === -1) return { allowed: true };
+
+      await Promise.all(rules.map((rule, i) => backend.increment(keys[i].current, -1, 2 * rule.windowMs)));
+
+      const rule = rules[rejected];
+      return {
+        allowed: false,
+        rule,
+        retryAfterMs: retryAfter(
+          previous[rejected],
+          currents[rejected] - 1,
+          rule.limit,
+          keys[rejected].elapsed,
+          rule.windowMs
+        ),
+      };
+    },
+
+    async usage(rules) {
+      const now = Date.now();
+      const keys = rules.map((rule) => windowKeys(rule, now));
+      const values = await backend.get(keys.flatMap((k) => [k.previous, k.current]));
+      return rules.map((rule, i) =>
+        Math.ceil(slidingCount(values[2 * i], values[2 * i + 1], keys[i].elapsed, rule.windowMs))
+      );
+    },
+
+    async acquire(key, max) {
+      const keys = slotKeys(key, max);
+      const values = await backend.get(keys);
+      const owner = 1 + Math.floor(Math.random() * (MAX_SLOT_OWNER - 1));
+
+      for (let i = 0; i < keys.length; i++) {
+        if (values[i] === 0 && (await claim(keys[i], owner))) return `${keys[i]}#${owner}`;
+      }
+      return null;
+    },
+
+    async renew(lease) {
+      const { slot, owner } = parseLease(lease);
+      const [value] = await backend.get([slot]);
+      if (value === owner) {
+        await backend.increment(slot, 0, slotTtlMs);
+        return true;
+      }
+      // Expired because renewals came late: take the slot back only if no
+      // other connection has claimed it in the meantime
+      return value === 0 && claim(slot, owner);
+    },
+
+    async release(lease) {
+      const { slot, owner } = parseLease(lease);
+      const [value] = await backend.get([slot]);
+      // An expired slot may belong to another connection by now
+      if (value === owner) await backend.increment(slot, -owner, slotTtlMs);
+    },
+
+    async held(key, max) {
+      const values = await backend.get(slotKeys(key, max));
+      return values.reduce((sum, value) => sum + Math.min(value, 1), 0);
+    },
+
+    close: stopSweeper,
+  };
+}
+
+/**
+ * In-process CounterBackend, standing in for the shared backend in tests
+ * and single-process development.
+ */
+export function createMemoryCounterBackend(): CounterBackend {
+  const counters = new Map<string, { value: number; expiresAt: number }>();
+
+  const read = (key: string, now: number) => {
+    const counter = counters.get(key);
+    return counter && counter.expiresAt > now ? counter.value : 0;
+  };
+
+  return {
+    async increment(key, by, ttlMs) {
+      const now = Date.now();
+      const value = Math.max(read(key, now) + by, 0);
+      counters.set(key, { value, expiresAt: now + ttlMs });
+      return value;
+    },
+
+    async get(keys) {
+      const now = Date.now();
+      return keys.map((key) => read(key, now));
+    },
+
+    async sweep() {
+      const now = Date.now();
+      for (const [key, counter] of counters) {
+        if (counter.expiresAt <= now) counters.delete(key);
+      }
+    },
+  };
+}
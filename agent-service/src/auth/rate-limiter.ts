@@ -1,12 +1,19 @@
 /**
- * Simple in-memory rate limiter
- * For production, consider Redis-based rate limiting
+ * Rate limiting for agent requests and connections
+ *
+ * Limits are kept in a RateLimitStore: in-process by default, or in the
+ * shared Postgres counters (RATE_LIMIT_STORE=shared) when several workers
+ * or instances serve traffic, e.g. PM2 cluster mode.
  */
 
-interface RateLimitEntry {
-  count: number;
-  resetTime: number;
-}
+import {
+  createMemoryRateLimitStore,
+  createSharedRateLimitStore,
+  type RateLimitRule,
+  type RateLimitStore,
+} from './rate-limit-store.js';
+import { createSupabaseCounterBackend } from '../db/rate-limit-counters.js';
+import { authLogger } from '../utils/logger.js';
 
 // Rate limit configuration
 const CONFIG = {
@@ -21,111 +28,149 @@ const CONFIG = {
   MAX_CONCURRENT_CONNECTIONS: 3,
 };
 
-// Storage
-const userMinuteRequests = new Map<string, RateLimitEntry>();
-const userHourRequests = new Map<string, RateLimitEntry>();
-const globalMinuteRequests: RateLimitEntry = { count: 0, resetTime: Date.now() + 60000 };
-const userConnections = new Map<string, number>();
+const MINUTE = 60 * 1000;
+const HOUR = 60 * MINUTE;
+
+// How often open connections renew their slot; shared slots expire after
+// three missed renewals
+export const CONNECTION_RENEW_INTERVAL_MS = MINUTE;
+
+let store: RateLimitStore =
+  process.env.RATE_LIMIT_STORE === 'shared'
+    ? createSharedRateLimitStore(createSupabaseCounterBackend(), {
+        slotTtlMs: 3 * CONNECTION_RENEW_INTERVAL_MS,
+      })
+    : createMemoryRateLimitStore();
 
 /**
- * Check if a request should be rate limited
- * @returns Object with allowed boolean and reason if blocked
+ * A concurrent connection slot held for a user
  */
-export function checkRateLimit(userId: string): { allowed: boolean; reason?: string; retryAfter?: number } {
-  const now = Date.now();
+export interface ConnectionLease {
+  userId: string;
+  /** Store lease, or null if the store was unavailable when connecting */
+  lease: string | null;
+}
 
-  // Check global rate limit
-  if (now > globalMinuteRequests.resetTime) {
-    globalMinuteRequests.count = 0;
-    globalMinuteRequests.resetTime = now + 60000;
-  }
-  if (globalMinuteRequests.count >= CONFIG.GLOBAL_REQUESTS_PER_MINUTE) {
-    return {
-      allowed: false,
-      reason: 'Global rate limit exceeded. Please try again later.',
-      retryAfter: Math.ceil((globalMinuteRequests.resetTime - now) / 1000),
-    };
-  }
+/**
+ * Replace the rate limit store (e.g. with a local stand-in in tests)
+ */
+export function setRateLimitStore(next: RateLimitStore): void {
+  store.close();
+  store = next;
+}
 
-  // Check user per-minute limit
-  let userMinute = userMinuteRequests.get(userId);
-  if (!userMinute || now > userMinute.resetTime) {
-    userMinute = { count: 0, resetTime: now + 60000 };
-    userMinuteRequests.set(userId, userMinute);
+function requestRules(userId: string): RateLimitRule[] {
+  return [
+    { key: 'global:minute', limit: CONFIG.GLOBAL_REQUESTS_PER_MINUTE, windowMs: MINUTE },
+    { key: `user:${userId}:minute`, limit: CONFIG.USER_REQUESTS_PER_MINUTE, windowMs: MINUTE },
+    { key: `user:${userId}:hour`, limit: CONFIG.USER_REQUESTS_PER_HOUR, windowMs: HOUR },
+  ];
+}
+
+function rejectionReason(rule: RateLimitRule): string {
+  if (rule.key.startsWith('global:')) {
+    return 'Global rate limit exceeded. Please try again later.';
   }
-  if (userMinute.count >= CONFIG.USER_REQUESTS_PER_MINUTE) {
-    return {
-      allowed: false,
-      reason: `Rate limit exceeded (${CONFIG.USER_REQUESTS_PER_MINUTE}/minute). Please slow down.`,
-      retryAfter: Math.ceil((userMinute.resetTime - now) / 1000),
-    };
+  if (rule.windowMs === HOUR) {
+    return `Hourly rate limit exceeded (${CONFIG.USER_REQUESTS_PER_HOUR}/hour). Please try again later.`;
   }
+  return `Rate limit exceeded (${CONFIG.USER_REQUESTS_PER_MINUTE}/minute). Please slow down.`;
+}
+
+// The limiter fails open: an unreachable store must not take the service down
+function storeFailed(operation: string, error: unknown, userId: string): void {
+  authLogger.warn('Rate limit store unavailable, failing open', {
+    userId,
+    metadata: {
+      operation,
+      error: error instanceof Error ? error.message : String(error),
+    },
+  });
+}
+
+/**
+ * Check if a request should be rate limited
+ * @returns Object with allowed boolean and reason if blocked
+ */
+export async function checkRateLimit(userId: string): Promise<{ allowed: boolean; reason?: string; retryAfter?: number }> {
+  try {
+    const result = await store.consume(requestRules(userId));
+    if (result.allowed || !result.rule) return { allowed: true };
 
-  // Check user per-hour limit
-  let userHour = userHourRequests.get(userId);
-  if (!userHour || now > userHour.resetTime) {
-    userHour = { count: 0, resetTime: now + 3600000 };
-    userHourRequests.set(userId, userHour);
-  }
-  if (userHour.count >= CONFIG.USER_REQUESTS_PER_HOUR) {
     return {
       allowed: false,
-      reason: `Hourly rate limit exceeded (${CONFIG.USER_REQUESTS_PER_HOUR}/hour). Please try again later.`,
-      retryAfter: Math.ceil((userHour.resetTime - now) / 1000),
+      reason: rejectionReason(result.rule),
+      retryAfter: Math.ceil((result.retryAfterMs ?? 0) / 1000),
     };
+  } catch (error) {
+    storeFailed('checkRateLimit', error, userId);
+    return { allowed: true };
   }
-
-  // Increment counters
-  globalMinuteRequests.count++;
-  userMinute.count++;
-  userHour.count++;
-
-  return { allowed: true };
 }
 
 /**
  * Track connection count for a user
- * @returns true if connection is allowed, false if limit exceeded
+ * @returns The connection's slot, or null if the limit is exceeded
+ */
+export async function trackConnection(userId: string): Promise<ConnectionLease | null> {
+  try {
+    const lease = await store.acquire(`connections:${userId}`, CONFIG.MAX_CONCURRENT_CONNECTIONS);
+    return lease === null ? null : { userId, lease };
+  } catch (error) {
+    storeFailed('trackConnection', error, userId);
+    return { userId, lease: null };
+  }
+}
+
+/**
+ * Keep a connection slot alive; call every CONNECTION_RENEW_INTERVAL_MS
  */
-export function trackConnection(userId: string): boolean {
-  const current = userConnections.get(userId) || 0;
-  if (current >= CONFIG.MAX_CONCURRENT_CONNECTIONS) {
-    return false;
+export async function renewConnection({ userId, lease }: ConnectionLease): Promise<void> {
+  if (lease === null) return;
+  try {
+    if (!(await store.renew(lease))) {
+      authLogger.warn('Connection slot was taken over after expiring', { userId, metadata: { lease } });
+    }
+  } catch (error) {
+    storeFailed('renewConnection', error, userId);
   }
-  userConnections.set(userId, current + 1);
-  return true;
 }
 
 /**
  * Release a connection slot for a user
  */
-export function releaseConnection(userId: string): void {
-  const current = userConnections.get(userId) || 0;
-  if (current > 0) {
-    userConnections.set(userId, current - 1);
+export async function releaseConnection({ userId, lease }: ConnectionLease): Promise<void> {
+  if (lease === null) return;
+  try {
+    await store.release(lease);
+  } catch (error) {
+    storeFailed('releaseConnection', error, userId);
   }
 }
 
 /**
  * Get current rate limit status for a user (for debugging/monitoring)
  */
-export function getRateLimitStatus(userId: string): {
+export async function getRateLimitStatus(userId: string): Promise<{
   minuteUsed: number;
   minuteLimit: number;
   hourUsed: number;
   hourLimit: number;
   connections: number;
   connectionLimit: number;
-} {
-  const userMinute = userMinuteRequests.get(userId);
-  const userHour = userHourRequests.get(userId);
+}> {
+  const [, userMinute, userHour] = requestRules(userId);
+  const [[minuteUsed, hourUsed], connections] = await Promise.all([
+    store.usage([userMinute, userHour]),
+    store.held(`connections:${userId}`, CONFIG.MAX_CONCURRENT_CONNECTIONS),
+  ]);
 
   return {
-    minuteUsed: userMinute?.count || 0,
+    minuteUsed,
     minuteLimit: CONFIG.USER_REQUESTS_PER_MINUTE,
-    hourUsed: userHour?.count || 0,
+    hourUsed,
     hourLimit: CONFIG.USER_REQUESTS_PER_HOUR,
-    connections: userConnections.get(userId) || 0,
+    connections,
     connectionLimit: CONFIG.MAX_CONCURRENT_CONNECTIONS,
   };
 }
@@ -1,5 +1,7 @@
 import type { AgentMessage } from '../db/messages.js';
 import { getConversationMessages } from '../db/messages.js';
+import { CACHED_MESSAGES_PER_CONVERSATION, getCachedMessages } from '../db/message-cache.js';
+import { countTokens } from './tokens.js';
 
 /**
  * Format for Claude Agent SDK resume messages
@@ -16,38 +18,79 @@ export interface HistoryMessage {
 export interface HistoryOptions {
   /** Maximum number of message pairs to include (default: 20) */
   maxPairs?: number;
-  /** Maximum estimated characters to include (default: 100000) */
-  maxChars?: number;
+  /** Maximum tokens of history to include (default: 25000) */
+  maxTokens?: number;
+}
+
+/**
+ * History selected for a turn
+ */
+export interface ConversationHistory {
+  messages: HistoryMessage[];
+  /** Tokens the messages take up in the prompt */
+  tokens: number;
+  /** Whether the history was served from the in-process cache */
+  cached: boolean;
 }
 
 const DEFAULT_MAX_PAIRS = 20;
-const DEFAULT_MAX_CHARS = 100000;
+const DEFAULT_MAX_TOKENS = 25000;
+
+// Per-message overhead of the "Human: " / "Assistant: " prefix and newline
+const MESSAGE_OVERHEAD_TOKENS = 3;
+
+interface FormattedHistory {
+  version: number;
+  messages: HistoryMessage[];
+  tokens: number[];
+}
+
+// Formatted history per cached message list, rebuilt only when it changed
+const formattedCache = new WeakMap<readonly AgentMessage[], FormattedHistory>();
 
 /**
  * Fetch and format conversation history for Claude
  *
- * Retrieves messages from Supabase and formats them for the Agent SDK.
- * Tool use/result messages are collapsed into the assistant message content.
+ * Messages come from the in-process cache (loaded from Supabase on a miss)
+ * and are formatted for the Agent SDK. Tool use/result messages are
+ * collapsed into the assistant message content.
  */
 export async function getConversationHistory(
   conversationId: string,
   options: HistoryOptions = {}
-): Promise<HistoryMessage[]> {
-  // Fetch only recent messages from DB (performance optimization)
+): Promise<ConversationHistory> {
   // Max 20 pairs × ~4 messages per pair (user, assistant, tool_use, tool_result) = 80
-  // Add buffer to 100 to ensure we have enough after filtering
-  const messages = await getConversationMessages(conversationId, 100);
+  // The cache keeps the last 100 to leave a buffer after filtering
+  const { messages, version, hit } = await getCachedMessages(conversationId, () =>
+    getConversationMessages(conversationId, CACHED_MESSAGES_PER_CONVERSATION)
+  );
 
   if (messages.length === 0) {
-    return [];
+    return { messages: [], tokens: 0, cached: hit };
   }
 
-  // Filter to user and assistant messages only
-  // Tool use/result are considered part of the assistant's turn
-  const formatted = formatMessagesForSDK(messages);
+  let formatted = formattedCache.get(messages);
+  if (!formatted || formatted.version !== version) {
+    // Filter to user and assistant messages only
+    // Tool use/result are considered part of the assistant's turn
+    const sdkMessages = formatMessagesForSDK(messages);
+    formatted = {
+      version,
+      messages: sdkMessages,
+      tokens: countMessageTokens(sdkMessages, formatted),
+    };
+    formattedCache.set(messages, formatted);
+  }
 
   // Apply limits
-  return truncateHistory(formatted, options);
+  return { ...truncateHistory(formatted, options), cached: hit };
+}
+
+// Token counts of unchanged messages are carried over from the previous format
+function countMessageTokens(messages: HistoryMessage[], previous?: FormattedHistory): number[] {
+  const known = new Map<string, number>();
+  previous?.messages.forEach((msg, i) => known.set(msg.content, previous.tokens[i]));
+  return messages.map((msg) => known.get(msg.content) ?? countTokens(msg.content) + MESSAGE_OVERHEAD_TOKENS);
 }
 
 /**
@@ -56,7 +99,7 @@ export async function getConversationHistory(
  * Combines tool_use and tool_result into assistant messages
  * since they represent the assistant's reasoning process
  */
-function formatMessagesForSDK(messages: AgentMessage[]): HistoryMessage[] {
+function formatMessagesForSDK(messages: readonly AgentMessage[]): HistoryMessage[] {
   const result: HistoryMessage[] = [];
   let currentAssistantContent = '';
   let inAssistantTurn = false;
@@ -126,37 +169,30 @@ function abbreviateToolResult(content: string, maxLength = 500): string {
  * are not split
  */
 function truncateHistory(
-  messages: HistoryMessage[],
+  history: FormattedHistory,
   options: HistoryOptions
-): HistoryMessage[] {
-  const maxPairs = options.maxPairs ?? DEFAULT_MAX_PAIRS;
-  const maxChars = options.maxChars ?? DEFAULT_MAX_CHARS;
-
-  // Start from most recent, work backwards
-  const result: HistoryMessage[] = [];
-  let totalChars = 0;
-  let pairs = 0;
-
-  // Process in reverse to keep most recent
-  for (let i = messages.length - 1; i >= 0; i--) {
-    const msg = messages[i];
-    const msgChars = msg.content.length;
-
-    // Check limits
-    if (pairs >= maxPairs * 2) break; // maxPairs * 2 because each pair is 2 messages
-    if (totalChars + msgChars > maxChars) break;
-
-    result.unshift(msg);
-    totalChars += msgChars;
-    pairs++;
+): Omit<ConversationHistory, 'cached'> {
+  const maxMessages = (options.maxPairs ?? DEFAULT_MAX_PAIRS) * 2;
+  const maxTokens = options.maxTokens ?? DEFAULT_MAX_TOKENS;
+  const { messages, tokens } = history;
+
+  // Walk back from the most recent message to find where the window starts
+  let start = messages.length;
+  let totalTokens = 0;
+  while (start > 0 && messages.length - start < maxMessages) {
+    const msgTokens = tokens[start - 1];
+    if (totalTokens + msgTokens > maxTokens) break;
+    totalTokens += msgTokens;
+    start--;
   }
 
   // Ensure we start with a user message for proper context
-  while (result.length > 0 && result[0].role !== 'user') {
-    result.shift();
+  while (start < messages.length && messages[start].role !== 'user') {
+    totalTokens -= tokens[start];
+    start++;
   }
 
-  return result;
+  return { messages: messages.slice(start), tokens: totalTokens };
 }
 
 /**
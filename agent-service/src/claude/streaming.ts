@@ -1,10 +1,11 @@
-import { WebSocket } from 'ws';
+import type { WebSocket } from 'ws';
 import { v4 as uuidv4 } from 'uuid';
 import { createAgentQuery } from './client.js';
-import { getConversationHistory, type HistoryMessage } from './history.js';
-import { saveMessage } from '../db/messages.js';
+import { getConversationHistory, type ConversationHistory } from './history.js';
+import { createMessageBuffer } from '../db/message-buffer.js';
 import { agentLogger } from '../utils/logger.js';
-import type { WSAssistantChunk, WSToolUse, WSToolResult, WSDone } from '../websocket/types.js';
+import { createOutboundStream } from '../websocket/outbound.js';
+import type { WSToolUse, WSToolResult, WSDone, WSError } from '../websocket/types.js';
 
 export async function processUserMessage(
   ws: WebSocket,
@@ -16,16 +17,22 @@ export async function processUserMessage(
   let fullContent = '';
   let toolCallCount = 0;
   const startTime = Date.now();
+  let historyFetchTime: number | undefined;
+  let firstChunkTime: number | undefined;
+  let historyCached: boolean | undefined;
+  // Deltas are coalesced into fewer frames; messages are persisted in batches
+  const outbound = createOutboundStream(ws, conversationId, messageId);
+  const pendingMessages = createMessageBuffer(conversationId);
 
   try {
     // Fetch conversation history for context
     const historyStartTime = Date.now();
-    let history: HistoryMessage[];
+    let history: ConversationHistory;
 
     try {
       history = await getConversationHistory(conversationId, {
         maxPairs: 20,      // Last 20 exchanges
-        maxChars: 100000,  // ~25k tokens estimate
+        maxTokens: 25000,
       });
     } catch (error) {
       // If history fetch fails, continue without context (graceful degradation)
@@ -36,27 +43,26 @@ export async function processUserMessage(
           error: error instanceof Error ? error.message : String(error),
         },
       });
-      history = [];
+      history = { messages: [], tokens: 0, cached: false };
     }
 
-    const historyFetchTime = Date.now() - historyStartTime;
-    const estimatedTokens = Math.floor(
-      history.reduce((sum, m) => sum + m.content.length, 0) / 4
-    );
+    historyFetchTime = Date.now() - historyStartTime;
+    historyCached = history.cached;
 
     agentLogger.debug('Loaded conversation history', {
       conversationId,
       requestId,
       metadata: {
-        messageCount: history.length,
-        estimatedTokens,
+        messageCount: history.messages.length,
+        tokens: history.tokens,
+        cached: history.cached,
         fetchTimeMs: historyFetchTime,
       },
     });
 
     // Use Agent SDK query with history context
     // Authentication uses CLAUDE_CODE_OAUTH_TOKEN from Claude Code's auth
-    const agentStream = createAgentQuery(content, { history });
+    const agentStream = createAgentQuery(content, { history: history.messages });
 
     for await (const message of agentStream) {
       // Handle different message types from Agent SDK
@@ -66,13 +72,10 @@ export async function processUserMessage(
           for (const block of message.message.content) {
             if ('text' in block && block.text) {
               fullContent += block.text;
+              firstChunkTime ??= Date.now() - startTime;
 
               // Stream text chunk to client
-              sendToClient<WSAssistantChunk>(ws, {
-                type: 'assistant_chunk',
-                conversation_id: conversationId,
-                data: { delta: block.text, message_id: messageId },
-              });
+              outbound.delta(block.text);
             } else if ('name' in block) {
               // Tool use block
               toolCallCount++;
@@ -84,7 +87,7 @@ export async function processUserMessage(
                 metadata: { tool: block.name, toolId, callNumber: toolCallCount },
               });
 
-              sendToClient<WSToolUse>(ws, {
+              outbound.send<WSToolUse>({
                 type: 'tool_use',
                 conversation_id: conversationId,
                 data: {
@@ -94,8 +97,8 @@ export async function processUserMessage(
                 },
               });
 
-              // Save tool use to DB
-              await saveMessage({
+              // Save tool use to DB (batched; waits only if the DB falls behind)
+              await pendingMessages.add({
                 id: toolId,
                 conversation_id: conversationId,
                 role: 'tool_use',
@@ -113,7 +116,7 @@ export async function processUserMessage(
             if ('type' in block && block.type === 'tool_result') {
               const toolResultBlock = block as { tool_use_id: string; content: string };
 
-              sendToClient<WSToolResult>(ws, {
+              outbound.send<WSToolResult>({
                 type: 'tool_result',
                 conversation_id: conversationId,
                 data: {
@@ -130,7 +133,7 @@ export async function processUserMessage(
                 ? toolResultBlock.content
                 : JSON.stringify(toolResultBlock.content);
 
-              await saveMessage({
+              await pendingMessages.add({
                 id: `result_${toolResultBlock.tool_use_id}`,
                 conversation_id: conversationId,
                 role: 'tool_result',
@@ -151,7 +154,7 @@ export async function processUserMessage(
             subtype: message.subtype,
             toolCallCount,
             responseLength: fullContent.length,
-            historyLength: history.length,
+            historyLength: history.messages.length,
           },
         });
       }
@@ -159,7 +162,7 @@ export async function processUserMessage(
 
     // Save assistant message if we have content
     if (fullContent) {
-      await saveMessage({
+      await pendingMessages.add({
         id: messageId,
         conversation_id: conversationId,
         role: 'assistant',
@@ -167,8 +170,11 @@ export async function processUserMessage(
       });
     }
 
+    // Persist the turn before reporting it done
+    await pendingMessages.flush();
+
     // Send done signal
-    sendToClient<WSDone>(ws, {
+    outbound.send<WSDone>({
       type: 'done',
       conversation_id: conversationId,
       data: { message_id: messageId },
@@ -176,6 +182,15 @@ export async function processUserMessage(
   } catch (error) {
     const errorMessage = error instanceof Error ? error.message : 'Unknown error';
 
+    // Keep what the turn produced before the failure
+    await pendingMessages.flush().catch((flushError: unknown) => {
+      agentLogger.error('Failed to persist messages after error', {
+        conversationId,
+        requestId,
+        metadata: { error: flushError instanceof Error ? flushError.message : String(flushError) },
+      });
+    });
+
     agentLogger.error('Agent error', {
       conversationId,
       requestId,
@@ -188,29 +203,35 @@ export async function processUserMessage(
 
     // Handle common errors with user-friendly messages
     if (errorMessage.includes('Claude Code not found')) {
-      sendToClient(ws, {
+      outbound.send<WSError>({
         type: 'error',
         conversation_id: conversationId,
         data: { message: 'Claude Code CLI not installed. Run: npm install -g @anthropic-ai/claude-code' },
       });
     } else if (errorMessage.includes('API key') || errorMessage.includes('authentication')) {
-      sendToClient(ws, {
+      outbound.send<WSError>({
         type: 'error',
         conversation_id: conversationId,
         data: { message: 'Authentication failed. Run "claude" in terminal to authenticate with OAuth.' },
       });
     } else {
-      sendToClient(ws, {
+      outbound.send<WSError>({
         type: 'error',
         conversation_id: conversationId,
         data: { message: `Failed to get response: ${errorMessage}` },
       });
     }
-  }
-}
-
-function sendToClient<T extends { type: string }>(ws: WebSocket, message: T): void {
-  if (ws.readyState === WebSocket.OPEN) {
-    ws.send(JSON.stringify(message));
+  } finally {
+    // Where the turn's latency went: loading history vs. waiting for the model
+    agentLogger.info('Turn timings', {
+      conversationId,
+      requestId,
+      duration: Date.now() - startTime,
+      metadata: {
+        historyFetchMs: historyFetchTime,
+        historyCached,
+        timeToFirstChunkMs: firstChunkTime,
+      },
+    });
   }
 }
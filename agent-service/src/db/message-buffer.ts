@@ -0,0 +1,126 @@
+import type { AgentMessage } from './messages.js';
+import { saveMessages } from './messages.js';
+import { dbLogger } from '../utils/logger.js';
+
+/**
+ * Write-behind buffer for the messages of one conversation turn
+ *
+ * Messages are stamped when they are produced and inserted in batches, at
+ * most one insert in flight, so persisting tool calls stays off the
+ * streaming path. When the database falls behind, `add` waits for the
+ * current insert before accepting more, which bounds memory per turn.
+ * A failed insert is retried after an exponential backoff.
+ */
+
+// Wait this long for more messages before inserting a batch
+const FLUSH_DELAY_MS = 200;
+// Insert as soon as this many messages are queued
+const MAX_BATCH_SIZE = 25;
+// Queued messages beyond which `add` waits for the database
+const MAX_PENDING = 100;
+// Attempts per batch before its messages are dropped
+const MAX_ATTEMPTS = 3;
+// Wait before the first retry of a failed batch; doubles per attempt
+const RETRY_DELAY_MS = 500;
+
+export interface MessageBuffer {
+  /** Queue a message; resolves immediately unless the database is behind. */
+  add(message: Omit<AgentMessage, 'created_at'>): Promise<void>;
+  /** Insert everything queued; rejects if any message could not be saved. */
+  flush(): Promise<void>;
+}
+
+/**
+ * Create the buffer for one turn. `save` inserts a batch (saveMessages
+ * unless given).
+ */
+export function createMessageBuffer(
+  conversationId: string,
+  save: (messages: AgentMessage[]) => Promise<void> = saveMessages
+): MessageBuffer {
+  let queue: AgentMessage[] = [];
+  let attempts = 0;
+  let inFlight: Promise<void> | null = null;
+  let timer: ReturnType<typeof setTimeout> | null = null;
+  let failure: Error | null = null;
+
+  // Insert the queued messages, one batch after another
+  const drain = (): Promise<void> => {
+    if (timer) {
+      clearTimeout(timer);
+      timer = null;
+    }
+    if (inFlight || queue.length === 0) return inFlight ?? Promise.resolve();
+
+    const batch = queue.slice(0, MAX_BATCH_SIZE);
+    const startTime = Date.now();
+    inFlight = save(batch)
+      .then(() => {
+        queue = queue.slice(batch.length);
+        attempts = 0;
+        dbLogger.debug('Saved message batch', {
+          conversationId,
+          duration: Date.now() - startTime,
+          metadata: { count: batch.length, pending: queue.length },
+        });
+      })
+      .catch((error: unknown) => {
+        // Retried after a backoff, which holds the in-flight slot so that
+        // neither full batches nor flush() can retry early
+        if (++attempts < MAX_ATTEMPTS) {
+          const delay = RETRY_DELAY_MS * 2 ** (attempts - 1);
+          const message = error instanceof Error ? error.message : String(error);
+          dbLogger.warn('Retrying message batch', {
+            conversationId,
+            metadata: { count: batch.length, attempt: attempts, delay, error: message },
+          });
+          return new Promise<void>((resolve) => setTimeout(resolve, delay));
+        }
+        queue = queue.slice(batch.length);
+        attempts = 0;
+        failure = error instanceof Error ? error : new Error(String(error));
+        dbLogger.error('Dropped message batch', {
+          conversationId,
+          metadata: { count: batch.length, error: failure.message },
+        });
+      })
+      .finally(() => {
+        inFlight = null;
+        if (queue.length >= MAX_BATCH_SIZE) void drain();
+        else if (queue.length > 0) schedule();
+      });
+    return inFlight;
+  };
+
+  const schedule = () => {
+    timer ??= setTimeout(() => {
+      timer = null;
+      void drain();
+    }, FLUSH_DELAY_MS);
+  };
+
+  return {
+    async add(message) {
+      queue.push({ ...message, created_at: new Date().toISOString() });
+
+      if (queue.length >= MAX_BATCH_SIZE) void drain();
+      else schedule();
+
+      // Backpressure: let the database catch up before queueing more
+      while (queue.length > MAX_PENDING && inFlight) {
+        await inFlight;
+      }
+    },
+
+    async flush() {
+      while (queue.length > 0) {
+        await drain();
+      }
+      if (failure) {
+        const error = failure;
+        failure = null;
+        throw error;
+      }
+    },
+  };
+}
@@ -0,0 +1,142 @@
+import type { AgentMessage } from './messages.js';
+
+/**
+ * In-process cache of recent messages per conversation
+ *
+ * A conversation lives on one WebSocket connection (and so on one worker),
+ * which makes this process the only writer while the connection is open.
+ * Entries are loaded from Supabase once, kept current by saveMessage, and
+ * evicted by LRU order and TTL.
+ */
+
+// Most recent messages kept per conversation (matches the history fetch)
+export const CACHED_MESSAGES_PER_CONVERSATION = 100;
+// Maximum conversations kept in memory
+const MAX_CONVERSATIONS = 500;
+// Entries not used for this long are reloaded from the database
+const ENTRY_TTL_MS = 15 * 60 * 1000;
+
+interface CacheEntry {
+  messages: AgentMessage[];
+  ids: Set<string>;
+  /** Bumped on every change, for consumers that memoize derived data. */
+  version: number;
+  lastAccess: number;
+}
+
+export interface CachedMessages {
+  /** Recent messages in chronological order; do not mutate. */
+  messages: readonly AgentMessage[];
+  /** Changes whenever the cached messages change. */
+  version: number;
+  /** Whether the messages were served without a database read. */
+  hit: boolean;
+}
+
+interface PendingLoad {
+  promise: Promise<CacheEntry>;
+  /** Messages saved while the load was in flight. */
+  saved: AgentMessage[];
+}
+
+// Map iteration order doubles as LRU order (least recently used first)
+const entries = new Map<string, CacheEntry>();
+const loads = new Map<string, PendingLoad>();
+
+function isExpired(entry: CacheEntry, now: number): boolean {
+  return now - entry.lastAccess > ENTRY_TTL_MS;
+}
+
+function touch(conversationId: string, entry: CacheEntry, now: number): void {
+  entry.lastAccess = now;
+  entries.delete(conversationId);
+  entries.set(conversationId, entry);
+}
+
+function evict(now: number): void {
+  for (const [conversationId, entry] of entries) {
+    if (entries.size <= MAX_CONVERSATIONS && !isExpired(entry, now)) break;
+    entries.delete(conversationId);
+  }
+}
+
+// Insert in created_at order; saves usually complete in order, so this is
+// almost always a plain push
+function insertMessage(entry: CacheEntry, message: AgentMessage): boolean {
+  if (entry.ids.has(message.id)) return false;
+
+  const { messages } = entry;
+  let i = messages.length;
+  while (i > 0 && (messages[i - 1].created_at ?? '') > (message.created_at ?? '')) i--;
+  messages.splice(i, 0, message);
+  entry.ids.add(message.id);
+
+  if (messages.length > CACHED_MESSAGES_PER_CONVERSATION) {
+    for (const dropped of messages.splice(0, messages.length - CACHED_MESSAGES_PER_CONVERSATION)) {
+      entry.ids.delete(dropped.id);
+    }
+  }
+  entry.version++;
+  return true;
+}
+
+/**
+ * Get the recent messages of a conversation, loading them on a miss.
+ * Concurrent misses for the same conversation share one load.
+ */
+export async function getCachedMessages(
+  conversationId: string,
+  load: () => Promise<AgentMessage[]>
+): Promise<CachedMessages> {
+  const now = Date.now();
+  const cached = entries.get(conversationId);
+  if (cached && !isExpired(cached, now)) {
+    touch(conversationId, cached, now);
+    return { messages: cached.messages, version: cached.version, hit: true };
+  }
+  entries.delete(conversationId);
+
+  let pending = loads.get(conversationId);
+  if (!pending) {
+    const saved: AgentMessage[] = [];
+    const promise = load()
+      .then((messages) => {
+        const entry: CacheEntry = { messages: [], ids: new Set(), version: 0, lastAccess: Date.now() };
+        for (const message of messages) insertMessage(entry, message);
+        for (const message of saved) insertMessage(entry, message);
+        // Invalidated while loading: serve the result but do not cache it
+        if (loads.get(conversationId)?.promise === promise) {
+          entries.set(conversationId, entry);
+          evict(entry.lastAccess);
+        }
+        return entry;
+      })
+      .finally(() => {
+        if (loads.get(conversationId)?.promise === promise) loads.delete(conversationId);
+      });
+    pending = { promise, saved };
+    loads.set(conversationId, pending);
+  }
+
+  const entry = await pending.promise;
+  return { messages: entry.messages, version: entry.version, hit: false };
+}
+
+/**
+ * Record a message that was just written to the database.
+ * Conversations that are not cached are left alone; they load on next use.
+ */
+export function recordSavedMessage(message: AgentMessage): void {
+  const entry = entries.get(message.conversation_id);
+  if (entry) insertMessage(entry, message);
+  loads.get(message.conversation_id)?.saved.push(message);
+}
+
+/**
+ * Drop a conversation from the cache (e.g. when a new connection takes it
+ * over, since another worker may have written to it in the meantime).
+ */
+export function invalidateConversation(conversationId: string): void {
+  entries.delete(conversationId);
+  loads.delete(conversationId);
+}
@@ -1,4 +1,5 @@
 import { supabase } from './supabase.js';
+import { recordSavedMessage } from './message-cache.js';
 
 export interface AgentMessage {
   id: string;
@@ -12,17 +13,43 @@ export interface AgentMessage {
 }
 
 export async function saveMessage(message: Omit<AgentMessage, 'created_at'>): Promise<void> {
+  const row: AgentMessage = {
+    ...message,
+    created_at: new Date().toISOString(),
+  };
+
   const { error } = await supabase
     .from('agent_messages')
-    .insert({
-      ...message,
-      created_at: new Date().toISOString(),
-    });
+    .insert(row);
 
   if (error) {
     console.error('Failed to save message:', error);
     throw new Error(`Failed to save message: ${error.message}`);
   }
+
+  // Keep the in-process history current without re-reading it
+  recordSavedMessage(row);
+}
+
+/**
+ * Insert several messages with one round-trip.
+ * Rows keep the created_at they were stamped with when they were produced.
+ */
+export async function saveMessages(messages: AgentMessage[]): Promise<void> {
+  if (messages.length === 0) return;
+
+  const { error } = await supabase
+    .from('agent_messages')
+    .insert(messages);
+
+  if (error) {
+    console.error('Failed to save messages:', error);
+    throw new Error(`Failed to save messages: ${error.message}`);
+  }
+
+  for (const message of messages) {
+    recordSavedMessage(message);
+  }
 }
 
 export async function getConversationMessages(
@@ -44,7 +71,7 @@ export async function getConversationMessages(
 
   if (error) {
     console.error('Failed to get messages:', error);
-    return [];
+    throw new Error(`Failed to get messages: ${error.message}`);
   }
 
   // Reverse to chronological order (oldest first)
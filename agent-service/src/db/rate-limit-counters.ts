@@ -0,0 +1,48 @@
+import { supabase } from './supabase.js';
+import type { CounterBackend } from '../auth/rate-limit-store.js';
+
+/**
+ * Shared rate limit counters in Postgres (see migrations/create_rate_limit_counters.sql)
+ *
+ * Every worker of every instance talks to the same table, so limits and
+ * connection counts are enforced globally.
+ */
+export function createSupabaseCounterBackend(): CounterBackend {
+  return {
+    async increment(key, by, ttlMs) {
+      const { data, error } = await supabase.rpc('rate_limit_increment', {
+        p_key: key,
+        p_by: by,
+        p_ttl_ms: ttlMs,
+      });
+
+      if (error) {
+        throw new Error(`Failed to update rate limit counter: ${error.message}`);
+      }
+      return data as number;
+    },
+
+    async get(keys) {
+      const { data, error } = await supabase
+        .from('rate_limit_counters')
+        .select('key, value')
+        .in('key', keys)
+        .gt('expires_at', new Date().toISOString());
+
+      if (error) {
+        throw new Error(`Failed to read rate limit counters: ${error.message}`);
+      }
+
+      const values = new Map((data || []).map((row) => [row.key as string, row.value as number]));
+      return keys.map((key) => values.get(key) ?? 0);
+    },
+
+    async sweep() {
+      const { error } = await supabase.rpc('rate_limit_sweep');
+
+      if (error) {
+        throw new Error(`Failed to sweep rate limit counters: ${error.message}`);
+      }
+    },
+  };
+}
@@ -0,0 +1,88 @@
+import { execFile } from 'child_process';
+
+/**
+ * Running mentu commands
+ *
+ * Each command runs in its own process, without a shell, and is killed once
+ * it exceeds its timeout. A semaphore lets at most MAX_CONCURRENCY run at
+ * once; further calls wait in a bounded queue.
+ */
+
+const MENTU_PATH = process.env.MENTU_PATH || '/Users/rashid/Desktop/Workspaces/mentu-ai';
+const MENTU_BIN = process.env.MENTU_BIN || 'mentu';
+
+// Concurrent mentu commands across all conversations
+const MAX_CONCURRENCY = parseInt(process.env.MENTU_MAX_CONCURRENCY || '2', 10);
+// Calls allowed to wait for a free slot before new ones are rejected
+const MAX_QUEUE = 100;
+// Per-call timeout
+const CALL_TIMEOUT_MS = 30000;
+// Largest stdout/stderr accepted from one command
+const MAX_OUTPUT_BYTES = 10 * 1024 * 1024;
+
+export interface MentuOutput {
+  stdout: string;
+  stderr: string;
+}
+
+export type MentuExecutor = (args: string[]) => Promise<MentuOutput>;
+
+let running = 0;
+const queue: (() => void)[] = [];
+
+function execMentu(args: string[]): Promise<MentuOutput> {
+  return new Promise((resolve, reject) => {
+    execFile(
+      MENTU_BIN,
+      args,
+      {
+        cwd: MENTU_PATH,
+        maxBuffer: MAX_OUTPUT_BYTES,
+        timeout: CALL_TIMEOUT_MS,
+        killSignal: 'SIGKILL',
+      },
+      (error, stdout, stderr) => {
+        if (!error) {
+          resolve({ stdout, stderr });
+        } else if (error.killed) {
+          reject(new Error(`mentu ${args[0] ?? ''} timed out after ${CALL_TIMEOUT_MS}ms`));
+        } else {
+          reject(error);
+        }
+      }
+    );
+  });
+}
+
+let executor: MentuExecutor = execMentu;
+
+/**
+ * Replace how a command is run (e.g. with a stand-in in tests)
+ */
+export function setMentuExecutor(next: MentuExecutor): void {
+  executor = next;
+}
+
+/**
+ * Run a mentu command once a slot is free.
+ * Arguments are passed without a shell.
+ */
+export async function runMentu(args: string[]): Promise<MentuOutput> {
+  if (running >= MAX_CONCURRENCY) {
+    if (queue.length >= MAX_QUEUE) {
+      throw new Error('Too many pending mentu commands');
+    }
+    // A finishing call hands its slot straight to the next waiter
+    await new Promise<void>((resolve) => queue.push(resolve));
+  } else {
+    running++;
+  }
+
+  try {
+    return await executor(args);
+  } finally {
+    const next = queue.shift();
+    if (next) next();
+    else running--;
+  }
+}
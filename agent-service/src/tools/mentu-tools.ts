@@ -1,17 +1,15 @@
-import { exec } from 'child_process';
-import { promisify } from 'util';
+import { runMentu } from './mentu-exec.js';
 import type { ToolResult } from './registry.js';
 
-const execAsync = promisify(exec);
+// How long read-only results (status, show, list) are reused
+const READ_CACHE_TTL_MS = 5000;
 
-const MENTU_PATH = '/Users/rashid/Desktop/Workspaces/mentu-ai';
+// Cached read results, shared by concurrent identical calls while in flight
+const readCache = new Map<string, { expiresAt: number; result: Promise<ToolResult> }>();
 
-async function runMentuCommand(cmd: string): Promise<ToolResult> {
+async function runMentuCommand(args: string[]): Promise<ToolResult> {
   try {
-    const { stdout, stderr } = await execAsync(cmd, {
-      cwd: MENTU_PATH,
-      timeout: 30000,
-    });
+    const { stdout, stderr } = await runMentu(args);
 
     return {
       output: stdout || stderr || 'Command completed successfully',
@@ -25,22 +23,45 @@ async function runMentuCommand(cmd: string): Promise<ToolResult> {
   }
 }
 
+function runCachedMentuCommand(args: string[]): Promise<ToolResult> {
+  const now = Date.now();
+  const key = args.join('\0');
+  const cached = readCache.get(key);
+  if (cached && cached.expiresAt > now) return cached.result;
+
+  for (const [entryKey, entry] of readCache) {
+    if (entry.expiresAt <= now) readCache.delete(entryKey);
+  }
+
+  const result = runMentuCommand(args);
+  const entry = { expiresAt: now + READ_CACHE_TTL_MS, result };
+  readCache.set(key, entry);
+  // Failures are not worth reusing
+  void result.then(({ is_error }) => {
+    if (is_error && readCache.get(key) === entry) readCache.delete(key);
+  });
+  return result;
+}
+
 export async function mentuCapture(input: Record<string, unknown>): Promise<ToolResult> {
   const body = input.body as string;
   const kind = (input.kind as string) || 'observation';
 
-  const cmd = `mentu capture "${body.replace(/"/g, '\\"')}" --kind ${kind}`;
-  return runMentuCommand(cmd);
+  // '--' ends the options, so a body starting with '-' is not read as a flag
+  const result = await runMentuCommand(['capture', '--kind', kind, '--', body]);
+  // The ledger changed; status and lists must be read again
+  readCache.clear();
+  return result;
 }
 
 export async function mentuStatus(input: Record<string, unknown>): Promise<ToolResult> {
   const commitmentId = input.commitment_id as string | undefined;
 
-  const cmd = commitmentId
-    ? `mentu show ${commitmentId}`
-    : `mentu status`;
+  const args = commitmentId
+    ? ['show', '--', commitmentId]
+    : ['status'];
 
-  return runMentuCommand(cmd);
+  return runCachedMentuCommand(args);
 }
 
 export async function mentuList(input: Record<string, unknown>): Promise<ToolResult> {
@@ -48,10 +69,10 @@ export async function mentuList(input: Record<string, unknown>): Promise<ToolRes
   const state = input.state as string | undefined;
   const limit = (input.limit as number) || 10;
 
-  let cmd = `mentu list ${type} --limit ${limit}`;
+  const args = ['list', type, '--limit', String(limit)];
   if (state) {
-    cmd += ` --state ${state}`;
+    args.push('--state', state);
   }
 
-  return runMentuCommand(cmd);
+  return runCachedMentuCommand(args);
 }
@@ -1,5 +1,6 @@
 import type Anthropic from '@anthropic-ai/sdk';
 import { mentuCapture, mentuStatus, mentuList } from './mentu-tools.js';
+import { createLogger } from '../utils/logger.js';
 
 export interface ToolResult {
   output: string;
@@ -10,6 +11,65 @@ type ToolHandler = (input: Record<string, unknown>) => Promise<ToolResult>;
 
 const toolHandlers: Map<string, ToolHandler> = new Map();
 
+const toolLogger = createLogger('Tools');
+
+// Upper bounds (ms) of the latency histogram buckets; the last bucket is open
+const LATENCY_BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000];
+// How often histograms are written to the log
+const REPORT_INTERVAL_MS = 5 * 60 * 1000;
+
+export interface ToolLatencyHistogram {
+  /** Bucket upper bounds in ms; counts has one extra entry for slower calls */
+  bucketsMs: number[];
+  counts: number[];
+  calls: number;
+  errors: number;
+  totalMs: number;
+  maxMs: number;
+}
+
+const latencies = new Map<string, ToolLatencyHistogram>();
+
+function recordLatency(name: string, durationMs: number, isError: boolean): void {
+  let histogram = latencies.get(name);
+  if (!histogram) {
+    histogram = {
+      bucketsMs: LATENCY_BUCKETS_MS,
+      counts: new Array(LATENCY_BUCKETS_MS.length + 1).fill(0),
+      calls: 0,
+      errors: 0,
+      totalMs: 0,
+      maxMs: 0,
+    };
+    latencies.set(name, histogram);
+  }
+
+  let bucket = LATENCY_BUCKETS_MS.findIndex((bound) => durationMs <= bound);
+  if (bucket === -1) bucket = LATENCY_BUCKETS_MS.length;
+  histogram.counts[bucket]++;
+  histogram.calls++;
+  if (isError) histogram.errors++;
+  histogram.totalMs += durationMs;
+  histogram.maxMs = Math.max(histogram.maxMs, durationMs);
+}
+
+/**
+ * Per-tool latency histograms since startup
+ */
+export function getToolLatencyHistograms(): Record<string, ToolLatencyHistogram> {
+  return Object.fromEntries(
+    [...latencies].map(([name, histogram]) => [name, { ...histogram, counts: [...histogram.counts] }])
+  );
+}
+
+let reportedCalls = 0;
+setInterval(() => {
+  const calls = [...latencies.values()].reduce((sum, histogram) => sum + histogram.calls, 0);
+  if (calls === reportedCalls) return;
+  reportedCalls = calls;
+  toolLogger.info('Tool latency', { metadata: getToolLatencyHistograms() });
+}, REPORT_INTERVAL_MS).unref();
+
 // Register built-in tools
 toolHandlers.set('mentu_capture', mentuCapture);
 toolHandlers.set('mentu_status', mentuStatus);
@@ -89,13 +149,18 @@ export async function executeTool(
     };
   }
 
+  const startTime = Date.now();
+  let result: ToolResult;
   try {
-    return await handler(input);
+    result = await handler(input);
   } catch (error) {
     const message = error instanceof Error ? error.message : 'Unknown error';
-    return {
+    result = {
       output: `Tool execution failed: ${message}`,
       is_error: true,
     };
   }
+
+  recordLatency(name, Date.now() - startTime, !!result.is_error);
+  return result;
 }
@@ -3,6 +3,7 @@ import { v4 as uuidv4 } from 'uuid';
 import { processUserMessage } from '../claude/streaming.js';
 import { getOrCreateConversation } from '../db/conversations.js';
 import { saveMessage } from '../db/messages.js';
+import { invalidateConversation } from '../db/message-cache.js';
 import { checkRateLimit, getRateLimitStatus } from '../auth/rate-limiter.js';
 import { agentLogger, generateRequestId } from '../utils/logger.js';
 import type { WSMessage, WSUserMessage } from './types.js';
@@ -27,7 +28,7 @@ export function handleConnection(ws: WebSocket, user?: AuthenticatedUser): void
           const userMsg = message as WSUserMessage;
 
           // Check rate limit
-          const rateCheck = checkRateLimit(activeUser.id);
+          const rateCheck = await checkRateLimit(activeUser.id);
           if (!rateCheck.allowed) {
             agentLogger.warn('Rate limit exceeded', {
               userId: activeUser.id,
@@ -35,7 +36,7 @@ export function handleConnection(ws: WebSocket, user?: AuthenticatedUser): void
               metadata: {
                 reason: rateCheck.reason,
                 retryAfter: rateCheck.retryAfter,
-                ...getRateLimitStatus(activeUser.id),
+                ...(await getRateLimitStatus(activeUser.id).catch(() => undefined)),
               },
             });
             sendError(ws, conversationId || 'unknown', rateCheck.reason || 'Rate limit exceeded', rateCheck.retryAfter);
@@ -45,6 +46,8 @@ export function handleConnection(ws: WebSocket, user?: AuthenticatedUser): void
           // Get or create conversation
           if (!conversationId) {
             conversationId = userMsg.conversation_id || uuidv4();
+            // Another worker may have served this conversation since it was cached
+            invalidateConversation(conversationId);
             await getOrCreateConversation(conversationId);
           }
 
@@ -0,0 +1,129 @@
+import { WebSocket } from 'ws';
+import { wsLogger } from '../utils/logger.js';
+import type { WSAssistantChunk } from './types.js';
+
+/**
+ * Outbound frames for one assistant response
+ *
+ * Text deltas are merged within a short window (or until they reach a size
+ * limit) and sent as one frame. While the socket's send buffer is above
+ * the high-water mark, deltas keep merging instead of being queued in ws,
+ * and a client that falls too far behind (too much buffered or merged, or
+ * stalled above the mark for too long) is disconnected.
+ */
+
+// Merge deltas produced within this window
+const COALESCE_WINDOW_MS = 25;
+// Send at once when merged deltas reach this size
+const MAX_DELTA_CHARS = 4096;
+// Hold deltas while ws has more than this buffered
+const HIGH_WATER_MARK = 256 * 1024;
+// Disconnect a client with more than this buffered
+const MAX_BUFFERED_BYTES = 8 * 1024 * 1024;
+// Disconnect a client once this much text is merged and waiting
+const MAX_PENDING_CHARS = 1024 * 1024;
+// Disconnect a client that stays above the high-water mark this long
+const MAX_STALL_MS = 30 * 1000;
+
+export interface OutboundStream {
+  /** Queue a text delta of the assistant message. */
+  delta(text: string): void;
+  /** Send a frame, after any queued deltas. */
+  send<T extends { type: string }>(message: T): void;
+  /** Send queued deltas now. */
+  flush(): void;
+}
+
+export function createOutboundStream(
+  ws: WebSocket,
+  conversationId: string,
+  messageId: string
+): OutboundStream {
+  let pending = '';
+  let timer: ReturnType<typeof setTimeout> | null = null;
+  // When the send buffer last rose above the high-water mark
+  let stalledSince: number | null = null;
+
+  const clearTimer = () => {
+    if (!timer) return;
+    clearTimeout(timer);
+    timer = null;
+    ws.off('close', clearTimer);
+  };
+
+  const disconnect = (reason: string) => {
+    wsLogger.warn('Closing slow connection', {
+      conversationId,
+      metadata: { reason, bufferedAmount: ws.bufferedAmount, pendingChars: pending.length },
+    });
+    clearTimer();
+    pending = '';
+    ws.close(1013, 'Client too slow');
+  };
+
+  const write = (message: { type: string }) => {
+    if (ws.readyState !== WebSocket.OPEN) return;
+
+    if (ws.bufferedAmount > MAX_BUFFERED_BYTES) {
+      disconnect('buffered');
+      return;
+    }
+    ws.send(JSON.stringify(message));
+  };
+
+  const sendPending = () => {
+    stalledSince = null;
+    if (!pending) return;
+    const delta = pending;
+    pending = '';
+    const chunk: WSAssistantChunk = {
+      type: 'assistant_chunk',
+      conversation_id: conversationId,
+      data: { delta, message_id: messageId },
+    };
+    write(chunk);
+  };
+
+  const flush = () => {
+    clearTimer();
+    sendPending();
+  };
+
+  const schedule = () => {
+    if (timer) return;
+    timer = setTimeout(() => {
+      clearTimer();
+      if (ws.readyState !== WebSocket.OPEN) {
+        pending = '';
+        return;
+      }
+      if (ws.bufferedAmount <= HIGH_WATER_MARK) {
+        sendPending();
+        return;
+      }
+      // Keep merging until the client drains its buffer, but not forever
+      stalledSince ??= Date.now();
+      if (Date.now() - stalledSince > MAX_STALL_MS) disconnect('stalled');
+      else schedule();
+    }, COALESCE_WINDOW_MS);
+    // A closed socket never drains; stop waiting for it
+    ws.once('close', clearTimer);
+  };
+
+  return {
+    delta(text) {
+      if (ws.readyState !== WebSocket.OPEN) return;
+      pending += text;
+      if (pending.length > MAX_PENDING_CHARS) disconnect('pending');
+      else if (pending.length >= MAX_DELTA_CHARS && ws.bufferedAmount <= HIGH_WATER_MARK) flush();
+      else schedule();
+    },
+
+    send(message) {
+      flush();
+      write(message);
+    },
+
+    flush,
+  };
+}
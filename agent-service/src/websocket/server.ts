@@ -2,7 +2,13 @@ import { Server as HTTPServer, IncomingMessage } from 'http';
 import { WebSocketServer, WebSocket } from 'ws';
 import { handleConnection } from './handlers.js';
 import { verifyToken, extractTokenFromUrl, type AuthenticatedUser } from '../auth/verify.js';
-import { trackConnection, releaseConnection } from '../auth/rate-limiter.js';
+import {
+  trackConnection,
+  renewConnection,
+  releaseConnection,
+  CONNECTION_RENEW_INTERVAL_MS,
+  type ConnectionLease,
+} from '../auth/rate-limiter.js';
 import { wsLogger } from '../utils/logger.js';
 
 // Allowed origins for WebSocket connections
@@ -24,6 +30,11 @@ function verifyOrigin(origin: string | undefined): boolean {
 }
 
 // Extended WebSocket with user context
+type AuthenticatedRequest = IncomingMessage & {
+  user?: AuthenticatedUser;
+  connectionLease?: ConnectionLease;
+};
+
 export interface AuthenticatedWebSocket extends WebSocket {
   userId?: string;
   userEmail?: string;
@@ -66,7 +77,8 @@ export function createWebSocketServer(httpServer: HTTPServer): WebSocketServer {
         }
 
         // Check connection limit
-        if (!trackConnection(user.id)) {
+        const lease = await trackConnection(user.id);
+        if (!lease) {
           wsLogger.warn('Rejected connection - connection limit exceeded', {
             userId: user.id,
             metadata: { origin, ip: req.socket.remoteAddress },
@@ -76,16 +88,23 @@ export function createWebSocketServer(httpServer: HTTPServer): WebSocketServer {
         }
 
         // Attach user info to request for use in connection handler
-        (req as IncomingMessage & { user?: AuthenticatedUser }).user = user;
+        (req as AuthenticatedRequest).user = user;
+        (req as AuthenticatedRequest).connectionLease = lease;
       }
 
       callback(true);
     },
   });
 
-  wss.on('connection', (ws: AuthenticatedWebSocket, req: IncomingMessage & { user?: AuthenticatedUser }) => {
+  wss.on('connection', (ws: AuthenticatedWebSocket, req: AuthenticatedRequest) => {
     const origin = req.headers.origin || 'unknown';
     const user = req.user;
+    const lease = req.connectionLease;
+
+    // Shared connection slots expire unless the open socket renews them
+    const renewTimer = lease
+      ? setInterval(() => void renewConnection(lease), CONNECTION_RENEW_INTERVAL_MS)
+      : null;
 
     // Attach user context to WebSocket
     ws.userId = user?.id;
@@ -105,8 +124,9 @@ export function createWebSocketServer(httpServer: HTTPServer): WebSocketServer {
 
     // Clean up on close
     ws.on('close', () => {
-      if (user?.id) {
-        releaseConnection(user.id);
+      if (renewTimer) clearInterval(renewTimer);
+      if (lease) {
+        void releaseConnection(lease);
       }
       wsLogger.info('Connection closed', {
         userId: user?.id,
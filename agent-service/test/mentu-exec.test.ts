@@ -0,0 +1,112 @@
+import { afterEach, beforeEach, describe, it, mock } from 'node:test';
+import assert from 'node:assert/strict';
+import { runMentu, setMentuExecutor, type MentuOutput } from '../src/tools/mentu-exec.js';
+import { mentuCapture, mentuList, mentuStatus } from '../src/tools/mentu-tools.js';
+
+// Commands that have started, each finished by the test
+interface Started {
+  args: string[];
+  finish: (output?: Partial<MentuOutput>) => void;
+  fail: (error: Error) => void;
+}
+
+let started: Started[] = [];
+
+function useControlledExecutor() {
+  started = [];
+  setMentuExecutor(
+    (args) =>
+      new Promise((resolve, reject) => {
+        started.push({
+          args,
+          finish: (output) => resolve({ stdout: '', stderr: '', ...output }),
+          fail: reject,
+        });
+      })
+  );
+}
+
+// Let settled promise chains run
+const settle = () => new Promise<void>((resolve) => setImmediate(resolve));
+
+describe('runMentu', () => {
+  beforeEach(useControlledExecutor);
+
+  it('runs at most two commands at once and starts waiters in order', async () => {
+    const calls = ['a', 'b', 'c', 'd'].map((name) => runMentu([name]));
+    await settle();
+    assert.deepEqual(started.map((s) => s.args[0]), ['a', 'b']);
+
+    started[1].finish({ stdout: 'b done' });
+    assert.deepEqual(await calls[1], { stdout: 'b done', stderr: '' });
+    await settle();
+    assert.deepEqual(started.map((s) => s.args[0]), ['a', 'b', 'c']);
+
+    // A failed command frees its slot as well
+    started[0].fail(new Error('exit 1'));
+    await assert.rejects(calls[0], /exit 1/);
+    await settle();
+    assert.deepEqual(started.map((s) => s.args[0]), ['a', 'b', 'c', 'd']);
+
+    started[2].finish();
+    started[3].finish();
+    await Promise.all([calls[2], calls[3]]);
+  });
+
+  it('rejects new commands once the wait queue is full', async () => {
+    const calls = Array.from({ length: 102 }, (_, i) => runMentu([`cmd${i}`]));
+    await assert.rejects(runMentu(['overflow']), /Too many pending mentu commands/);
+
+    // Drain: every finished command starts the next waiter
+    for (let i = 0; i < calls.length; i++) {
+      await settle();
+      started[i].finish();
+      await calls[i];
+    }
+  });
+});
+
+describe('mentu tools', () => {
+  beforeEach(useControlledExecutor);
+  afterEach(() => mock.restoreAll());
+
+  // Run a tool, answering the command it starts
+  async function answer<T>(call: Promise<T>, stdout = 'ok'): Promise<T> {
+    await settle();
+    started[started.length - 1].finish({ stdout });
+    return call;
+  }
+
+  it('passes positional values after an end-of-options separator', async () => {
+    await answer(mentuCapture({ body: '--help is not a flag here', kind: 'observation' }));
+    await answer(mentuStatus({ commitment_id: '-cmt_1' }));
+
+    assert.deepEqual(started[0].args, ['capture', '--kind', 'observation', '--', '--help is not a flag here']);
+    assert.deepEqual(started[1].args, ['show', '--', '-cmt_1']);
+  });
+
+  it('reuses read results for five seconds', async () => {
+    let now = 1_000_000;
+    mock.method(Date, 'now', () => now);
+
+    const first = await answer(mentuList({ type: 'commitments' }), 'open: 1');
+    const second = await mentuList({ type: 'commitments' });
+    assert.equal(second, first);
+    assert.equal(started.length, 1);
+
+    now += 5000;
+    await answer(mentuList({ type: 'commitments' }));
+    assert.equal(started.length, 2);
+  });
+
+  it('clears cached reads after a capture', async () => {
+    await answer(mentuStatus({}), 'before');
+    assert.equal((await mentuStatus({})).output, 'before');
+    assert.equal(started.length, 1);
+
+    await answer(mentuCapture({ body: 'Deploy finished' }));
+    const after = await answer(mentuStatus({}), 'after');
+    assert.equal(after.output, 'after');
+    assert.deepEqual(started.map((s) => s.args[0]), ['status', 'capture', 'status']);
+  });
+});
@@ -0,0 +1,97 @@
+import { afterEach, beforeEach, describe, it, mock } from 'node:test';
+import assert from 'node:assert/strict';
+import type { AgentMessage } from '../src/db/messages.js';
+
+// messages.js creates the Supabase client on import; the tests pass their
+// own save function, so it is never used
+process.env.SUPABASE_URL ??= 'http://localhost:54321';
+process.env.SUPABASE_SERVICE_KEY ??= 'test';
+const { createMessageBuffer } = await import('../src/db/message-buffer.js');
+
+function message(id: string): Omit<AgentMessage, 'created_at'> {
+  return { id, conversation_id: 'conv_buffer', role: 'tool_use', content: id };
+}
+
+// Let settled promise chains run (setImmediate is not mocked)
+const settle = () => new Promise<void>((resolve) => setImmediate(resolve));
+
+describe('message buffer', () => {
+  beforeEach(() => mock.timers.enable({ apis: ['setTimeout'] }));
+  afterEach(() => mock.timers.reset());
+
+  it('inserts full batches at once and the rest on flush, in order', async () => {
+    const batches: string[][] = [];
+    const buffer = createMessageBuffer('conv_buffer', async (messages) => {
+      batches.push(messages.map((m) => m.id));
+    });
+
+    const ids = Array.from({ length: 30 }, (_, i) => `m${i}`);
+    for (const id of ids) await buffer.add(message(id));
+    assert.equal(batches.length, 1);
+
+    await buffer.flush();
+    assert.deepEqual(batches, [ids.slice(0, 25), ids.slice(25)]);
+  });
+
+  it('waits for the flush delay before inserting a partial batch', async () => {
+    const save = mock.fn(async (_messages: AgentMessage[]) => {});
+    const buffer = createMessageBuffer('conv_buffer', save);
+
+    await buffer.add(message('m1'));
+    await buffer.add(message('m2'));
+    mock.timers.tick(199);
+    assert.equal(save.mock.callCount(), 0);
+
+    mock.timers.tick(1);
+    await settle();
+    assert.equal(save.mock.callCount(), 1);
+    assert.deepEqual(save.mock.calls[0].arguments[0].map((m) => m.id), ['m1', 'm2']);
+  });
+
+  it('retries a failed batch after a growing backoff', async () => {
+    let failures = 1;
+    const save = mock.fn(async (_messages: AgentMessage[]) => {
+      if (failures-- > 0) throw new Error('connection reset');
+    });
+    const buffer = createMessageBuffer('conv_buffer', save);
+
+    await buffer.add(message('m1'));
+    const flushed = buffer.flush();
+    await settle();
+    assert.equal(save.mock.callCount(), 1);
+
+    // The flush loop does not retry during the backoff
+    mock.timers.tick(499);
+    await settle();
+    assert.equal(save.mock.callCount(), 1);
+
+    mock.timers.tick(1);
+    await flushed;
+    assert.equal(save.mock.callCount(), 2);
+    assert.deepEqual(save.mock.calls[1].arguments[0].map((m) => m.id), ['m1']);
+  });
+
+  it('drops a batch after three attempts and reports it from flush', async () => {
+    const save = mock.fn(async (_messages: AgentMessage[]) => {
+      throw new Error('database unavailable');
+    });
+    const buffer = createMessageBuffer('conv_buffer', save);
+
+    await buffer.add(message('m1'));
+    const flushed = buffer.flush();
+    await settle();
+    mock.timers.tick(500);
+    await settle();
+    mock.timers.tick(999);
+    await settle();
+    assert.equal(save.mock.callCount(), 2);
+
+    mock.timers.tick(1);
+    await assert.rejects(flushed, /database unavailable/);
+    assert.equal(save.mock.callCount(), 3);
+
+    // The dropped batch is gone and the error is reported once
+    await buffer.flush();
+    assert.equal(save.mock.callCount(), 3);
+  });
+});
@@ -0,0 +1,103 @@
+import { afterEach, describe, it, mock } from 'node:test';
+import assert from 'node:assert/strict';
+import type { AgentMessage } from '../src/db/messages.js';
+import {
+  getCachedMessages,
+  invalidateConversation,
+  recordSavedMessage,
+} from '../src/db/message-cache.js';
+
+function message(conversationId: string, id: string, createdAt: string): AgentMessage {
+  return { id, conversation_id: conversationId, role: 'user', content: id, created_at: createdAt };
+}
+
+function loader(messages: AgentMessage[] = []) {
+  return mock.fn(async () => messages);
+}
+
+describe('message cache', () => {
+  afterEach(() => mock.restoreAll());
+
+  it('serves repeat reads from memory', async () => {
+    const load = loader([message('conv_hit', 'm1', '2026-01-01T00:00:01Z')]);
+
+    const first = await getCachedMessages('conv_hit', load);
+    const second = await getCachedMessages('conv_hit', load);
+
+    assert.equal(first.hit, false);
+    assert.equal(second.hit, true);
+    assert.deepEqual(second.messages.map((m) => m.id), ['m1']);
+    assert.equal(load.mock.callCount(), 1);
+    invalidateConversation('conv_hit');
+  });
+
+  it('reloads an entry after the TTL expires', async () => {
+    let now = Date.now();
+    mock.method(Date, 'now', () => now);
+    const load = loader();
+
+    await getCachedMessages('conv_ttl', load);
+    now += 15 * 60 * 1000;
+    assert.equal((await getCachedMessages('conv_ttl', load)).hit, true);
+
+    // The read above refreshed the entry; expire it from there
+    now += 15 * 60 * 1000 + 1;
+    assert.equal((await getCachedMessages('conv_ttl', load)).hit, false);
+    assert.equal(load.mock.callCount(), 2);
+    invalidateConversation('conv_ttl');
+  });
+
+  it('evicts the least recently used conversation past the limit', async () => {
+    const ids = Array.from({ length: 500 }, (_, i) => `conv_lru_${i}`);
+    for (const id of ids) await getCachedMessages(id, loader());
+
+    // Touch the oldest so the second oldest becomes the LRU entry
+    assert.equal((await getCachedMessages(ids[0], loader())).hit, true);
+    await getCachedMessages('conv_lru_extra', loader());
+
+    assert.equal((await getCachedMessages(ids[0], loader())).hit, true);
+    assert.equal((await getCachedMessages(ids[2], loader())).hit, true);
+    assert.equal((await getCachedMessages(ids[1], loader())).hit, false);
+
+    for (const id of [...ids, 'conv_lru_extra']) invalidateConversation(id);
+  });
+
+  it('shares one load between concurrent misses and keeps messages saved meanwhile', async () => {
+    let finish!: (messages: AgentMessage[]) => void;
+    const load = mock.fn(() => new Promise<AgentMessage[]>((resolve) => (finish = resolve)));
+
+    const first = getCachedMessages('conv_merge', load);
+    const second = getCachedMessages('conv_merge', load);
+
+    recordSavedMessage(message('conv_merge', 'm3', '2026-01-01T00:00:03Z'));
+    finish([
+      message('conv_merge', 'm1', '2026-01-01T00:00:01Z'),
+      message('conv_merge', 'm2', '2026-01-01T00:00:02Z'),
+    ]);
+
+    const [a, b] = await Promise.all([first, second]);
+    assert.equal(load.mock.callCount(), 1);
+    assert.equal(a.messages, b.messages);
+    assert.deepEqual(a.messages.map((m) => m.id), ['m1', 'm2', 'm3']);
+
+    // A save that is also in the loaded rows is not duplicated
+    recordSavedMessage(message('conv_merge', 'm2', '2026-01-01T00:00:02Z'));
+    const cached = await getCachedMessages('conv_merge', load);
+    assert.equal(cached.hit, true);
+    assert.deepEqual(cached.messages.map((m) => m.id), ['m1', 'm2', 'm3']);
+    invalidateConversation('conv_merge');
+  });
+
+  it('does not cache a load that was invalidated while in flight', async () => {
+    let finish!: (messages: AgentMessage[]) => void;
+    const load = mock.fn(() => new Promise<AgentMessage[]>((resolve) => (finish = resolve)));
+
+    const pending = getCachedMessages('conv_stale', load);
+    invalidateConversation('conv_stale');
+    finish([message('conv_stale', 'm1', '2026-01-01T00:00:01Z')]);
+
+    assert.deepEqual((await pending).messages.map((m) => m.id), ['m1']);
+    assert.equal((await getCachedMessages('conv_stale', loader())).hit, false);
+    invalidateConversation('conv_stale');
+  });
+});
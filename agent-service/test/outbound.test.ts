@@ -0,0 +1,117 @@
+import { afterEach, beforeEach, describe, it, mock } from 'node:test';
+import assert from 'node:assert/strict';
+import { EventEmitter } from 'node:events';
+import { WebSocket } from 'ws';
+import { createOutboundStream } from '../src/websocket/outbound.js';
+
+// The parts of a ws socket the stream uses
+class FakeSocket extends EventEmitter {
+  readyState: number = WebSocket.OPEN;
+  bufferedAmount = 0;
+  sent: Array<{ type: string; data?: { delta?: string } }> = [];
+  closeCode: number | null = null;
+
+  send(data: string) {
+    this.sent.push(JSON.parse(data));
+  }
+
+  close(code: number) {
+    this.closeCode = code;
+    this.readyState = WebSocket.CLOSED;
+    this.emit('close');
+  }
+}
+
+function open() {
+  const socket = new FakeSocket();
+  const stream = createOutboundStream(socket as unknown as WebSocket, 'conv_out', 'msg_out');
+  return { socket, stream };
+}
+
+const deltas = (socket: FakeSocket) => socket.sent.filter((m) => m.type === 'assistant_chunk').map((m) => m.data?.delta);
+
+describe('outbound stream', () => {
+  beforeEach(() => mock.timers.enable({ apis: ['setTimeout', 'Date'] }));
+  afterEach(() => mock.timers.reset());
+
+  it('merges deltas within the coalescing window into one frame', () => {
+    const { socket, stream } = open();
+
+    stream.delta('Hel');
+    stream.delta('lo');
+    mock.timers.tick(24);
+    assert.equal(socket.sent.length, 0);
+
+    mock.timers.tick(1);
+    assert.deepEqual(deltas(socket), ['Hello']);
+  });
+
+  it('sends merged deltas before any other frame', () => {
+    const { socket, stream } = open();
+
+    stream.delta('done');
+    stream.send({ type: 'assistant_complete' });
+    assert.deepEqual(socket.sent.map((m) => m.type), ['assistant_chunk', 'assistant_complete']);
+  });
+
+  it('sends at once when merged deltas reach the size limit', () => {
+    const { socket, stream } = open();
+
+    stream.delta('x'.repeat(4096));
+    assert.equal(deltas(socket).length, 1);
+  });
+
+  it('holds deltas while the send buffer is above the high-water mark', () => {
+    const { socket, stream } = open();
+    socket.bufferedAmount = 512 * 1024;
+
+    stream.delta('a'.repeat(4096));
+    stream.delta('b');
+    mock.timers.tick(100);
+    assert.equal(socket.sent.length, 0);
+
+    socket.bufferedAmount = 0;
+    mock.timers.tick(25);
+    assert.deepEqual(deltas(socket), ['a'.repeat(4096) + 'b']);
+    assert.equal(socket.closeCode, null);
+  });
+
+  it('disconnects a client that stays stalled for too long', () => {
+    const { socket, stream } = open();
+    socket.bufferedAmount = 512 * 1024;
+
+    stream.delta('a');
+    // The first held window starts the stall clock; step window by window
+    // so the clock advances between them
+    mock.timers.tick(25);
+    for (let i = 0; i < (30 * 1000) / 25; i++) mock.timers.tick(25);
+    assert.equal(socket.closeCode, null);
+
+    mock.timers.tick(25);
+    assert.equal(socket.closeCode, 1013);
+    assert.equal(socket.sent.length, 0);
+  });
+
+  it('disconnects a client with too much merged or buffered output', () => {
+    const merged = open();
+    merged.socket.bufferedAmount = 512 * 1024;
+    merged.stream.delta('x'.repeat(1024 * 1024 + 1));
+    assert.equal(merged.socket.closeCode, 1013);
+
+    const buffered = open();
+    buffered.socket.bufferedAmount = 9 * 1024 * 1024;
+    buffered.stream.send({ type: 'assistant_complete' });
+    assert.equal(buffered.socket.closeCode, 1013);
+    assert.equal(buffered.socket.sent.length, 0);
+  });
+
+  it('stops the coalescing timer when the socket closes', () => {
+    const { socket, stream } = open();
+
+    stream.delta('late');
+    socket.close(1000);
+    mock.timers.tick(25);
+    assert.equal(socket.sent.length, 0);
+    assert.equal(socket.listenerCount('close'), 0);
+  });
+});
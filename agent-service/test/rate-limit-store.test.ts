@@ -0,0 +1,222 @@
+import { afterEach, beforeEach, describe, it, mock } from 'node:test';
+import assert from 'node:assert/strict';
+import {
+  createMemoryCounterBackend,
+  createMemoryRateLimitStore,
+  createSharedRateLimitStore,
+  type RateLimitRule,
+  type RateLimitStore,
+} from '../src/auth/rate-limit-store.js';
+
+const MINUTE = 60 * 1000;
+// 10s into a minute window
+const START = 1000 * MINUTE + 10 * 1000;
+
+const perMinute: RateLimitRule = { key: 'user:u1:minute', limit: 2, windowMs: MINUTE };
+const strict: RateLimitRule = { key: 'user:u1:strict', limit: 1, windowMs: MINUTE };
+
+describe('memory rate limit store', () => {
+  let store: RateLimitStore;
+
+  beforeEach(() => {
+    mock.timers.enable({ apis: ['Date', 'setInterval'], now: START });
+    store = createMemoryRateLimitStore({ maxKeys: 2 });
+  });
+
+  afterEach(() => {
+    store.close();
+    mock.timers.reset();
+  });
+
+  it('rejects over the limit with the time until the sliding window admits one more', async () => {
+    assert.equal((await store.consume([perMinute])).allowed, true);
+    assert.equal((await store.consume([perMinute])).allowed, true);
+
+    const rejected = await store.consume([perMinute]);
+    assert.equal(rejected.allowed, false);
+    assert.equal(rejected.rule, perMinute);
+    // A full window until it rolls over, then 30s until half of the
+    // previous window's 2 requests have slid out
+    assert.equal(rejected.retryAfterMs, 90 * 1000);
+
+    mock.timers.setTime(START + 90 * 1000 - 1);
+    assert.equal((await store.consume([perMinute])).allowed, false);
+
+    mock.timers.setTime(START + 90 * 1000);
+    assert.equal((await store.consume([perMinute])).allowed, true);
+  });
+
+  it('weights the previous window and forgets it after two windows', async () => {
+    await store.consume([perMinute]);
+    await store.consume([perMinute]);
+
+    mock.timers.setTime(START + MINUTE + 15 * 1000);
+    assert.deepEqual(await store.usage([perMinute]), [2]);
+    mock.timers.setTime(START + MINUTE + 45 * 1000);
+    assert.deepEqual(await store.usage([perMinute]), [1]);
+    mock.timers.setTime(START + 2 * MINUTE);
+    assert.deepEqual(await store.usage([perMinute]), [0]);
+  });
+
+  it('counts a request against every rule or against none', async () => {
+    assert.equal((await store.consume([perMinute, strict])).allowed, true);
+
+    const rejected = await store.consume([perMinute, strict]);
+    assert.equal(rejected.allowed, false);
+    assert.equal(rejected.rule, strict);
+    assert.deepEqual(await store.usage([perMinute, strict]), [1, 1]);
+  });
+
+  it('drops the least recently used key past maxKeys', async () => {
+    const rule = (key: string): RateLimitRule => ({ key, limit: 10, windowMs: MINUTE });
+
+    await store.consume([rule('a')]);
+    await store.consume([rule('b')]);
+    await store.consume([rule('a')]);
+    await store.consume([rule('c')]);
+
+    assert.deepEqual(await store.usage([rule('a'), rule('b'), rule('c')]), [2, 0, 1]);
+  });
+
+  it('sweeps counters whose windows have both slid out', async () => {
+    const rule = (key: string): RateLimitRule => ({ key, limit: 10, windowMs: MINUTE });
+
+    await store.consume([rule('a')]);
+    mock.timers.tick(30 * 1000);
+    await store.consume([rule('b')]);
+    // 'a' is now the most recently used key, but its window is the oldest
+    mock.timers.tick(29 * 1000);
+    await store.consume([rule('a')]);
+
+    // The sweep at two minutes removes 'a', so adding 'c' evicts nothing
+    mock.timers.tick(61 * 1000);
+    await store.consume([rule('c')]);
+    assert.deepEqual(await store.usage([rule('b')]), [1]);
+  });
+
+  it('limits concurrent slots until they are released', async () => {
+    const first = await store.acquire('connections:u1', 2);
+    const second = await store.acquire('connections:u1', 2);
+    assert.notEqual(first, null);
+    assert.notEqual(second, first);
+    assert.equal(await store.acquire('connections:u1', 2), null);
+    assert.equal(await store.held('connections:u1', 2), 2);
+
+    assert.equal(await store.renew(first!), true);
+    await store.release(first!);
+    assert.equal(await store.renew(first!), false);
+    assert.equal(await store.held('connections:u1', 2), 1);
+    assert.notEqual(await store.acquire('connections:u1', 2), null);
+  });
+});
+
+describe('shared rate limit store', () => {
+  let store: RateLimitStore;
+
+  beforeEach(() => {
+    mock.timers.enable({ apis: ['Date', 'setInterval'], now: START });
+    store = createSharedRateLimitStore(createMemoryCounterBackend(), { slotTtlMs: 3 * MINUTE });
+  });
+
+  afterEach(() => {
+    store.close();
+    mock.timers.reset();
+  });
+
+  it('rejects over the limit with the time until the sliding window admits one more', async () => {
+    assert.equal((await store.consume([perMinute])).allowed, true);
+    assert.equal((await store.consume([perMinute])).allowed, true);
+
+    const rejected = await store.consume([perMinute]);
+    assert.equal(rejected.allowed, false);
+    assert.equal(rejected.rule, perMinute);
+    // 50s until the window rolls over, then 30s until half of the
+    // previous window's 2 requests have slid out
+    assert.equal(rejected.retryAfterMs, 80 * 1000);
+
+    mock.timers.setTime(START + 79 * 1000);
+    assert.equal((await store.consume([perMinute])).allowed, false);
+
+    mock.timers.setTime(START + 80 * 1000);
+    assert.equal((await store.consume([perMinute])).allowed, true);
+  });
+
+  it('counts a request against every rule or against none', async () => {
+    assert.equal((await store.consume([perMinute, strict])).allowed, true);
+
+    const rejected = await store.consume([perMinute, strict]);
+    assert.equal(rejected.allowed, false);
+    assert.equal(rejected.rule, strict);
+
+    assert.deepEqual(await store.usage([perMinute, strict]), [1, 1]);
+  });
+
+  it('takes rejected requests back out of the counters', async () => {
+    await store.consume([strict]);
+    for (let i = 0; i < 5; i++) {
+      assert.equal((await store.consume([perMinute, strict])).allowed, false);
+    }
+
+    assert.deepEqual(await store.usage([perMinute, strict]), [0, 1]);
+    assert.equal((await store.consume([perMinute])).allowed, true);
+  });
+
+  it('limits concurrent slots and frees them on release', async () => {
+    const first = await store.acquire('connections:u1', 2);
+    const second = await store.acquire('connections:u1', 2);
+    assert.notEqual(first, null);
+    assert.notEqual(second, null);
+    assert.notEqual(second, first);
+    assert.equal(await store.acquire('connections:u1', 2), null);
+    assert.equal(await store.held('connections:u1', 2), 2);
+
+    await store.release(first!);
+    assert.equal(await store.held('connections:u1', 2), 1);
+    assert.notEqual(await store.acquire('connections:u1', 2), null);
+  });
+
+  it('keeps renewed slots and expires abandoned ones', async () => {
+    const renewed = await store.acquire('connections:u1', 2);
+    await store.acquire('connections:u1', 2);
+
+    for (let minute = 1; minute <= 5; minute++) {
+      mock.timers.setTime(START + minute * MINUTE);
+      assert.equal(await store.renew(renewed!), true);
+    }
+
+    assert.equal(await store.held('connections:u1', 2), 1);
+    assert.notEqual(await store.acquire('connections:u1', 2), null);
+    assert.equal(await store.acquire('connections:u1', 2), null);
+  });
+
+  it('takes back its own expired slot while it is still free', async () => {
+    const lease = await store.acquire('connections:u1', 1);
+
+    mock.timers.setTime(START + 4 * MINUTE);
+    assert.equal(await store.renew(lease!), true);
+    assert.equal(await store.held('connections:u1', 1), 1);
+    assert.equal(await store.acquire('connections:u1', 1), null);
+  });
+
+  it('never renews or releases a slot another connection took after it expired', async () => {
+    const stale = await store.acquire('connections:u1', 1);
+
+    mock.timers.setTime(START + 4 * MINUTE);
+    const current = await store.acquire('connections:u1', 1);
+    assert.notEqual(current, null);
+
+    assert.equal(await store.renew(stale!), false);
+    await store.release(stale!);
+    assert.equal(await store.held('connections:u1', 1), 1);
+    assert.equal(await store.acquire('connections:u1', 1), null);
+
+    // The new holder keeps its slot as long as it renews
+    mock.timers.setTime(START + 6 * MINUTE);
+    assert.equal(await store.renew(current!), true);
+    mock.timers.setTime(START + 8 * MINUTE);
+    assert.equal(await store.held('connections:u1', 1), 1);
+
+    await store.release(current!);
+    assert.equal(await store.held('connections:u1', 1), 0);
+  });
+});
@@ -0,0 +1,41 @@
+import { describe, it } from 'node:test';
+import assert from 'node:assert/strict';
+import { countTokens } from '../src/claude/tokens.js';
+
+// Reference counts from a BPE tokenizer (cl100k_base)
+const EXACT: Array<[string, number]> = [
+  ['Hello world', 2],
+  ['The quick brown fox jumps over the lazy dog.', 10],
+  ['1234567890', 4],
+  ['getUserById', 4],
+  ['\n\n', 1],
+];
+
+// Code and JSON merge punctuation less predictably; stay within 20%
+const APPROXIMATE: Array<[string, number]> = [
+  ['const x = 42;', 6],
+  ['{"id": 1, "name": "test"}', 12],
+  ['function add(a, b) {\n  return a + b;\n}', 14],
+];
+
+describe('countTokens', () => {
+  it('matches known tokenizations of prose, digits and identifiers', () => {
+    for (const [text, expected] of EXACT) {
+      assert.equal(countTokens(text), expected, JSON.stringify(text));
+    }
+  });
+
+  it('stays close to known tokenizations of code and JSON', () => {
+    for (const [text, expected] of APPROXIMATE) {
+      const actual = countTokens(text);
+      assert.ok(
+        Math.abs(actual - expected) <= Math.ceil(expected * 0.2),
+        `${JSON.stringify(text)}: ${actual} tokens, expected about ${expected}`
+      );
+    }
+  });
+
+  it('counts nothing for empty input', () => {
+    assert.equal(countTokens(''), 0);
+  });
+});
@@ -0,0 +1,43 @@
+-- Bridge output tail
+-- Returns only the stdout/stderr appended since the caller's offsets, so log
+-- viewers can follow a running command without re-downloading its output.
+-- Offsets are character counts as reported by the previous call.
+
+CREATE OR REPLACE FUNCTION get_bridge_output_tail(
+  p_command_id UUID,
+  p_stdout_offset INTEGER DEFAULT 0,
+  p_stderr_offset INTEGER DEFAULT 0
+)
+RETURNS TABLE (
+  id UUID,
+  command_id UUID,
+  status TEXT,
+  exit_code INTEGER,
+  error_message TEXT,
+  started_at TIMESTAMPTZ,
+  completed_at TIMESTAMPTZ,
+  stdout_chunk TEXT,
+  stderr_chunk TEXT,
+  stdout_length INTEGER,
+  stderr_length INTEGER
+)
+LANGUAGE sql
+STABLE
+SECURITY INVOKER
+AS $$
+  SELECT
+    r.id,
+    r.command_id,
+    r.status::TEXT,
+    r.exit_code,
+    r.error_message,
+    r.started_at,
+    r.completed_at,
+    substring(COALESCE(r.stdout, '') FROM p_stdout_offset + 1),
+    substring(COALESCE(r.stderr, '') FROM p_stderr_offset + 1),
+    char_length(COALESCE(r.stdout, ''))::INTEGER,
+    char_length(COALESCE(r.stderr, ''))::INTEGER
+  FROM bridge_results r
+  WHERE r.command_id = p_command_id
+  LIMIT 1;
+$$;
@@ -0,0 +1,184 @@
+-- Panorama projection
+-- Incrementally maintained per-commitment and per-workspace summaries so the
+-- panorama can read counts instead of replaying every workspace ledger.
+-- Transitions mirror src/lib/mentu/ledger-index.ts.
+
+-- Per-commitment lifecycle projection
+-- Keyed per workspace: an operation can only ever touch its own workspace's
+-- projection, even if it names a commitment id from another workspace
+CREATE TABLE IF NOT EXISTS commitment_projections (
+  workspace_id UUID NOT NULL REFERENCES workspaces(id) ON DELETE CASCADE,
+  commitment_id TEXT NOT NULL,
+  -- Lifecycle ops may sync before the commit itself; only committed rows count
+  has_commit BOOLEAN NOT NULL DEFAULT false,
+  state TEXT NOT NULL DEFAULT 'open',
+  evidence TEXT,
+  closed_at TIMESTAMPTZ,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (workspace_id, commitment_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_commitment_projections_workspace_state
+  ON commitment_projections(workspace_id, state)
+  WHERE has_commit;
+
+-- Per-workspace counters
+CREATE TABLE IF NOT EXISTS workspace_panorama_stats (
+  workspace_id UUID PRIMARY KEY REFERENCES workspaces(id) ON DELETE CASCADE,
+  memories INTEGER NOT NULL DEFAULT 0,
+  last_activity_at TIMESTAMPTZ,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS workspace_actors (
+  workspace_id UUID NOT NULL REFERENCES workspaces(id) ON DELETE CASCADE,
+  actor TEXT NOT NULL,
+  PRIMARY KEY (workspace_id, actor)
+);
+
+ALTER TABLE commitment_projections ENABLE ROW LEVEL SECURITY;
+ALTER TABLE workspace_panorama_stats ENABLE ROW LEVEL SECURITY;
+ALTER TABLE workspace_actors ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Members can read commitment projections" ON commitment_projections
+  FOR SELECT USING (workspace_id IN (SELECT workspace_id FROM workspace_members WHERE user_id = auth.uid()));
+CREATE POLICY "Members can read panorama stats" ON workspace_panorama_stats
+  FOR SELECT USING (workspace_id IN (SELECT workspace_id FROM workspace_members WHERE user_id = auth.uid()));
+CREATE POLICY "Members can read workspace actors" ON workspace_actors
+  FOR SELECT USING (workspace_id IN (SELECT workspace_id FROM workspace_members WHERE user_id = auth.uid()));
+
+-- Apply one operation to the projections
+CREATE OR REPLACE FUNCTION apply_operation_to_panorama_row(op_row operations)
+RETURNS VOID
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  cmt_id TEXT;
+BEGIN
+  INSERT INTO workspace_panorama_stats (workspace_id, memories, last_activity_at, updated_at)
+  VALUES (op_row.workspace_id, CASE WHEN op_row.op = 'capture' THEN 1 ELSE 0 END, op_row.ts::timestamptz, NOW())
+  ON CONFLICT (workspace_id) DO UPDATE SET
+    memories = workspace_panorama_stats.memories + EXCLUDED.memories,
+    last_activity_at = GREATEST(workspace_panorama_stats.last_activity_at, EXCLUDED.last_activity_at),
+    updated_at = NOW();
+
+  INSERT INTO workspace_actors (workspace_id, actor)
+  VALUES (op_row.workspace_id, op_row.actor)
+  ON CONFLICT DO NOTHING;
+
+  IF op_row.op = 'commit' THEN
+    INSERT INTO commitment_projections (workspace_id, commitment_id, has_commit)
+    VALUES (op_row.workspace_id, op_row.id, true)
+    ON CONFLICT (workspace_id, commitment_id) DO UPDATE SET has_commit = true, updated_at = NOW();
+    RETURN;
+  END IF;
+
+  IF op_row.op NOT IN ('claim', 'release', 'submit', 'approve', 'reopen', 'close', 'cancel') THEN
+    RETURN;
+  END IF;
+
+  cmt_id := op_row.payload->>'commitment';
+  IF cmt_id IS NULL THEN
+    RETURN;
+  END IF;
+
+  INSERT INTO commitment_projections (workspace_id, commitment_id)
+  VALUES (op_row.workspace_id, cmt_id)
+  ON CONFLICT (workspace_id, commitment_id) DO NOTHING;
+
+  UPDATE commitment_projections SET
+    state = CASE op_row.op
+      WHEN 'claim' THEN 'claimed'
+      WHEN 'release' THEN 'open'
+      WHEN 'submit' THEN 'in_review'
+      WHEN 'approve' THEN 'closed'
+      WHEN 'reopen' THEN 'reopened'
+      WHEN 'close' THEN 'closed'
+      WHEN 'cancel' THEN 'cancelled'
+    END,
+    evidence = CASE op_row.op
+      WHEN 'approve' THEN NULLIF(op_row.payload->>'evidence', '')
+      WHEN 'close' THEN op_row.payload->>'evidence'
+      ELSE evidence
+    END,
+    -- Closed-this-week is measured from the first close operation
+    closed_at = CASE WHEN op_row.op = 'close' THEN COALESCE(closed_at, op_row.ts::timestamptz) ELSE closed_at END,
+    updated_at = NOW()
+  WHERE workspace_id = op_row.workspace_id AND commitment_id = cmt_id;
+
+  RETURN;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION apply_operation_to_panorama()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  PERFORM apply_operation_to_panorama_row(NEW);
+  RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS operations_panorama_projection ON operations;
+CREATE TRIGGER operations_panorama_projection
+  AFTER INSERT ON operations
+  FOR EACH ROW EXECUTE FUNCTION apply_operation_to_panorama();
+
+-- Per-workspace panorama summary for the calling user
+CREATE OR REPLACE FUNCTION get_panorama_summary()
+RETURNS TABLE (
+  workspace_id UUID,
+  open_count INTEGER,
+  claimed_count INTEGER,
+  in_review_count INTEGER,
+  closed_count INTEGER,
+  closed_this_week INTEGER,
+  memories INTEGER,
+  active_actors INTEGER,
+  last_activity_at TIMESTAMPTZ,
+  updated_at TIMESTAMPTZ
+)
+LANGUAGE sql
+STABLE
+SECURITY INVOKER
+AS $$
+  SELECT
+    m.workspace_id,
+    COUNT(*) FILTER (WHERE p.state = 'open')::INTEGER,
+    COUNT(*) FILTER (WHERE p.state = 'claimed')::INTEGER,
+    COUNT(*) FILTER (WHERE p.state = 'in_review')::INTEGER,
+    COUNT(*) FILTER (WHERE p.state = 'closed')::INTEGER,
+    COUNT(*) FILTER (
+      WHERE p.state = 'closed' AND p.evidence IS NOT NULL AND p.evidence <> ''
+        AND p.closed_at >= NOW() - INTERVAL '7 days'
+    )::INTEGER,
+    COALESCE(MAX(s.memories), 0)::INTEGER,
+    (SELECT COUNT(*) FROM workspace_actors a WHERE a.workspace_id = m.workspace_id)::INTEGER,
+    MAX(s.last_activity_at),
+    MAX(s.updated_at)
+  FROM workspace_members m
+  LEFT JOIN commitment_projections p ON p.workspace_id = m.workspace_id AND p.has_commit
+  LEFT JOIN workspace_panorama_stats s ON s.workspace_id = m.workspace_id
+  WHERE m.user_id = auth.uid()
+  GROUP BY m.workspace_id
+  -- Stable order: the API hashes these rows into its ETag
+  ORDER BY m.workspace_id;
+$$;
+
+-- Backfill from the existing ledger, in sync order
+TRUNCATE commitment_projections, workspace_panorama_stats, workspace_actors;
+
+DO $$
+DECLARE
+  op_row operations%ROWTYPE;
+BEGIN
+  FOR op_row IN SELECT * FROM operations ORDER BY synced_at NULLS LAST, id LOOP
+    PERFORM apply_operation_to_panorama_row(op_row);
+  END LOOP;
+END;
+$$;
@@ -0,0 +1,39 @@
+-- Rate limit counters
+-- Shared counters with expiry for the agent service, so request limits and
+-- concurrent-connection counts hold across PM2 workers and instances.
+-- Only the service role (agent-service) reads or writes them.
+
+CREATE TABLE IF NOT EXISTS rate_limit_counters (
+  key TEXT PRIMARY KEY,
+  value INTEGER NOT NULL DEFAULT 0,
+  expires_at TIMESTAMPTZ NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_rate_limit_counters_expires_at
+  ON rate_limit_counters(expires_at);
+
+-- No policies: inaccessible to anon and authenticated clients
+ALTER TABLE rate_limit_counters ENABLE ROW LEVEL SECURITY;
+
+-- Atomically add p_by (floored at 0) to a counter and refresh its expiry.
+-- Expired counters restart from 0.
+CREATE OR REPLACE FUNCTION rate_limit_increment(p_key TEXT, p_by INTEGER, p_ttl_ms INTEGER)
+RETURNS INTEGER
+LANGUAGE sql
+SECURITY INVOKER
+AS $$
+  INSERT INTO rate_limit_counters AS c (key, value, expires_at)
+  VALUES (p_key, GREATEST(p_by, 0), NOW() + p_ttl_ms * INTERVAL '1 millisecond')
+  ON CONFLICT (key) DO UPDATE SET
+    value = GREATEST(CASE WHEN c.expires_at <= NOW() THEN 0 ELSE c.value END + p_by, 0),
+    expires_at = EXCLUDED.expires_at
+  RETURNING value;
+$$;
+
+CREATE OR REPLACE FUNCTION rate_limit_sweep()
+RETURNS VOID
+LANGUAGE sql
+SECURITY INVOKER
+AS $$
+  DELETE FROM rate_limit_counters WHERE expires_at <= NOW();
+$$;
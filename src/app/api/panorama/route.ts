@@ -0,0 +1,171 @@
+import { createHash } from 'crypto';
+import { NextResponse } from 'next/server';
+import { createClient } from '@/lib/supabase/server';
+import type { PanoramaWorkspace, PanoramaSequence } from '@/lib/mentu/types';
+import type { WorkflowInstance } from '@/hooks/useWorkflowInstance';
+
+export const dynamic = 'force-dynamic';
+
+type ActiveInstance = WorkflowInstance & {
+  name?: string;
+  workflows: { name: string; workspace_id: string } | null;
+};
+
+const ACTIVE_STATES = ['pending', 'running', 'active'];
+
+interface PanoramaSummaryRow {
+  workspace_id: string;
+  open_count: number;
+  claimed_count: number;
+  in_review_count: number;
+  closed_count: number;
+  closed_this_week: number;
+  memories: number;
+  active_actors: number;
+  last_activity_at: string | null;
+  updated_at: string | null;
+}
+
+/**
+ * Panorama overview across all of the user's workspaces.
+ *
+ * Commitment counts come from the incrementally maintained projection
+ * (get_panorama_summary), so no ledger rows are shipped to the browser.
+ * Responses carry an ETag derived from a cheap validator (the summary rows,
+ * workspace names and the ids and update times of active workflow
+ * instances); a matching If-None-Match returns 304 before the instance
+ * details and commitment schedules are read.
+ */
+export async function GET(request: Request) {
+  const supabase = await createClient();
+
+  const { data: { user } } = await supabase.auth.getUser();
+  if (!user) {
+    return NextResponse.json({ error: 'Not authenticated' }, { status: 401 });
+  }
+
+  const [summaryResult, workspacesResult, versionsResult] = await Promise.all([
+    supabase.rpc('get_panorama_summary'),
+    supabase
+      .from('workspaces')
+      .select('id, name, display_name')
+      .order('name'),
+    supabase
+      .from('workflow_instances')
+      .select('id, updated_at')
+      .in('state', ACTIVE_STATES)
+      .order('id'),
+  ]);
+
+  if (summaryResult.error) {
+    console.error('[api/panorama] Summary error:', summaryResult.error);
+    return NextResponse.json({ error: summaryResult.error.message }, { status: 500 });
+  }
+  if (workspacesResult.error) {
+    return NextResponse.json({ error: workspacesResult.error.message }, { status: 500 });
+  }
+  if (versionsResult.error) {
+    console.error('[api/panorama] Workflow versions error:', versionsResult.error);
+    return NextResponse.json({ error: versionsResult.error.message }, { status: 500 });
+  }
+
+  const validator = JSON.stringify([summaryResult.data, workspacesResult.data, versionsResult.data]);
+  const etag = `W/"${createHash('sha1').update(validator).digest('base64url')}"`;
+  const headers = {
+    ETag: etag,
+    'Cache-Control': 'private, no-cache',
+  };
+
+  if (request.headers.get('if-none-match') === etag) {
+    return new NextResponse(null, { status: 304, headers });
+  }
+
+  const instancesResult = await supabase
+    .from('workflow_instances')
+    .select('*, workflows(name, workspace_id)')
+    .in('state', ACTIVE_STATES);
+
+  const summaries = new Map<string, PanoramaSummaryRow>();
+  for (const row of (summaryResult.data || []) as PanoramaSummaryRow[]) {
+    summaries.set(row.workspace_id, row);
+  }
+
+  // Only workspaces the user is a member of
+  const workspaces = ((workspacesResult.data || []) as { id: string; name: string; display_name: string | null }[])
+    .filter(ws => summaries.has(ws.id));
+  const instances = (instancesResult.data || []) as unknown as ActiveInstance[];
+
+  // Fetch scheduled_start_at from parent commitments
+  const parentCommitmentIds = instances
+    .map(i => i.parent_commitment_id)
+    .filter((id): id is string => !!id);
+
+  const commitmentSchedules = new Map<string, string>();
+  if (parentCommitmentIds.length > 0) {
+    const { data: cmts } = await supabase
+      .from('commitments')
+      .select('id, scheduled_start_at')
+      .in('id', parentCommitmentIds)
+      .not('scheduled_start_at', 'is', null);
+    for (const c of (cmts || []) as { id: string; scheduled_start_at: string }[]) {
+      commitmentSchedules.set(c.id, c.scheduled_start_at);
+    }
+  }
+
+  // Group instances by workspace
+  const workspaceNames = new Map(workspaces.map(ws => [ws.id, ws.name]));
+  const instancesByWorkspace = new Map<string, PanoramaSequence[]>();
+  const activeSequences: (PanoramaSequence & { workspace_name: string })[] = [];
+
+  for (const inst of instances) {
+    const wsId = inst.workflows?.workspace_id;
+    if (!wsId || !workspaceNames.has(wsId)) continue;
+
+    const steps = inst.step_states || {};
+    const stepKeys = Object.keys(steps);
+
+    const seq: PanoramaSequence = {
+      instance_id: inst.id,
+      name: inst.workflows?.name ?? inst.name ?? 'Unnamed',
+      state: inst.state,
+      total_steps: stepKeys.length,
+      completed_steps: stepKeys.filter(k => steps[k].state === 'completed').length,
+      current_step: inst.current_step,
+      started_at: inst.created_at,
+      scheduled_start_at: inst.parent_commitment_id
+        ? commitmentSchedules.get(inst.parent_commitment_id)
+        : undefined,
+    };
+
+    if (!instancesByWorkspace.has(wsId)) {
+      instancesByWorkspace.set(wsId, []);
+    }
+    instancesByWorkspace.get(wsId)!.push(seq);
+    activeSequences.push({ ...seq, workspace_name: workspaceNames.get(wsId)! });
+  }
+
+  const panoramaWorkspaces: PanoramaWorkspace[] = workspaces.map((ws) => {
+    const summary = summaries.get(ws.id)!;
+    return {
+      workspace_id: ws.id,
+      name: ws.display_name || ws.name,
+      stats: {
+        open: summary.open_count,
+        claimed: summary.claimed_count,
+        in_review: summary.in_review_count,
+        closed: summary.closed_count,
+        closed_this_week: summary.closed_this_week,
+        memories: summary.memories,
+        active_actors: summary.active_actors,
+      },
+      active_sequences: instancesByWorkspace.get(ws.id) || [],
+      last_activity_at: summary.last_activity_at ?? undefined,
+    };
+  });
+
+  const body = JSON.stringify({ workspaces: panoramaWorkspaces, activeSequences });
+  return new NextResponse(body, {
+    status: 200,
+    headers: { ...headers, 'Content-Type': 'application/json' },
+  });
+}
@@ -1,8 +1,9 @@
 'use client';
 
-import { useEffect, useRef, useState } from 'react';
+import { memo, useState } from 'react';
 import { useBridgeLogs, useCommitmentLogs } from '@/hooks/useBridgeLogs';
 import { Button } from '@/components/ui/button';
+import { VirtualList } from '@/components/ui/virtual-list';
 import { cn } from '@/lib/utils';
 import {
   Copy,
@@ -17,8 +18,10 @@ interface BridgeLogsViewerProps {
   commitmentId?: string;
 }
 
+const getLogKey = (log: LogLineProps['log']) => log.id;
+const renderLogLine = (log: LogLineProps['log']) => <LogLine log={log} />;
+
 export function BridgeLogsViewer({ commandId, commitmentId }: BridgeLogsViewerProps) {
-  const scrollRef = useRef<HTMLDivElement>(null);
   const [autoScroll, setAutoScroll] = useState(true);
   const [copied, setCopied] = useState(false);
 
@@ -28,13 +31,6 @@ export function BridgeLogsViewer({ commandId, commitmentId }: BridgeLogsViewerPr
 
   const { logs, isLoading, isStreaming } = commandId ? directLogs : commitmentLogs;
 
-  // Auto-scroll to bottom when new logs arrive
-  useEffect(() => {
-    if (autoScroll && scrollRef.current) {
-      scrollRef.current.scrollTop = scrollRef.current.scrollHeight;
-    }
-  }, [logs, autoScroll]);
-
   // Copy all logs to clipboard
   const handleCopy = async () => {
     const text = logs.map((log) => log.content).join('\n');
@@ -43,15 +39,6 @@ export function BridgeLogsViewer({ commandId, commitmentId }: BridgeLogsViewerPr
     setTimeout(() => setCopied(false), 2000);
   };
 
-  // Detect scroll position to toggle auto-scroll
-  const handleScroll = () => {
-    if (scrollRef.current) {
-      const { scrollTop, scrollHeight, clientHeight } = scrollRef.current;
-      const isAtBottom = scrollHeight - scrollTop - clientHeight < 50;
-      setAutoScroll(isAtBottom);
-    }
-  };
-
   // Empty state
   if (!commandId && !commitmentId) {
     return (
@@ -137,16 +124,16 @@ export function BridgeLogsViewer({ commandId, commitmentId }: BridgeLogsViewerPr
         </div>
       </div>
 
-      {/* Log entries */}
-      <div
-        ref={scrollRef}
-        onScroll={handleScroll}
-        className="flex-1 overflow-auto bg-zinc-950 rounded-lg p-3 font-mono text-xs leading-relaxed"
-      >
-        {logs.map((log) => (
-          <LogLine key={log.id} log={log} />
-        ))}
-      </div>
+      {/* Log entries (windowed; auto-scroll follows new output while at the bottom) */}
+      <VirtualList
+        items={logs}
+        getKey={getLogKey}
+        renderItem={renderLogLine}
+        estimateSize={22}
+        followOutput={autoScroll}
+        onAtBottomChange={setAutoScroll}
+        className="flex-1 min-h-0 bg-zinc-950 rounded-lg p-3 font-mono text-xs leading-relaxed"
+      />
     </div>
   );
 }
@@ -159,7 +146,7 @@ interface LogLineProps {
   };
 }
 
-function LogLine({ log }: LogLineProps) {
+const LogLine = memo(function LogLine({ log }: LogLineProps) {
   const getEmoji = () => {
     switch (log.type) {
       case 'task':
@@ -207,4 +194,4 @@ function LogLine({ log }: LogLineProps) {
       <span className="whitespace-pre-wrap break-all">{log.content}</span>
     </div>
   );
-}
+});
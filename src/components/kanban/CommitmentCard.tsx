@@ -1,5 +1,6 @@
 'use client';
 
+import { memo } from 'react';
 import type { Commitment } from '@/lib/mentu/types';
 import { Badge } from '@/components/ui/badge';
 import { relativeTime, absoluteTime } from '@/lib/utils';
@@ -9,18 +10,20 @@ import { cn } from '@/lib/utils';
 
 interface CommitmentCardProps {
   commitment: Commitment;
-  onClick: () => void;
+  onClick: (id: string) => void;
   isSelected?: boolean;
   isRunning?: boolean;
   isBugReport?: boolean;
 }
 
-export function CommitmentCard({ commitment, onClick, isSelected, isRunning, isBugReport }: CommitmentCardProps) {
+// Memoized so that an incremental ledger update only re-renders the cards
+// whose commitment object actually changed.
+export const CommitmentCard = memo(function CommitmentCard({ commitment, onClick, isSelected, isRunning, isBugReport }: CommitmentCardProps) {
   const hasWorktree = commitment.state === 'claimed' || commitment.state === 'in_review' || commitment.state === 'reopened';
 
   return (
     <button
-      onClick={onClick}
+      onClick={() => onClick(commitment.id)}
       className={cn(
         'w-full text-left bg-white dark:bg-zinc-900 border rounded-lg p-3 transition-all',
         'hover:border-zinc-400 dark:hover:border-zinc-600 hover:shadow-sm',
@@ -116,4 +119,4 @@ export function CommitmentCard({ commitment, onClick, isSelected, isRunning, isB
       </div>
     </button>
   );
-}
+});
@@ -86,7 +86,7 @@ export function KanbanColumn({
               isSelected={selectedId === commitment.id}
               isRunning={runningCommitmentIds.includes(commitment.id)}
               isBugReport={bugReportCommitmentIds.has(commitment.id)}
-              onClick={() => onCardClick(commitment.id)}
+              onClick={onCardClick}
             />
           ))
         )}
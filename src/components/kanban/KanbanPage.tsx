@@ -1,6 +1,6 @@
 'use client';
 
-import { useState, useMemo } from 'react';
+import { useState, useMemo, useCallback } from 'react';
 import { useKanbanCommitments } from '@/hooks/useKanbanCommitments';
 import { useRealtimeOperations } from '@/hooks/useRealtime';
 import { useBridgeCommands } from '@/hooks/useBridgeCommands';
@@ -55,9 +55,9 @@ export function KanbanPage({ workspaceName, workspaceId }: KanbanPageProps) {
       }
     : columns;
 
-  const handleCardClick = (id: string) => {
-    setSelectedId(selectedId === id ? null : id);
-  };
+  const handleCardClick = useCallback((id: string) => {
+    setSelectedId((current) => (current === id ? null : id));
+  }, []);
 
   const handleClosePanel = () => {
     setSelectedId(null);
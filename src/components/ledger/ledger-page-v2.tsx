@@ -4,7 +4,7 @@ import { useState, useMemo } from 'react';
 import Link from 'next/link';
 import type { User } from '@supabase/supabase-js';
 import { Header } from '@/components/layout/header';
-import { useOperations } from '@/hooks/useOperations';
+import { useLedger } from '@/hooks/useLedger';
 import { useRealtimeOperations } from '@/hooks/useRealtime';
 import { Badge } from '@/components/ui/badge';
 import { Button } from '@/components/ui/button';
@@ -14,6 +14,7 @@ import { Tooltip, TooltipContent, TooltipTrigger } from '@/components/ui/tooltip
 import type { OperationType, OperationRow } from '@/lib/mentu/types';
 import { Camera, Target, Hand, ArrowRightLeft, CheckCircle, MessageSquare, Download, Copy, Send, ThumbsUp, RotateCcw, Globe, XCircle, Filter, Link2, Ban } from 'lucide-react';
 import { toast } from '@/hooks/use-toast';
+import { VirtualList } from '@/components/ui/virtual-list';
 
 interface LedgerPageV2Props {
   workspaceName: string;
@@ -55,6 +56,8 @@ const opColors: Record<OperationType, string> = {
   cancel: 'text-red-600',
 };
 
+const getOperationKey = (op: OperationRow) => op.id;
+
 export function LedgerPageV2({
   workspaceName,
   workspaceId,
@@ -62,7 +65,7 @@ export function LedgerPageV2({
 }: LedgerPageV2Props) {
   const [filter, setFilter] = useState<OperationType | 'all'>('all');
 
-  const { data: operations, isLoading } = useOperations(workspaceId);
+  const { operations, isLoading } = useLedger(workspaceId);
   useRealtimeOperations(workspaceId);
 
   const filteredOperations = useMemo(() => {
@@ -113,7 +116,7 @@ export function LedgerPageV2({
     <div className="flex flex-col h-full">
       <Header user={user} />
 
-      <div className="flex-1 p-4 md:p-6 space-y-4 overflow-auto">
+      <div className="flex-1 min-h-0 flex flex-col p-4 md:p-6 gap-4">
         <div className="flex items-center justify-between">
           <div>
             <h1 className="text-2xl font-bold">Ledger <Badge variant="secondary">v2</Badge></h1>
@@ -152,8 +155,13 @@ export function LedgerPageV2({
             No operations found
           </div>
         ) : (
-          <div className="space-y-2">
-            {sortedOperations.map((op) => {
+          <VirtualList
+            items={sortedOperations}
+            getKey={getOperationKey}
+            estimateSize={160}
+            gap={8}
+            className="flex-1 min-h-0"
+            renderItem={(op) => {
               const Icon = opIcons[op.op];
               const link = op.op === 'capture'
                 ? `/workspace/${workspaceName}/memories/${op.id}`
@@ -214,8 +222,8 @@ export function LedgerPageV2({
                   </div>
                 </div>
               );
-            })}
-          </div>
+            }}
+          />
         )}
       </div>
     </div>
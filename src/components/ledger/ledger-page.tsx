@@ -2,7 +2,7 @@
 
 import { useState, useMemo } from 'react';
 import Link from 'next/link';
-import { useOperations } from '@/hooks/useOperations';
+import { useLedger } from '@/hooks/useLedger';
 import { useRealtimeOperations } from '@/hooks/useRealtime';
 import { Badge } from '@/components/ui/badge';
 import { Button } from '@/components/ui/button';
@@ -12,6 +12,7 @@ import { Tooltip, TooltipContent, TooltipTrigger } from '@/components/ui/tooltip
 import type { OperationType, OperationRow } from '@/lib/mentu/types';
 import { Camera, Target, Hand, ArrowRightLeft, CheckCircle, MessageSquare, Download, Copy, Send, ThumbsUp, RotateCcw, Globe, XCircle, Filter, Link2, Ban } from 'lucide-react';
 import { toast } from '@/hooks/use-toast';
+import { VirtualList } from '@/components/ui/virtual-list';
 
 interface LedgerPageProps {
   workspaceName: string;
@@ -52,13 +53,15 @@ const opColors: Record<OperationType, string> = {
   cancel: 'text-red-600',
 };
 
+const getOperationKey = (op: OperationRow) => op.id;
+
 export function LedgerPage({
   workspaceName,
   workspaceId,
 }: LedgerPageProps) {
   const [filter, setFilter] = useState<OperationType | 'all'>('all');
 
-  const { data: operations, isLoading } = useOperations(workspaceId);
+  const { operations, isLoading } = useLedger(workspaceId);
   useRealtimeOperations(workspaceId);
 
   const filteredOperations = useMemo(() => {
@@ -106,7 +109,7 @@ export function LedgerPage({
   };
 
   return (
-    <div className="p-4 md:p-6 space-y-4">
+    <div className="flex flex-col h-full p-4 md:p-6 gap-4">
       <div className="flex items-center justify-between">
         <div>
           <h1 className="text-2xl font-bold">Ledger</h1>
@@ -143,8 +146,13 @@ export function LedgerPage({
           No operations found
         </div>
       ) : (
-        <div className="space-y-2">
-          {sortedOperations.map((op) => {
+        <VirtualList
+          items={sortedOperations}
+          getKey={getOperationKey}
+          estimateSize={160}
+          gap={8}
+          className="flex-1 min-h-0"
+          renderItem={(op) => {
             const Icon = opIcons[op.op] || Target;
             const link = op.op === 'capture'
               ? `/workspace/${workspaceName}/memories/${op.id}`
@@ -205,8 +213,8 @@ export function LedgerPage({
                 </div>
               </div>
             );
-          })}
-        </div>
+          }}
+        />
       )}
     </div>
   );
@@ -4,7 +4,7 @@ import { useState, useMemo } from 'react';
 import Link from 'next/link';
 import type { User } from '@supabase/supabase-js';
 import { useMemory } from '@/hooks/useMemories';
-import { useOperations } from '@/hooks/useOperations';
+import { useLedger } from '@/hooks/useLedger';
 import { useRealtimeOperations } from '@/hooks/useRealtime';
 import { getCommitmentsFromSource, getCommitmentsWithEvidence } from '@/lib/mentu/state';
 import { Badge } from '@/components/ui/badge';
@@ -34,7 +34,7 @@ export function MemoryDetailPage({
   const [dismissOpen, setDismissOpen] = useState(false);
 
   const { memory, isLoading } = useMemory(workspaceId, memoryId);
-  const { data: operations } = useOperations(workspaceId);
+  const { operations } = useLedger(workspaceId);
   useRealtimeOperations(workspaceId);
 
   // Find commitments that reference this memory
@@ -4,6 +4,8 @@ import { useQuery } from '@tanstack/react-query';
 import { createClient } from '@/lib/supabase/client';
 import { relativeTime, absoluteTime } from '@/lib/utils';
 import { Tooltip, TooltipContent, TooltipTrigger } from '@/components/ui/tooltip';
+import { VirtualList } from '@/components/ui/virtual-list';
+import { cn } from '@/lib/utils';
 import type { OperationRow, CommitPayload, ClaimPayload } from '@/lib/mentu/types';
 import { Target, Hand, ArrowRightLeft, CheckCircle, Send, ThumbsUp, RotateCcw, Upload, Activity, type LucideIcon } from 'lucide-react';
 
@@ -45,6 +47,8 @@ function getOpDescription(op: OperationRow): string {
   }
 }
 
+const getOperationKey = (op: OperationRow) => op.id;
+
 // Only show meaningful state transitions — captures/annotates flood the feed
 const significantOps = ['commit', 'claim', 'release', 'close', 'submit', 'approve', 'reopen', 'publish'];
 
@@ -79,7 +83,7 @@ export function CrossWorkspaceFeed({ workspaceNames }: CrossWorkspaceFeedProps)
         Recent Activity
       </h2>
 
-      <div className="rounded-lg border border-zinc-200 dark:border-zinc-800 bg-white dark:bg-zinc-900 divide-y divide-zinc-100 dark:divide-zinc-800">
+      <div className="rounded-lg border border-zinc-200 dark:border-zinc-800 bg-white dark:bg-zinc-900 overflow-hidden">
         {isLoading && (
           <div className="py-8 text-center">
             <p className="text-sm text-zinc-500 dark:text-zinc-400">Loading...</p>
@@ -92,50 +96,60 @@ export function CrossWorkspaceFeed({ workspaceNames }: CrossWorkspaceFeedProps)
           </div>
         )}
 
-        {operations?.map((op) => {
-          const Icon = opIcons[op.op] || Target;
-          const description = getOpDescription(op);
-          const wsName = workspaceNames?.get(op.workspace_id);
+        {operations && operations.length > 0 && (
+          <VirtualList
+            items={operations}
+            getKey={getOperationKey}
+            estimateSize={64}
+            className="max-h-[480px]"
+            renderItem={(op, index) => {
+              const Icon = opIcons[op.op] || Target;
+              const description = getOpDescription(op);
+              const wsName = workspaceNames?.get(op.workspace_id);
 
-          return (
-            <div
-              key={op.id}
-              className="flex items-start gap-3 px-4 py-3 hover:bg-zinc-50 dark:hover:bg-zinc-800/50 transition-colors"
-            >
-              <div className="mt-0.5 shrink-0">
-                <Icon className="h-3.5 w-3.5 text-zinc-400 dark:text-zinc-500" />
-              </div>
-              <div className="flex-1 min-w-0">
-                <p className="text-sm">
-                  {wsName && (
-                    <span className="text-[10px] font-mono px-1.5 py-0.5 rounded bg-zinc-100 dark:bg-zinc-800 text-zinc-500 dark:text-zinc-400 mr-1.5">
-                      {wsName}
-                    </span>
+              return (
+                <div
+                  className={cn(
+                    'flex items-start gap-3 px-4 py-3 hover:bg-zinc-50 dark:hover:bg-zinc-800/50 transition-colors',
+                    index > 0 && 'border-t border-zinc-100 dark:border-zinc-800'
                   )}
-                  <span className="font-medium">{op.actor}</span>{' '}
-                  <span className="text-zinc-500 dark:text-zinc-400">
-                    {opLabels[op.op] || op.op}
-                  </span>
-                </p>
-                {description && (
-                  <p className="text-xs text-zinc-400 dark:text-zinc-500 truncate mt-0.5">
-                    {description}
-                  </p>
-                )}
-              </div>
-              <Tooltip>
-                <TooltipTrigger asChild>
-                  <span className="text-[11px] text-zinc-400 dark:text-zinc-600 shrink-0">
-                    {relativeTime(op.ts)}
-                  </span>
-                </TooltipTrigger>
-                <TooltipContent>
-                  {absoluteTime(op.ts)}
-                </TooltipContent>
-              </Tooltip>
-            </div>
-          );
-        })}
+                >
+                  <div className="mt-0.5 shrink-0">
+                    <Icon className="h-3.5 w-3.5 text-zinc-400 dark:text-zinc-500" />
+                  </div>
+                  <div className="flex-1 min-w-0">
+                    <p className="text-sm">
+                      {wsName && (
+                        <span className="text-[10px] font-mono px-1.5 py-0.5 rounded bg-zinc-100 dark:bg-zinc-800 text-zinc-500 dark:text-zinc-400 mr-1.5">
+                          {wsName}
+                        </span>
+                      )}
+                      <span className="font-medium">{op.actor}</span>{' '}
+                      <span className="text-zinc-500 dark:text-zinc-400">
+                        {opLabels[op.op] || op.op}
+                      </span>
+                    </p>
+                    {description && (
+                      <p className="text-xs text-zinc-400 dark:text-zinc-500 truncate mt-0.5">
+                        {description}
+                      </p>
+                    )}
+                  </div>
+                  <Tooltip>
+                    <TooltipTrigger asChild>
+                      <span className="text-[11px] text-zinc-400 dark:text-zinc-600 shrink-0">
+                        {relativeTime(op.ts)}
+                      </span>
+                    </TooltipTrigger>
+                    <TooltipContent>
+                      {absoluteTime(op.ts)}
+                    </TooltipContent>
+                  </Tooltip>
+                </div>
+              );
+            }}
+          />
+        )}
       </div>
     </div>
   );
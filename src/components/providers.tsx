@@ -1,7 +1,10 @@
 'use client';
 
 import { QueryClient, QueryClientProvider } from '@tanstack/react-query';
-import { useState } from 'react';
+import { useEffect, useState } from 'react';
+import { createClient } from '@/lib/supabase/client';
+import { clearCachedLedger } from '@/lib/mentu/ledger-cache';
+import { resetLedger } from '@/lib/mentu/ledger-store';
 import { TooltipProvider } from '@/components/ui/tooltip';
 import { Toaster } from '@/components/ui/toaster';
 
@@ -18,6 +21,19 @@ export function Providers({ children }: { children: React.ReactNode }) {
       })
   );
 
+  // Drop locally persisted ledgers when the user signs out
+  useEffect(() => {
+    const supabase = createClient();
+    const { data: { subscription } } = supabase.auth.onAuthStateChange((event) => {
+      if (event === 'SIGNED_OUT') {
+        resetLedger();
+        queryClient.removeQueries({ queryKey: ['operations'] });
+        void clearCachedLedger();
+      }
+    });
+    return () => subscription.unsubscribe();
+  }, [queryClient]);
+
   return (
     <QueryClientProvider client={queryClient}>
       <TooltipProvider>
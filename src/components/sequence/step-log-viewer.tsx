@@ -1,8 +1,10 @@
 'use client';
 
-import { useEffect, useRef, useState } from 'react';
+import { useState } from 'react';
 import { cn } from '@/lib/utils';
+import { VirtualList } from '@/components/ui/virtual-list';
 import { useWorkflowStepLogs } from '@/hooks/useWorkflowStepLogs';
+import type { WorkflowStepLog } from '@/lib/mentu/types';
 import { ChevronDown, ChevronRight } from 'lucide-react';
 
 interface StepLogViewerProps {
@@ -11,9 +13,25 @@ interface StepLogViewerProps {
   defaultOpen?: boolean;
 }
 
+const getLogKey = (log: WorkflowStepLog) => log.id;
+
+function renderLogLine(log: WorkflowStepLog) {
+  return (
+    <div
+      className={cn(
+        'whitespace-pre-wrap break-all',
+        log.stream === 'stderr'
+          ? 'text-red-400'
+          : 'text-zinc-300'
+      )}
+    >
+      {log.message}
+    </div>
+  );
+}
+
 export function StepLogViewer({ instanceId, stepId, defaultOpen = false }: StepLogViewerProps) {
   const [isOpen, setIsOpen] = useState(defaultOpen);
-  const scrollRef = useRef<HTMLDivElement>(null);
 
   const { logs, isConnected } = useWorkflowStepLogs({
     instanceId,
@@ -21,12 +39,6 @@ export function StepLogViewer({ instanceId, stepId, defaultOpen = false }: StepL
     enabled: isOpen,
   });
 
-  useEffect(() => {
-    if (scrollRef.current) {
-      scrollRef.current.scrollTop = scrollRef.current.scrollHeight;
-    }
-  }, [logs]);
-
   return (
     <div className="mt-1">
       <button
@@ -38,28 +50,15 @@ export function StepLogViewer({ instanceId, stepId, defaultOpen = false }: StepL
       </button>
 
       {isOpen && (
-        <div
-          ref={scrollRef}
-          className="mt-1 max-h-48 overflow-auto rounded bg-zinc-900 dark:bg-zinc-950 p-3 font-mono text-xs leading-relaxed"
-        >
-          {logs.length === 0 ? (
-            <span className="text-zinc-500">No logs yet</span>
-          ) : (
-            logs.map((log) => (
-              <div
-                key={log.id}
-                className={cn(
-                  'whitespace-pre-wrap break-all',
-                  log.stream === 'stderr'
-                    ? 'text-red-400'
-                    : 'text-zinc-300'
-                )}
-              >
-                {log.message}
-              </div>
-            ))
-          )}
-        </div>
+        <VirtualList
+          items={logs}
+          getKey={getLogKey}
+          renderItem={renderLogLine}
+          estimateSize={20}
+          followOutput
+          className="mt-1 max-h-48 rounded bg-zinc-900 dark:bg-zinc-950 p-3 font-mono text-xs leading-relaxed"
+          empty={<span className="text-zinc-500">No logs yet</span>}
+        />
       )}
     </div>
   );
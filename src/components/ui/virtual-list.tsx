@@ -0,0 +1,255 @@
+'use client';
+
+import * as React from 'react';
+import { cn } from '@/lib/utils';
+
+// Distance from the bottom (px) within which the list counts as "at bottom"
+const BOTTOM_THRESHOLD = 50;
+// Viewport height assumed before the container has been measured
+const FALLBACK_VIEWPORT = 800;
+
+export interface VirtualListProps<T> {
+  items: T[];
+  getKey: (item: T, index: number) => string;
+  renderItem: (item: T, index: number) => React.ReactNode;
+  /** Height (px) assumed for rows that have not been measured yet. */
+  estimateSize?: number;
+  /** Extra pixels rendered above and below the viewport. */
+  overscan?: number;
+  /** Vertical space (px) between rows. */
+  gap?: number;
+  /** Keep the list pinned to the bottom while it is scrolled to the bottom. */
+  followOutput?: boolean;
+  onAtBottomChange?: (atBottom: boolean) => void;
+  className?: string;
+  /** Rendered instead of the rows when `items` is empty. */
+  empty?: React.ReactNode;
+}
+
+/**
+ * Windowed list with variable, measured row heights.
+ *
+ * Only the rows intersecting the viewport (plus overscan) are mounted, so
+ * render cost does not grow with the number of items. When rows are added
+ * or resized, the first visible row keeps its on-screen position, or the
+ * list stays pinned to the bottom when `followOutput` is set.
+ */
+export function VirtualList<T>({
+  items,
+  getKey,
+  renderItem,
+  estimateSize = 40,
+  overscan = 400,
+  gap = 0,
+  followOutput = false,
+  onAtBottomChange,
+  className,
+  empty,
+}: VirtualListProps<T>) {
+  const containerRef = React.useRef<HTMLDivElement>(null);
+  const sizes = React.useRef(new Map<string, number>());
+  const anchor = React.useRef<{ key: string; delta: number } | null>(null);
+  const atBottom = React.useRef(true);
+  const [scrollTop, setScrollTop] = React.useState(0);
+  const [viewportHeight, setViewportHeight] = React.useState(0);
+  const [measureVersion, bumpMeasureVersion] = React.useReducer((v: number) => v + 1, 0);
+
+  const keys = React.useMemo(() => items.map(getKey), [items, getKey]);
+
+  const keyIndex = React.useMemo(() => {
+    const map = new Map<string, number>();
+    keys.forEach((key, i) => map.set(key, i));
+    return map;
+  }, [keys]);
+
+  // Row offsets are kept across renders and rewritten only from the first
+  // row whose key or measured height changed. offsets[i] is the top of
+  // row i; offsets[n] is the total height.
+  const layout = React.useRef({ keys: [] as string[], offsets: new Float64Array(1), rowSize: 0 });
+  // Rows measured since the offsets were last updated
+  const remeasured = React.useRef(new Set<string>());
+
+  const offsets = React.useMemo(() => {
+    const previous = layout.current;
+    const rowSize = estimateSize + gap;
+
+    let from = 0;
+    if (previous.rowSize === rowSize) {
+      if (previous.keys === keys) {
+        from = keys.length;
+      } else {
+        const common = Math.min(previous.keys.length, keys.length);
+        while (from < common && previous.keys[from] === keys[from]) from++;
+      }
+      for (const key of remeasured.current) {
+        const index = keyIndex.get(key);
+        if (index !== undefined && index < from) from = index;
+      }
+    }
+    remeasured.current.clear();
+
+    let result = previous.offsets;
+    if (result.length < keys.length + 1) {
+      // Grow geometrically so appends stay amortised O(1)
+      result = new Float64Array(Math.max(keys.length + 1, result.length * 2));
+      result.set(previous.offsets.subarray(0, from + 1));
+    }
+    for (let i = from; i < keys.length; i++) {
+      result[i + 1] = result[i] + (sizes.current.get(keys[i]) ?? rowSize);
+    }
+    layout.current = { keys, offsets: result, rowSize };
+    // A fresh view per update, so effects depending on offsets still re-run
+    return result.subarray(0, keys.length + 1);
+    // measureVersion invalidates offsets when a row is (re)measured
+    // eslint-disable-next-line react-hooks/exhaustive-deps
+  }, [keys, keyIndex, estimateSize, gap, measureVersion]);
+
+  // Forget the heights of rows that are no longer in the list
+  React.useEffect(() => {
+    for (const key of sizes.current.keys()) {
+      if (!keyIndex.has(key)) sizes.current.delete(key);
+    }
+  }, [keyIndex]);
+
+  const totalHeight = offsets[keys.length];
+
+  // Index of the row containing pixel `y`
+  const indexAt = React.useCallback((y: number) => {
+    let lo = 0;
+    let hi = keys.length - 1;
+    while (lo < hi) {
+      const mid = (lo + hi + 1) >>> 1;
+      if (offsets[mid] <= y) lo = mid;
+      else hi = mid - 1;
+    }
+    return Math.max(lo, 0);
+  }, [offsets, keys.length]);
+
+  const viewport = viewportHeight || FALLBACK_VIEWPORT;
+  const start = keys.length === 0 ? 0 : indexAt(Math.max(scrollTop - overscan, 0));
+  const end = keys.length === 0 ? -1 : indexAt(scrollTop + viewport + overscan);
+
+  // One observer measures every mounted row; updates are batched per frame
+  const observer = React.useRef<ResizeObserver | null>(null);
+
+  const measureRef = React.useCallback((node: HTMLDivElement | null) => {
+    if (!node || typeof ResizeObserver === 'undefined') return;
+    if (!observer.current) {
+      let frame = 0;
+      const ro = new ResizeObserver((entries) => {
+        let changed = false;
+        for (const entry of entries) {
+          // Rows scrolled out of the window are detached; stop observing them
+          if (!entry.target.isConnected) {
+            ro.unobserve(entry.target);
+            continue;
+          }
+          const key = (entry.target as HTMLElement).dataset.key;
+          if (!key) continue;
+          const height = entry.target.getBoundingClientRect().height;
+          if (sizes.current.get(key) !== height) {
+            sizes.current.set(key, height);
+            remeasured.current.add(key);
+            changed = true;
+          }
+        }
+        if (changed && !frame) {
+          frame = requestAnimationFrame(() => {
+            frame = 0;
+            bumpMeasureVersion();
+          });
+        }
+      });
+      observer.current = ro;
+    }
+    observer.current.observe(node);
+  }, []);
+
+  React.useEffect(() => () => {
+    observer.current?.disconnect();
+    observer.current = null;
+  }, []);
+
+  // Track the viewport size
+  React.useLayoutEffect(() => {
+    const container = containerRef.current;
+    if (!container) return;
+    setViewportHeight(container.clientHeight);
+    if (typeof ResizeObserver === 'undefined') return;
+    const resize = new ResizeObserver(() => setViewportHeight(container.clientHeight));
+    resize.observe(container);
+    return () => resize.disconnect();
+  }, []);
+
+  // Re-enabling followOutput jumps back to the bottom
+  React.useLayoutEffect(() => {
+    if (followOutput) atBottom.current = true;
+  }, [followOutput]);
+
+  // Restore the scroll anchor after rows were added or resized
+  React.useLayoutEffect(() => {
+    const container = containerRef.current;
+    if (!container) return;
+
+    if (followOutput && atBottom.current) {
+      container.scrollTop = container.scrollHeight;
+    } else if (anchor.current) {
+      const index = keyIndex.get(anchor.current.key);
+      if (index !== undefined) {
+        const target = offsets[index] - anchor.current.delta;
+        if (Math.abs(container.scrollTop - target) >= 1) container.scrollTop = target;
+      }
+    }
+    setScrollTop(container.scrollTop);
+  }, [offsets, keyIndex, followOutput]);
+
+  const handleScroll = () => {
+    const container = containerRef.current;
+    if (!container) return;
+
+    const top = container.scrollTop;
+    setScrollTop(top);
+
+    // At the very top no anchor is kept, so rows prepended there stay visible
+    const first = top > 0 && keys.length > 0 ? indexAt(top) : -1;
+    anchor.current = first >= 0 ? { key: keys[first], delta: offsets[first] - top } : null;
+
+    const isAtBottom = container.scrollHeight - top - container.clientHeight < BOTTOM_THRESHOLD;
+    if (isAtBottom !== atBottom.current) {
+      atBottom.current = isAtBottom;
+      onAtBottomChange?.(isAtBottom);
+    }
+  };
+
+  const rows: React.ReactNode[] = [];
+  for (let i = start; i <= end; i++) {
+    rows.push(
+      <div
+        key={keys[i]}
+        data-key={keys[i]}
+        ref={measureRef}
+        style={gap ? { paddingBottom: gap } : undefined}
+      >
+        {renderItem(items[i], i)}
+      </div>
+    );
+  }
+
+  return (
+    <div
+      ref={containerRef}
+      onScroll={handleScroll}
+      className={cn('overflow-auto', className)}
+    >
+      {keys.length === 0 ? (
+        empty
+      ) : (
+        <>
+          <div style={{ height: offsets[start] }} />
+          {rows}
+          <div style={{ height: Math.max(totalHeight - offsets[end + 1], 0) }} />
+        </>
+      )}
+    </div>
+  );
+}
@@ -1,6 +1,7 @@
 import Link from 'next/link';
 import { relativeTime, absoluteTime } from '@/lib/utils';
 import { Tooltip, TooltipContent, TooltipTrigger } from '@/components/ui/tooltip';
+import { VirtualList } from '@/components/ui/virtual-list';
 import type { OperationRow, CapturePayload, CommitPayload, ClaimPayload, ReleasePayload, ClosePayload, AnnotatePayload } from '@/lib/mentu/types';
 import { Camera, Target, Hand, ArrowRightLeft, CheckCircle, MessageSquare, Send, ThumbsUp, RotateCcw, Upload, LucideIcon } from 'lucide-react';
 
@@ -56,6 +57,8 @@ function getOpLink(op: OperationRow, workspaceName: string): string {
   }
 }
 
+const getOperationKey = (op: OperationRow) => op.id;
+
 function getOpDescription(op: OperationRow): string {
   switch (op.op) {
     case 'capture':
@@ -83,8 +86,13 @@ export function ActivityFeed({ operations, workspaceName }: ActivityFeedProps) {
   }
 
   return (
-    <div className="space-y-3">
-      {operations.map((op) => {
+    <VirtualList
+      items={operations}
+      getKey={getOperationKey}
+      estimateSize={52}
+      gap={12}
+      className="max-h-96 -mx-2 px-2"
+      renderItem={(op) => {
         const Icon = opIcons[op.op];
         const link = getOpLink(op, workspaceName);
         const description = getOpDescription(op);
@@ -121,7 +129,7 @@ export function ActivityFeed({ operations, workspaceName }: ActivityFeedProps) {
             </Tooltip>
           </Link>
         );
-      })}
-    </div>
+      }}
+    />
   );
 }
@@ -1,12 +1,12 @@
 'use client';
 
-import { useMemo, useState } from 'react';
+import { useState } from 'react';
 import type { User } from '@supabase/supabase-js';
 import { Header } from '@/components/layout/header';
-import { useOperations, useRecentOperations } from '@/hooks/useOperations';
+import { useRecentOperations } from '@/hooks/useOperations';
+import { useLedger } from '@/hooks/useLedger';
 import { useBridgeMachines } from '@/hooks/useBridgeMachines';
 import { useRealtimeOperations, useRealtimeBridge } from '@/hooks/useRealtime';
-import { computeStats } from '@/lib/mentu/state';
 import { StatsCards } from './stats-cards';
 import { ActivityFeed } from './activity-feed';
 import { CaptureMemoryDialog } from '@/components/memory/capture-memory-dialog';
@@ -28,7 +28,7 @@ export function WorkspaceDashboard({
   const [commitOpen, setCommitOpen] = useState(false);
 
   // Data fetching
-  const { data: operations } = useOperations(workspaceId);
+  const { snapshot } = useLedger(workspaceId);
   const { data: recentOps } = useRecentOperations(workspaceId, 10);
   const { data: machines } = useBridgeMachines(workspaceId);
 
@@ -36,11 +36,8 @@ export function WorkspaceDashboard({
   useRealtimeOperations(workspaceId);
   useRealtimeBridge(workspaceId);
 
-  // Computed stats
-  const stats = useMemo(() => {
-    if (!operations) return null;
-    return computeStats(operations);
-  }, [operations]);
+  // Stats are maintained incrementally by the ledger store
+  const stats = snapshot?.stats ?? null;
 
   const onlineMachines = machines?.filter(m => m.status === 'online' || m.status === 'busy').length || 0;
 
@@ -1,83 +1,131 @@
 'use client';
 
 import { useEffect, useState } from 'react';
-import { useQuery } from '@tanstack/react-query';
+import { useQuery, useQueryClient } from '@tanstack/react-query';
 import { createClient } from '@/lib/supabase/client';
+import { createLogParser, type LogEntry, type LogParser } from '@/lib/mentu/bridge-log-parser';
 import type { BridgeResult } from '@/lib/mentu/types';
 
-export interface LogEntry {
-  id: string;
-  timestamp: string;
-  type: 'system' | 'agent' | 'tool' | 'todo' | 'error' | 'task' | 'file';
-  content: string;
-  metadata?: Record<string, unknown>;
-}
+export type { LogEntry } from '@/lib/mentu/bridge-log-parser';
+
+// The result columns returned by get_bridge_output_tail
+type BridgeResultStatus = Pick<
+  BridgeResult,
+  'id' | 'command_id' | 'status' | 'exit_code' | 'error_message' | 'started_at' | 'completed_at'
+>;
+
+const POLL_INTERVAL = 3000;
 
 /**
- * Parse bridge command output into structured log entries.
+ * Parse state for one command. Sessions are never modified once cached:
+ * each fetch parses into forked parsers and returns a new session, so a
+ * superseded fetch can never feed the same text twice.
  */
-function parseOutput(output: string | null): LogEntry[] {
-  if (!output) return [];
-
-  const lines = output.split('\n');
-  const entries: LogEntry[] = [];
-
-  for (let i = 0; i < lines.length; i++) {
-    const line = lines[i].trim();
-    if (!line) continue;
-
-    // Detect line type based on content patterns
-    let type: LogEntry['type'] = 'agent';
-
-    if (line.startsWith('[ERROR]') || line.toLowerCase().includes('error:')) {
-      type = 'error';
-    } else if (line.startsWith('[SYSTEM]') || line.includes('initialized') || line.includes('Starting')) {
-      type = 'system';
-    } else if (line.startsWith('[TOOL]') || line.includes('Using tool') || line.match(/^\s*\[.*\]/)) {
-      type = 'tool';
-    } else if (line.includes('TODO') || line.includes('[ ]') || line.includes('[x]') || line.includes('[X]')) {
-      type = 'todo';
-    } else if (line.includes('[TASK]') || line.includes('Task:') || line.match(/^(Running|Executing|Starting task)/i)) {
-      type = 'task';
-    } else if (line.match(/\.(ts|tsx|js|jsx|json|md|css|html|py)[\s:$]/) || line.includes('File:') || line.match(/^(Reading|Writing|Editing|Created|Modified)/i)) {
-      type = 'file';
-    }
-
-    entries.push({
-      id: `log-${i}`,
-      timestamp: new Date().toISOString(),
-      type,
-      content: line,
-    });
-  }
-
-  return entries;
+interface LogSession {
+  stdoutOffset: number;
+  stderrOffset: number;
+  stdout: LogParser;
+  stderr: LogParser;
+  /** Completed entries in arrival order (append-only). */
+  entries: LogEntry[];
+  finished: boolean;
+}
+
+interface BridgeLogsData {
+  session: LogSession;
+  result: BridgeResultStatus | null;
+  logs: LogEntry[];
+}
+
+function createSession(): LogSession {
+  return {
+    stdoutOffset: 0,
+    stderrOffset: 0,
+    stdout: createLogParser({ prefix: 'stdout' }),
+    stderr: createLogParser({ prefix: 'stderr', type: 'error' }),
+    entries: [],
+    finished: false,
+  };
+}
+
+function isFinished(status: BridgeResult['status'] | undefined): boolean {
+  return status === 'success' || status === 'failed' || status === 'timeout' || status === 'cancelled';
+}
+
+// Completed entries plus the provisional trailing line of each stream
+function visibleLogs(session: LogSession): LogEntry[] {
+  const pending = [session.stdout.pending(), session.stderr.pending()].filter(
+    (entry): entry is LogEntry => entry !== null
+  );
+  return pending.length > 0 ? session.entries.concat(pending) : session.entries;
+}
+
+// Entries are append-only and only the (at most two) provisional entries at
+// the end can be replaced, so comparing the tail is enough
+function sameLogs(a: LogEntry[], b: LogEntry[]): boolean {
+  const n = a.length;
+  return n === b.length && a[n - 1] === b[n - 1] && a[n - 2] === b[n - 2];
 }
 
 /**
- * Hook to subscribe to bridge command logs in real-time.
+ * Hook to follow bridge command logs in real-time.
+ *
+ * Only output appended since the last fetch is transferred and parsed;
+ * realtime changes trigger a tail fetch and polling covers missed events
+ * until the command finishes. Existing entries keep their identity, so
+ * consumers re-render only the new lines.
  */
 export function useBridgeLogs(commandId: string | undefined) {
   const supabase = createClient();
+  const queryClient = useQueryClient();
   const [isStreaming, setIsStreaming] = useState(false);
+  const queryKey = ['bridge-logs', commandId];
 
-  // Fetch initial result
-  const { data: result, isLoading, refetch } = useQuery({
-    queryKey: ['bridge-result', commandId],
-    queryFn: async () => {
+  const { data, isLoading, refetch } = useQuery({
+    queryKey,
+    queryFn: async (): Promise<BridgeLogsData | null> => {
       if (!commandId) return null;
 
-      const { data, error } = await supabase
-        .from('bridge_results')
-        .select('*')
-        .eq('command_id', commandId)
-        .single();
-
-      if (error && error.code !== 'PGRST116') throw error;
-      return data as BridgeResult | null;
+      const previous = queryClient.getQueryData<BridgeLogsData | null>(queryKey);
+      const session = previous?.session ?? createSession();
+      if (previous && session.finished) return previous;
+
+      const { stdoutOffset, stderrOffset } = session;
+      const { data: rows, error } = await supabase.rpc('get_bridge_output_tail', {
+        p_command_id: commandId,
+        p_stdout_offset: stdoutOffset,
+        p_stderr_offset: stderrOffset,
+      });
+      if (error) throw error;
+
+      const row = rows?.[0];
+      if (!row) return previous ?? { session, result: null, logs: [] };
+
+      const { stdout_chunk, stderr_chunk, stdout_length, stderr_length, ...result } = row;
+
+      const stdout = session.stdout.fork();
+      const stderr = session.stderr.fork();
+      const appended = [...stdout.push(stdout_chunk), ...stderr.push(stderr_chunk)];
+      const finished = isFinished(result.status);
+      if (finished) appended.push(...stdout.flush(), ...stderr.flush());
+
+      const next: LogSession = {
+        stdoutOffset: stdout_length,
+        stderrOffset: stderr_length,
+        stdout,
+        stderr,
+        entries: appended.length > 0 ? session.entries.concat(appended) : session.entries,
+        finished,
+      };
+
+      // Keep the previous array when nothing visible changed
+      const logs = visibleLogs(next);
+      if (previous && sameLogs(previous.logs, logs)) return { session: next, result, logs: previous.logs };
+      return { session: next, result, logs };
     },
     enabled: !!commandId,
-    refetchInterval: 3000, // Poll every 3 seconds while streaming
+    refetchInterval: (query) => (query.state.data?.session.finished ? false : POLL_INTERVAL),
+    structuralSharing: false, // Entries are append-only; keep their identity
   });
 
   // Set up realtime subscription
@@ -108,24 +156,18 @@ export function useBridgeLogs(commandId: string | undefined) {
     };
   }, [commandId, supabase, refetch]);
 
-  // Parse logs from result
-  const logs = parseOutput(result?.stdout ?? null);
-  const errorLogs = parseOutput(result?.stderr ?? null);
-
-  // Combine stdout and stderr
-  const allLogs = [
-    ...logs,
-    ...errorLogs.map((e) => ({ ...e, type: 'error' as const })),
-  ];
+  const result = data?.result ?? null;
 
   return {
-    logs: allLogs,
+    logs: data?.logs ?? NO_LOGS,
     isLoading,
-    isStreaming: isStreaming && result?.status !== 'success' && result?.status !== 'failed',
+    isStreaming: isStreaming && !isFinished(result?.status),
     result,
   };
 }
 
+const NO_LOGS: LogEntry[] = [];
+
 /**
  * Hook to get logs for a commitment (finds the most recent bridge command).
  */
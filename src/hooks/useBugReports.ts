@@ -1,6 +1,6 @@
 "use client";
 
-import { useOperations } from "./useOperations";
+import { useLedger } from "./useLedger";
 import { useMemo } from "react";
 import type { OperationRow, CapturePayload } from "@/lib/mentu/types";
 
@@ -101,7 +101,7 @@ function deriveBugStatus(
 }
 
 export function useBugReports(workspaceId: string) {
-  const { data: operations, isLoading, error } = useOperations(workspaceId);
+  const { operations, isLoading, error } = useLedger(workspaceId);
 
   const bugReports = useMemo(() => {
     if (!operations) return [];
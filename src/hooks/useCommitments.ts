@@ -1,19 +1,15 @@
 'use client';
 
-import { useMemo } from 'react';
-import { useOperations } from './useOperations';
-import { computeCommitments, getCommitment } from '@/lib/mentu/state';
+import { useLedger } from './useLedger';
+import type { Commitment } from '@/lib/mentu/types';
 
-export function useCommitments(workspaceId: string | undefined) {
-  const { data: operations, isLoading, error, refetch } = useOperations(workspaceId);
+const NO_COMMITMENTS: Commitment[] = [];
 
-  const commitments = useMemo(() => {
-    if (!operations) return [];
-    return computeCommitments(operations);
-  }, [operations]);
+export function useCommitments(workspaceId: string | undefined) {
+  const { snapshot, isLoading, error, refetch } = useLedger(workspaceId);
 
   return {
-    commitments,
+    commitments: snapshot?.commitments ?? NO_COMMITMENTS,
     isLoading,
     error,
     refetch,
@@ -21,16 +17,14 @@ export function useCommitments(workspaceId: string | undefined) {
 }
 
 export function useCommitment(workspaceId: string | undefined, commitmentId: string) {
-  const { data: operations, isLoading, error, refetch } = useOperations(workspaceId);
-
-  const commitment = useMemo(() => {
-    if (!operations) return null;
-    return getCommitment(operations, commitmentId);
-  }, [operations, commitmentId]);
+  const ledger = useLedger(workspaceId);
+  const { snapshot, isLoading, error, refetch } = ledger;
 
   return {
-    commitment,
-    operations,
+    commitment: snapshot?.getCommitment(commitmentId) ?? null,
+    get operations() {
+      return ledger.operations;
+    },
     isLoading,
     error,
     refetch,
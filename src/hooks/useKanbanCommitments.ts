@@ -1,9 +1,8 @@
 'use client';
 
 import { useMemo } from 'react';
-import { useOperations } from './useOperations';
-import { computeCommitments } from '@/lib/mentu/state';
-import type { Commitment, CommitmentState, OperationRow, CapturePayload } from '@/lib/mentu/types';
+import { useLedger } from './useLedger';
+import type { Commitment, CommitmentState } from '@/lib/mentu/types';
 
 export type KanbanColumn = 'todo' | 'in_progress' | 'in_review' | 'done' | 'cancelled';
 
@@ -40,28 +39,22 @@ export function stateToColumn(state: CommitmentState): KanbanColumn {
  * Hook to get commitments grouped by kanban column.
  */
 export function useKanbanCommitments(workspaceId: string | undefined) {
-  const { data: operations, isLoading, error, refetch } = useOperations(workspaceId);
+  const { snapshot, isLoading, error, refetch } = useLedger(workspaceId);
 
-  // Compute commitments from operations
-  const commitments = useMemo(() => {
-    if (!operations) return [];
-    return computeCommitments(operations);
-  }, [operations]);
+  // Commitments are projected incrementally; unchanged ones keep their identity
+  const commitments = useMemo(() => snapshot?.commitments ?? [], [snapshot]);
 
   // Compute operation stats for debugging
   const operationStats = useMemo(() => {
-    if (!operations) return null;
-    const opCounts: Record<string, number> = {};
-    operations.forEach((op: OperationRow) => {
-      opCounts[op.op] = (opCounts[op.op] || 0) + 1;
-    });
+    if (!snapshot) return null;
+    const opCounts = { ...snapshot.opCounts };
     return {
-      total: operations.length,
+      total: snapshot.size,
       breakdown: opCounts,
       commitCount: opCounts['commit'] || 0,
       submitCount: opCounts['submit'] || 0,
     };
-  }, [operations]);
+  }, [snapshot]);
 
   const columns = useMemo<KanbanColumns>(() => {
     const result: KanbanColumns = {
@@ -98,16 +91,13 @@ export function useKanbanCommitments(workspaceId: string | undefined) {
 
   // Compute bug report commitment IDs (commitments sourced from bug/bug_report memories)
   const bugReportCommitmentIds = useMemo(() => {
-    if (!operations) return new Set<string>();
+    if (!snapshot) return new Set<string>();
 
     // Build a set of memory IDs that are bug reports
     const bugMemoryIds = new Set<string>();
-    operations.forEach((op: OperationRow) => {
-      if (op.op === 'capture') {
-        const payload = op.payload as CapturePayload;
-        if (payload?.kind === 'bug' || payload?.kind === 'bug_report') {
-          bugMemoryIds.add(op.id);
-        }
+    snapshot.memories.forEach((memory) => {
+      if (memory.kind === 'bug' || memory.kind === 'bug_report') {
+        bugMemoryIds.add(memory.id);
       }
     });
 
@@ -120,7 +110,7 @@ export function useKanbanCommitments(workspaceId: string | undefined) {
     });
 
     return bugCommitmentIds;
-  }, [operations, commitments]);
+  }, [snapshot, commitments]);
 
   return {
     columns,
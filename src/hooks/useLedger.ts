@@ -0,0 +1,53 @@
+'use client';
+
+import { useCallback, useEffect, useSyncExternalStore } from 'react';
+import { useOperations } from './useOperations';
+import {
+  getLedgerSnapshot,
+  isLedgerSeeded,
+  seedLedger,
+  subscribeLedger,
+  type LedgerSnapshot,
+} from '@/lib/mentu/ledger-store';
+
+const noopUnsubscribe = () => {};
+
+/**
+ * Live, incrementally projected ledger for a workspace.
+ *
+ * The full fetch from useOperations seeds the workspace store; realtime
+ * inserts (see useRealtimeOperations) are applied on top one at a time.
+ */
+export function useLedger(workspaceId: string | undefined) {
+  const { data, isLoading, error, refetch } = useOperations(workspaceId);
+
+  // Seeding is idempotent per fetched array; the store notifies subscribers
+  useEffect(() => {
+    if (workspaceId && data) seedLedger(workspaceId, data);
+  }, [workspaceId, data]);
+
+  const subscribe = useCallback(
+    (listener: () => void) =>
+      workspaceId ? subscribeLedger(workspaceId, listener) : noopUnsubscribe,
+    [workspaceId]
+  );
+  const getSnapshot = useCallback(
+    (): LedgerSnapshot | null =>
+      workspaceId && isLedgerSeeded(workspaceId) ? getLedgerSnapshot(workspaceId) : null,
+    [workspaceId]
+  );
+
+  const snapshot = useSyncExternalStore(subscribe, getSnapshot, getSnapshot);
+
+  return {
+    snapshot,
+    /** Copies the operation log; read it only where raw operations are needed. */
+    get operations() {
+      return snapshot?.operations;
+    },
+    // Fetched data is still being seeded into the store
+    isLoading: isLoading || (!!data && !snapshot),
+    error,
+    refetch,
+  };
+}
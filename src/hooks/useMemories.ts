@@ -1,19 +1,15 @@
 'use client';
 
-import { useMemo } from 'react';
-import { useOperations } from './useOperations';
-import { computeMemories, getMemory } from '@/lib/mentu/state';
+import { useLedger } from './useLedger';
+import type { Memory } from '@/lib/mentu/types';
 
-export function useMemories(workspaceId: string | undefined) {
-  const { data: operations, isLoading, error, refetch } = useOperations(workspaceId);
+const NO_MEMORIES: Memory[] = [];
 
-  const memories = useMemo(() => {
-    if (!operations) return [];
-    return computeMemories(operations);
-  }, [operations]);
+export function useMemories(workspaceId: string | undefined) {
+  const { snapshot, isLoading, error, refetch } = useLedger(workspaceId);
 
   return {
-    memories,
+    memories: snapshot?.memories ?? NO_MEMORIES,
     isLoading,
     error,
     refetch,
@@ -21,16 +17,14 @@ export function useMemories(workspaceId: string | undefined) {
 }
 
 export function useMemory(workspaceId: string | undefined, memoryId: string) {
-  const { data: operations, isLoading, error, refetch } = useOperations(workspaceId);
-
-  const memory = useMemo(() => {
-    if (!operations) return null;
-    return getMemory(operations, memoryId);
-  }, [operations, memoryId]);
+  const ledger = useLedger(workspaceId);
+  const { snapshot, isLoading, error, refetch } = ledger;
 
   return {
-    memory,
-    operations,
+    memory: snapshot?.getMemory(memoryId) ?? null,
+    get operations() {
+      return ledger.operations;
+    },
     isLoading,
     error,
     refetch,
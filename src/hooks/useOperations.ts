@@ -2,59 +2,259 @@
 
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query';
 import { createClient } from '@/lib/supabase/client';
+import { appendCachedLedger, clearCachedLedger, loadCachedLedger } from '@/lib/mentu/ledger-cache';
+import {
+  deltaStart,
+  highWaterMark,
+  keysetWindows,
+  laterCursor,
+  mergeDelta,
+  type KeysetBound,
+} from '@/lib/mentu/ledger-sync';
 import type { OperationRow } from '@/lib/mentu/types';
 
 const PAGE_SIZE = 1000; // Supabase default limit
+const FETCH_WINDOWS = 4; // Concurrent keyset windows for a cold load
+// Delta fetches re-read this far behind the high-water mark: a row can
+// commit after a newer one with an earlier synced_at
+const DELTA_OVERLAP_MS = 5000;
+// How often a delta load also compares row counts with the server
+const VERIFY_INTERVAL_MS = 10 * 60 * 1000;
+
+// Last time each workspace ledger was checked against the server row count
+const lastVerified = new Map<string, number>();
+
+type SupabaseClient = ReturnType<typeof createClient>;
+
+/**
+ * Fetch one keyset page ordered by (synced_at, id), strictly after `after`
+ * and (optionally) with synced_at <= `until`.
+ * An `after` cursor without id is a plain `synced_at > ts` bound.
+ */
+async function fetchPage(
+  supabase: SupabaseClient,
+  workspaceId: string,
+  after: KeysetBound | null,
+  until: string | null
+): Promise<OperationRow[]> {
+  let query = supabase
+    .from('operations')
+    .select('*')
+    .eq('workspace_id', workspaceId)
+    .not('synced_at', 'is', null);
+
+  if (after?.id) {
+    query = query.or(
+      `synced_at.gt."${after.synced_at}",and(synced_at.eq."${after.synced_at}",id.gt."${after.id}")`
+    );
+  } else if (after) {
+    query = query.gt('synced_at', after.synced_at);
+  }
+  if (until) query = query.lte('synced_at', until);
+
+  const { data, error } = await query
+    .order('synced_at', { ascending: true })
+    .order('id', { ascending: true })
+    .limit(PAGE_SIZE);
+
+  if (error) {
+    console.error('[useOperations] Error fetching page after', after, ':', error);
+    throw error;
+  }
+
+  return (data || []) as unknown as OperationRow[];
+}
 
 /**
- * Fetch all operations with pagination to overcome Supabase's 1000 row limit
+ * Page through a keyset range until it is exhausted.
  */
-async function fetchAllOperations(supabase: ReturnType<typeof createClient>, workspaceId: string): Promise<OperationRow[]> {
-  const allOperations: OperationRow[] = [];
-  let offset = 0;
-  let hasMore = true;
+async function fetchRange(
+  supabase: SupabaseClient,
+  workspaceId: string,
+  after: KeysetBound | null,
+  until: string | null
+): Promise<OperationRow[]> {
+  const rows: OperationRow[] = [];
+  let cursor = after;
 
-  while (hasMore) {
-    const { data, error } = await supabase
+  for (;;) {
+    const page = await fetchPage(supabase, workspaceId, cursor, until);
+    for (const op of page) rows.push(op);
+    if (page.length < PAGE_SIZE) return rows;
+    const last = page[page.length - 1];
+    cursor = { synced_at: last.synced_at!, id: last.id };
+  }
+}
+
+/**
+ * Fetch the rows that have not been synced yet (synced_at is null).
+ */
+async function fetchUnsynced(supabase: SupabaseClient, workspaceId: string): Promise<OperationRow[]> {
+  const { data, error } = await supabase
+    .from('operations')
+    .select('*')
+    .eq('workspace_id', workspaceId)
+    .is('synced_at', null)
+    .order('id', { ascending: true });
+
+  if (error) throw error;
+  return (data || []) as unknown as OperationRow[];
+}
+
+/**
+ * Count a workspace's operations on the server.
+ */
+async function countOperations(supabase: SupabaseClient, workspaceId: string): Promise<number> {
+  const { count, error } = await supabase
+    .from('operations')
+    .select('id', { count: 'exact', head: true })
+    .eq('workspace_id', workspaceId);
+
+  if (error) throw error;
+  return count ?? 0;
+}
+
+/**
+ * Fetch all operations with keyset pagination.
+ *
+ * The first page, the newest key and any unsynced rows are requested
+ * together. If there is more than one page, the remaining synced_at span is
+ * split into windows that are paged concurrently.
+ */
+async function fetchAllOperations(supabase: SupabaseClient, workspaceId: string): Promise<OperationRow[]> {
+  const [firstPage, newest, unsynced] = await Promise.all([
+    fetchPage(supabase, workspaceId, null, null),
+    supabase
       .from('operations')
-      .select('*')
+      .select('synced_at, id')
       .eq('workspace_id', workspaceId)
-      .order('synced_at', { ascending: true })
-      .range(offset, offset + PAGE_SIZE - 1);
+      .not('synced_at', 'is', null)
+      .order('synced_at', { ascending: false })
+      .order('id', { ascending: false })
+      .limit(1),
+    fetchUnsynced(supabase, workspaceId),
+  ]);
 
-    if (error) {
-      console.error('[useOperations] Error fetching page at offset', offset, ':', error);
-      throw error;
+  if (newest.error) throw newest.error;
+
+  // Unsynced rows sort first, matching the order of the local cache
+  const allOperations = [...unsynced, ...firstPage];
+  if (firstPage.length < PAGE_SIZE) return allOperations;
+
+  const last = firstPage[firstPage.length - 1];
+  const newestSyncedAt = (newest.data?.[0] as { synced_at: string } | undefined)?.synced_at ?? null;
+  const windows = await Promise.all(
+    keysetWindows({ synced_at: last.synced_at!, id: last.id }, newestSyncedAt, FETCH_WINDOWS).map(
+      ({ after, until }) => fetchRange(supabase, workspaceId, after, until)
+    )
+  );
+
+  for (const rows of windows) {
+    for (const op of rows) allOperations.push(op);
+  }
+  return allOperations;
+}
+
+/**
+ * Download the full ledger and replace the cached copy.
+ */
+async function reloadOperations(
+  supabase: SupabaseClient,
+  workspaceId: string,
+  replaceCache: boolean
+): Promise<OperationRow[]> {
+  const all = await fetchAllOperations(supabase, workspaceId);
+  lastVerified.set(workspaceId, Date.now());
+
+  const mark = highWaterMark(all);
+  if (mark) {
+    const cleared = replaceCache ? clearCachedLedger(workspaceId) : Promise.resolve();
+    void cleared.then(() => appendCachedLedger(workspaceId, all, mark));
+  }
+  return all;
+}
+
+/**
+ * Load a workspace ledger. Starts from the in-memory ledger or the
+ * IndexedDB cache when available and only fetches unsynced operations and
+ * those synced since shortly before its high-water mark; otherwise
+ * downloads the full ledger once.
+ *
+ * Every VERIFY_INTERVAL_MS the server rows are counted before the delta is
+ * fetched. The ledger must then hold at least that many rows; fewer means
+ * a row the delta could not see, and falls back to a full reload. Rows
+ * inserted after the count only add to the ledger, so they never force a
+ * reload.
+ */
+async function loadOperations(
+  supabase: SupabaseClient,
+  workspaceId: string,
+  previous: OperationRow[] | undefined
+): Promise<OperationRow[]> {
+  let base = previous;
+  let cursor = base ? highWaterMark(base) : null;
+
+  if (!base || !cursor) {
+    const cached = await loadCachedLedger(workspaceId);
+    if (cached) {
+      base = cached.ops;
+      cursor = cached.cursor;
     }
+  }
+
+  if (!base || !cursor) return reloadOperations(supabase, workspaceId, false);
+
+  const verify = Date.now() - (lastVerified.get(workspaceId) ?? 0) >= VERIFY_INTERVAL_MS;
+  // Counted first, so every row it includes is visible to the delta queries
+  const serverCount = verify ? await countOperations(supabase, workspaceId) : null;
+
+  const [synced, unsynced] = await Promise.all([
+    fetchRange(supabase, workspaceId, deltaStart(cursor, DELTA_OVERLAP_MS), null),
+    fetchUnsynced(supabase, workspaceId),
+  ]);
+
+  // The overlap and unsynced rows are mostly known already
+  const known = new Set(base.map(op => op.id));
+  const delta = mergeDelta(known, [unsynced, synced]);
 
-    if (data && data.length > 0) {
-      allOperations.push(...(data as unknown as OperationRow[]));
-      offset += PAGE_SIZE;
-      hasMore = data.length === PAGE_SIZE; // If we got less than PAGE_SIZE, we're done
-    } else {
-      hasMore = false;
+  if (serverCount !== null) {
+    if (known.size < serverCount) {
+      console.warn('[useOperations] Ledger is missing rows, reloading', {
+        workspaceId,
+        local: known.size,
+        server: serverCount,
+      });
+      return reloadOperations(supabase, workspaceId, true);
     }
+    lastVerified.set(workspaceId, Date.now());
   }
 
-  return allOperations;
+  // Returning the same array keeps downstream projections untouched
+  if (delta.length === 0) return base;
+
+  const mark = highWaterMark(synced);
+  void appendCachedLedger(workspaceId, delta, mark ? laterCursor(mark, cursor) : cursor);
+  return base.concat(delta);
 }
 
 export function useOperations(workspaceId: string | undefined) {
   const supabase = createClient();
+  const queryClient = useQueryClient();
+  const queryKey = ['operations', workspaceId, 'v2'];
 
   return useQuery({
-    queryKey: ['operations', workspaceId, 'v2'],
+    queryKey,
     queryFn: async () => {
       if (!workspaceId) return [];
 
-      // Use pagination to fetch ALL operations
-      const data = await fetchAllOperations(supabase, workspaceId);
-
-      return data;
+      const previous = queryClient.getQueryData<OperationRow[]>(queryKey);
+      return loadOperations(supabase, workspaceId, previous);
     },
     enabled: !!workspaceId,
     staleTime: 5 * 60 * 1000, // 5 minutes - realtime handles incremental updates
-    refetchOnMount: 'always', // Always refetch on mount to ensure fresh data
+    refetchOnMount: 'always', // Cheap: only operations near or after the high-water mark are fetched
+    refetchInterval: VERIFY_INTERVAL_MS, // Periodic row-count check against the server
+    structuralSharing: false, // Ledgers are append-only; skip deep-comparing large arrays
   });
 }
 
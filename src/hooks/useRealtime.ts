@@ -4,6 +4,7 @@ import { useEffect } from 'react';
 import { useQueryClient } from '@tanstack/react-query';
 import { createClient } from '@/lib/supabase/client';
 import { toast } from '@/hooks/use-toast';
+import { applyLedgerOperation } from '@/lib/mentu/ledger-store';
 import type { OperationRow } from '@/lib/mentu/types';
 
 export function useRealtimeOperations(workspaceId: string | undefined) {
@@ -26,15 +27,9 @@ export function useRealtimeOperations(workspaceId: string | undefined) {
         (payload) => {
           const newOp = payload.new as OperationRow;
 
-          // Add to local cache - must match useOperations query key
-          queryClient.setQueryData<OperationRow[]>(
-            ['operations', workspaceId, 'v2'],
-            (old) => {
-              if (!old) return [newOp];
-              if (old.some((op) => op.id === newOp.id)) return old;
-              return [...old, newOp];
-            }
-          );
+          // Apply to the incremental ledger (O(1), deduplicated by id).
+          // The cached full ledger is left untouched to avoid copying it.
+          if (!applyLedgerOperation(workspaceId, newOp)) return;
 
           // Invalidate related queries
           queryClient.invalidateQueries({
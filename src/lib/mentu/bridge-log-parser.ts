@@ -0,0 +1,147 @@
+// Incremental bridge log parser
+// Bridge output is append-only, so each stream keeps its parse state across
+// chunks: only new text is split and classified, and every entry keeps the
+// id and timestamp it was first parsed with.
+
+export type LogEntryType = 'system' | 'agent' | 'tool' | 'todo' | 'error' | 'task' | 'file';
+
+export interface LogEntry {
+  id: string;
+  timestamp: string;
+  type: LogEntryType;
+  content: string;
+  metadata?: Record<string, unknown>;
+}
+
+// Case-insensitive literal without a global `i` flag, so that the other
+// rules keep their case-sensitive semantics inside the same expression
+function ci(literal: string): string {
+  return literal.replace(/[a-z]/gi, (c) => `[${c.toLowerCase()}${c.toUpperCase()}]`);
+}
+
+// Rules in precedence order; the first rule with a matching alternative wins
+const RULES: Array<[LogEntryType, string[]]> = [
+  ['error', ['\\[ERROR\\]', `.*${ci('error:')}`]],
+  ['system', ['\\[SYSTEM\\]', '.*initialized', '.*Starting']],
+  ['tool', ['\\[TOOL\\]', '.*Using tool', '\\[.*\\]']],
+  ['todo', ['.*TODO', '.*\\[ \\]', '.*\\[[xX]\\]']],
+  ['task', ['.*\\[TASK\\]', '.*Task:', `(?:${ci('Running')}|${ci('Executing')}|${ci('Starting task')})`]],
+  [
+    'file',
+    [
+      '.*\\.(?:ts|tsx|js|jsx|json|md|css|html|py)[\\s:$]',
+      '.*File:',
+      `(?:${ci('Reading')}|${ci('Writing')}|${ci('Editing')}|${ci('Created')}|${ci('Modified')})`,
+    ],
+  ],
+];
+
+// One lookahead per rule, each followed by an empty capture group; the
+// alternation is tried in order at position 0 and the defined group tells
+// which rule matched. The `s` flag lets `.` cross the carriage returns that
+// progress output leaves inside a line.
+const LINE_MATCHER = new RegExp(
+  `^(?:${RULES.map(([, alternatives]) => `(?=${alternatives.join('|')})()`).join('|')})`,
+  's'
+);
+
+/**
+ * Classify a single trimmed log line.
+ */
+export function classifyLogLine(line: string): LogEntryType {
+  const match = LINE_MATCHER.exec(line);
+  if (!match) return 'agent';
+  for (let i = 1; i < match.length; i++) {
+    if (match[i] !== undefined) return RULES[i - 1][0];
+  }
+  return 'agent';
+}
+
+export interface LogParser {
+  /** Parse newly appended output; returns the entries for completed lines. */
+  push(chunk: string): LogEntry[];
+  /** The trailing line without a newline yet, as a provisional entry. */
+  pending(): LogEntry | null;
+  /** Complete the trailing line (e.g. once the command finished). */
+  flush(): LogEntry[];
+  /** An independent parser continuing from the current state. */
+  fork(): LogParser;
+}
+
+export interface LogParserOptions {
+  /** Prefix for entry ids, unique per stream. */
+  prefix: string;
+  /** Force every entry to this type (stderr is always 'error'). */
+  type?: LogEntryType;
+}
+
+interface ParseState {
+  partial: string;
+  lineNumber: number;
+  provisional: LogEntry | null;
+}
+
+/**
+ * Create a parser for one append-only output stream.
+ *
+ * Entry ids are derived from the line number, so the same line always gets
+ * the same id no matter how the output was split into chunks.
+ */
+export function createLogParser(options: LogParserOptions): LogParser {
+  return resumeLogParser(options, { partial: '', lineNumber: 0, provisional: null });
+}
+
+function resumeLogParser({ prefix, type }: LogParserOptions, state: ParseState): LogParser {
+  let { partial, lineNumber, provisional } = state;
+
+  const toEntry = (raw: string, line: number, timestamp: string): LogEntry | null => {
+    const content = raw.trim();
+    if (!content) return null;
+    return {
+      id: `${prefix}-${line}`,
+      timestamp,
+      type: type ?? classifyLogLine(content),
+      content,
+    };
+  };
+
+  return {
+    push(chunk) {
+      if (!chunk) return [];
+      const timestamp = new Date().toISOString();
+      const lines = (partial + chunk).split('\n');
+      partial = lines.pop() ?? '';
+
+      const entries: LogEntry[] = [];
+      for (const raw of lines) {
+        // Keep the first-seen timestamp of a line that was shown provisionally
+        const seen = provisional?.id === `${prefix}-${lineNumber}` ? provisional.timestamp : timestamp;
+        const entry = toEntry(raw, lineNumber++, seen);
+        if (entry) entries.push(entry);
+      }
+      if (lines.length > 0) provisional = null;
+      return entries;
+    },
+
+    pending() {
+      if (!partial.trim()) return null;
+      const content = partial.trim();
+      // Reuse the entry while the trailing line is unchanged
+      if (provisional && provisional.content === content) return provisional;
+      provisional = toEntry(partial, lineNumber, provisional?.timestamp ?? new Date().toISOString());
+      return provisional;
+    },
+
+    flush() {
+      if (!partial) return [];
+      const entry = toEntry(partial, lineNumber++, provisional?.timestamp ?? new Date().toISOString());
+      partial = '';
+      provisional = null;
+      return entry ? [entry] : [];
+    },
+
+    fork() {
+      return resumeLogParser({ prefix, type }, { partial, lineNumber, provisional });
+    },
+  };
+}
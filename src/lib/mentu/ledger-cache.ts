@@ -0,0 +1,155 @@
+// Persistent ledger cache (IndexedDB)
+// Stores each workspace's operations in ledger order together with the
+// (synced_at, id) high-water mark, so a revisit only fetches newer rows.
+// The cache is best-effort: any IndexedDB failure degrades to a full fetch.
+
+import type { OperationRow } from './types';
+
+const DB_NAME = 'mentu-ledger';
+const DB_VERSION = 1;
+const OPS_STORE = 'operations';
+const CURSOR_STORE = 'cursors';
+
+/**
+ * Keyset position in the ledger, ordered by (synced_at, id).
+ */
+export interface LedgerCursor {
+  synced_at: string;
+  id: string;
+}
+
+interface CachedOperation {
+  workspace_id: string;
+  /** synced_at, or '' for rows that were never synced. */
+  sort: string;
+  id: string;
+  op: OperationRow;
+}
+
+interface CachedCursor extends LedgerCursor {
+  workspace_id: string;
+}
+
+let dbPromise: Promise<IDBDatabase | null> | null = null;
+
+function requestToPromise<T>(request: IDBRequest<T>): Promise<T> {
+  return new Promise((resolve, reject) => {
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+}
+
+function transactionDone(tx: IDBTransaction): Promise<void> {
+  return new Promise((resolve, reject) => {
+    tx.oncomplete = () => resolve();
+    tx.onerror = () => reject(tx.error);
+    tx.onabort = () => reject(tx.error);
+  });
+}
+
+function openDatabase(): Promise<IDBDatabase | null> {
+  if (typeof indexedDB === 'undefined') return Promise.resolve(null);
+
+  if (!dbPromise) {
+    dbPromise = new Promise<IDBDatabase | null>((resolve) => {
+      const request = indexedDB.open(DB_NAME, DB_VERSION);
+      request.onupgradeneeded = () => {
+        const db = request.result;
+        // Compound key keeps each workspace's rows contiguous and in ledger order
+        if (!db.objectStoreNames.contains(OPS_STORE)) {
+          db.createObjectStore(OPS_STORE, { keyPath: ['workspace_id', 'sort', 'id'] });
+        }
+        if (!db.objectStoreNames.contains(CURSOR_STORE)) {
+          db.createObjectStore(CURSOR_STORE, { keyPath: 'workspace_id' });
+        }
+      };
+      request.onsuccess = () => resolve(request.result);
+      request.onerror = () => {
+        console.warn('[ledger-cache] IndexedDB unavailable:', request.error);
+        resolve(null);
+      };
+    });
+  }
+
+  return dbPromise;
+}
+
+function workspaceRange(workspaceId: string): IDBKeyRange {
+  // [] sorts after every string, so this spans all keys of the workspace
+  return IDBKeyRange.bound([workspaceId], [workspaceId, []]);
+}
+
+/**
+ * Load the cached ledger for a workspace, or null if nothing is cached.
+ */
+export async function loadCachedLedger(
+  workspaceId: string
+): Promise<{ ops: OperationRow[]; cursor: LedgerCursor } | null> {
+  const db = await openDatabase();
+  if (!db) return null;
+
+  try {
+    const tx = db.transaction([OPS_STORE, CURSOR_STORE], 'readonly');
+    const [cursor, rows] = await Promise.all([
+      requestToPromise(tx.objectStore(CURSOR_STORE).get(workspaceId) as IDBRequest<CachedCursor | undefined>),
+      requestToPromise(tx.objectStore(OPS_STORE).getAll(workspaceRange(workspaceId)) as IDBRequest<CachedOperation[]>),
+    ]);
+    if (!cursor) return null;
+
+    return {
+      ops: rows.map(row => row.op),
+      cursor: { synced_at: cursor.synced_at, id: cursor.id },
+    };
+  } catch (error) {
+    console.warn('[ledger-cache] Failed to read cached ledger:', error);
+    return null;
+  }
+}
+
+/**
+ * Append operations to the cached ledger and advance its high-water mark.
+ */
+export async function appendCachedLedger(
+  workspaceId: string,
+  ops: OperationRow[],
+  cursor: LedgerCursor
+): Promise<void> {
+  const db = await openDatabase();
+  if (!db) return;
+
+  try {
+    const tx = db.transaction([OPS_STORE, CURSOR_STORE], 'readwrite');
+    const opsStore = tx.objectStore(OPS_STORE);
+    for (const op of ops) {
+      const row: CachedOperation = { workspace_id: workspaceId, sort: op.synced_at ?? '', id: op.id, op };
+      opsStore.put(row);
+    }
+    const cached: CachedCursor = { workspace_id: workspaceId, ...cursor };
+    tx.objectStore(CURSOR_STORE).put(cached);
+    await transactionDone(tx);
+  } catch (error) {
+    console.warn('[ledger-cache] Failed to write cached ledger:', error);
+  }
+}
+
+/**
+ * Remove the cached ledger of one workspace, or of all workspaces.
+ */
+export async function clearCachedLedger(workspaceId?: string): Promise<void> {
+  const db = await openDatabase();
+  if (!db) return;
+
+  try {
+    const tx = db.transaction([OPS_STORE, CURSOR_STORE], 'readwrite');
+    if (workspaceId) {
+      tx.objectStore(OPS_STORE).delete(workspaceRange(workspaceId));
+      tx.objectStore(CURSOR_STORE).delete(workspaceId);
+    } else {
+      tx.objectStore(OPS_STORE).clear();
+      tx.objectStore(CURSOR_STORE).clear();
+    }
+    await transactionDone(tx);
+  } catch (error) {
+    console.warn('[ledger-cache] Failed to clear cached ledger:', error);
+  }
+}
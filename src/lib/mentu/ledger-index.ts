@@ -0,0 +1,379 @@
+// Ledger projection index
+// Builds every per-record view of the ledger in a single pass so that
+// state lookups no longer rescan the full operation list.
+
+import type {
+  OperationRow,
+  Memory,
+  Commitment,
+  CommitmentState,
+  Annotation,
+  CapturePayload,
+  CommitPayload,
+  AnnotatePayload,
+} from './types';
+
+/**
+ * Replayed lifecycle of a single commitment.
+ */
+export interface CommitmentProjection {
+  state: CommitmentState;
+  owner: string | null;
+  evidence: string | null;
+  closed_by: string | null;
+  /** Timestamp of the first `close` operation, if any. */
+  closed_at: string | null;
+}
+
+export interface LedgerIndex {
+  /** Operation ids already applied (duplicates are ignored). */
+  seen: Set<string>;
+  /** Number of operations applied. */
+  size: number;
+  /** Number of operations applied, per operation type. */
+  opCounts: Record<string, number>;
+  commitOps: Map<string, OperationRow>;
+  captureOps: Map<string, OperationRow>;
+  /** Commitment ids and memory ids in ledger order. */
+  commitmentIds: string[];
+  memoryIds: string[];
+  /** Position of each commitment id in `commitmentIds`. */
+  commitmentOrder: Map<string, number>;
+  /** Position of each memory id in `memoryIds`. */
+  memoryOrder: Map<string, number>;
+  projections: Map<string, CommitmentProjection>;
+  annotations: Map<string, Annotation[]>;
+  timelines: Map<string, OperationRow[]>;
+  /** Source memory id -> commitment ids, in ledger order. */
+  bySource: Map<string, string[]>;
+  /** Evidence memory id -> commitment ids. */
+  byEvidence: Map<string, Set<string>>;
+  commitments: Map<string, Commitment>;
+  memories: Map<string, Memory>;
+  actors: Set<string>;
+}
+
+const EMPTY_ANNOTATIONS: Annotation[] = [];
+
+// Operations that appear in a commitment timeline (besides the commit itself)
+const TIMELINE_OPS = new Set(['claim', 'release', 'close']);
+
+/**
+ * Create an empty ledger index.
+ */
+export function createLedgerIndex(): LedgerIndex {
+  return {
+    seen: new Set(),
+    size: 0,
+    opCounts: {},
+    commitOps: new Map(),
+    captureOps: new Map(),
+    commitmentIds: [],
+    memoryIds: [],
+    commitmentOrder: new Map(),
+    memoryOrder: new Map(),
+    projections: new Map(),
+    annotations: new Map(),
+    timelines: new Map(),
+    bySource: new Map(),
+    byEvidence: new Map(),
+    commitments: new Map(),
+    memories: new Map(),
+    actors: new Set(),
+  };
+}
+
+function initialProjection(): CommitmentProjection {
+  return { state: 'open', owner: null, evidence: null, closed_by: null, closed_at: null };
+}
+
+/**
+ * Insert an operation into a timeline keeping it sorted by timestamp.
+ * Equal timestamps keep ledger order, matching a stable sort.
+ */
+function insertTimeline(timeline: OperationRow[], op: OperationRow): void {
+  const t = new Date(op.ts).getTime();
+  let lo = 0;
+  let hi = timeline.length;
+  // Fast path: ledger order is almost always chronological
+  if (hi === 0 || new Date(timeline[hi - 1].ts).getTime() <= t) {
+    timeline.push(op);
+    return;
+  }
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    if (new Date(timeline[mid].ts).getTime() <= t) lo = mid + 1;
+    else hi = mid;
+  }
+  timeline.splice(lo, 0, op);
+}
+
+function addToTimeline(index: LedgerIndex, cmtId: string, op: OperationRow): void {
+  let timeline = index.timelines.get(cmtId);
+  if (!timeline) {
+    timeline = [];
+    index.timelines.set(cmtId, timeline);
+  }
+  insertTimeline(timeline, op);
+}
+
+function materializeCommitment(index: LedgerIndex, id: string): void {
+  const op = index.commitOps.get(id);
+  if (!op) return;
+  const payload = op.payload as CommitPayload;
+  const projection = index.projections.get(id) ?? initialProjection();
+
+  index.commitments.set(id, {
+    id: op.id,
+    body: payload.body,
+    source: payload.source,
+    state: projection.state,
+    owner: projection.owner,
+    evidence: projection.evidence,
+    closed_by: projection.closed_by,
+    actor: op.actor,
+    ts: op.ts,
+    tags: payload.tags,
+    meta: payload.meta,
+    annotations: index.annotations.get(id) ?? EMPTY_ANNOTATIONS,
+  });
+}
+
+function materializeMemory(index: LedgerIndex, id: string): void {
+  const op = index.captureOps.get(id);
+  if (!op) return;
+  const payload = op.payload as CapturePayload;
+
+  index.memories.set(id, {
+    id: op.id,
+    body: payload.body,
+    kind: payload.kind ?? null,
+    actor: op.actor,
+    ts: op.ts,
+    refs: payload.refs,
+    meta: payload.meta,
+    annotations: index.annotations.get(id) ?? EMPTY_ANNOTATIONS,
+  });
+}
+
+function setEvidence(index: LedgerIndex, cmtId: string, prev: string | null, next: string | null): void {
+  if (prev === next) return;
+  if (prev) index.byEvidence.get(prev)?.delete(cmtId);
+  if (next) {
+    let ids = index.byEvidence.get(next);
+    if (!ids) {
+      ids = new Set();
+      index.byEvidence.set(next, ids);
+    }
+    ids.add(cmtId);
+  }
+}
+
+/**
+ * Apply one lifecycle operation to a commitment projection.
+ * Mirrors the transitions of the CLI state machine.
+ */
+function applyTransition(index: LedgerIndex, cmtId: string, op: OperationRow): void {
+  const prev = index.projections.get(cmtId) ?? initialProjection();
+  const next: CommitmentProjection = { ...prev };
+
+  switch (op.op) {
+    case 'claim':
+      next.state = 'claimed';
+      next.owner = op.actor;
+      break;
+    case 'release':
+      next.state = 'open';
+      next.owner = null;
+      break;
+    case 'submit':
+      // owner stays the same during review
+      next.state = 'in_review';
+      break;
+    case 'approve':
+      next.state = 'closed';
+      next.owner = null;
+      next.evidence = (op.payload as { evidence?: string }).evidence || null;
+      next.closed_by = op.actor;
+      break;
+    case 'reopen':
+      // owner stays claimed to the original claimant
+      next.state = 'reopened';
+      break;
+    case 'close':
+      next.state = 'closed';
+      next.owner = null;
+      next.evidence = (op.payload as { evidence: string }).evidence;
+      next.closed_by = op.actor;
+      if (next.closed_at === null) next.closed_at = op.ts;
+      break;
+    case 'cancel':
+      next.state = 'cancelled';
+      next.owner = null;
+      break;
+    default:
+      return;
+  }
+
+  index.projections.set(cmtId, next);
+  setEvidence(index, cmtId, prev.evidence, next.evidence);
+}
+
+/**
+ * Apply a single operation to the index in O(1) (amortized).
+ * Returns the ids of the commitments and memories whose projection changed,
+ * or null if the operation was a duplicate.
+ */
+export function applyOperation(
+  index: LedgerIndex,
+  op: OperationRow
+): { commitments: string[]; memories: string[] } | null {
+  return applyOperationWith(index, op, false);
+}
+
+/**
+ * `inPlace` appends annotations to the existing arrays. Only safe while no
+ * record built from the index has been handed out, i.e. during a full build.
+ */
+function applyOperationWith(
+  index: LedgerIndex,
+  op: OperationRow,
+  inPlace: boolean
+): { commitments: string[]; memories: string[] } | null {
+  if (index.seen.has(op.id)) return null;
+  index.seen.add(op.id);
+  index.size++;
+  index.opCounts[op.op] = (index.opCounts[op.op] || 0) + 1;
+  index.actors.add(op.actor);
+
+  const changed = { commitments: [] as string[], memories: [] as string[] };
+
+  switch (op.op) {
+    case 'commit': {
+      if (index.commitOps.has(op.id)) break;
+      const payload = op.payload as CommitPayload;
+      index.commitOps.set(op.id, op);
+      index.commitmentOrder.set(op.id, index.commitmentIds.length);
+      index.commitmentIds.push(op.id);
+      const siblings = index.bySource.get(payload.source);
+      if (siblings) siblings.push(op.id);
+      else index.bySource.set(payload.source, [op.id]);
+      addToTimeline(index, op.id, op);
+      materializeCommitment(index, op.id);
+      changed.commitments.push(op.id);
+      break;
+    }
+    case 'capture': {
+      if (index.captureOps.has(op.id)) break;
+      index.captureOps.set(op.id, op);
+      index.memoryOrder.set(op.id, index.memoryIds.length);
+      index.memoryIds.push(op.id);
+      materializeMemory(index, op.id);
+      changed.memories.push(op.id);
+      break;
+    }
+    case 'annotate': {
+      const payload = op.payload as AnnotatePayload;
+      const target = payload.target;
+      const annotation: Annotation = {
+        id: op.id,
+        body: payload.body,
+        kind: payload.kind,
+        actor: op.actor,
+        ts: op.ts,
+      };
+      const existing = index.annotations.get(target);
+      if (!existing) {
+        index.annotations.set(target, [annotation]);
+      } else if (inPlace) {
+        existing.push(annotation);
+      } else {
+        // Copy-on-write so previously published records stay immutable
+        index.annotations.set(target, [...existing, annotation]);
+      }
+      addToTimeline(index, target, op);
+      if (index.commitOps.has(target)) {
+        materializeCommitment(index, target);
+        changed.commitments.push(target);
+      }
+      if (index.captureOps.has(target)) {
+        materializeMemory(index, target);
+        changed.memories.push(target);
+      }
+      break;
+    }
+    default: {
+      const cmtId = (op.payload as { commitment?: string } | null)?.commitment;
+      if (!cmtId) break;
+      applyTransition(index, cmtId, op);
+      if (TIMELINE_OPS.has(op.op)) addToTimeline(index, cmtId, op);
+      if (index.commitOps.has(cmtId)) {
+        materializeCommitment(index, cmtId);
+        changed.commitments.push(cmtId);
+      }
+    }
+  }
+
+  return changed;
+}
+
+/**
+ * Build an index from a full ledger in a single pass.
+ */
+export function buildLedgerIndex(ops: OperationRow[]): LedgerIndex {
+  const index = createLedgerIndex();
+  // Nothing has been published yet, so annotations can be appended in place
+  for (const op of ops) {
+    applyOperationWith(index, op, true);
+  }
+  return index;
+}
+
+// Indexes are cached per ledger array. React Query hands out the same array
+// reference until the data changes, so repeated lookups reuse one projection.
+// An entry is only valid while neither the array nor the index has grown.
+const indexCache = new WeakMap<OperationRow[], { length: number; size: number; index: LedgerIndex }>();
+
+/**
+ * Get the (memoized) index for a ledger array.
+ */
+export function getLedgerIndex(ops: OperationRow[]): LedgerIndex {
+  const cached = indexCache.get(ops);
+  if (cached && cached.length === ops.length && cached.size === cached.index.size) {
+    return cached.index;
+  }
+
+  const index = buildLedgerIndex(ops);
+  indexCache.set(ops, { length: ops.length, size: index.size, index });
+  return index;
+}
+
+/**
+ * Register an index that was built incrementally for `ops`, so that
+ * state lookups on that array reuse it instead of replaying again.
+ */
+export function primeLedgerIndex(ops: OperationRow[], index: LedgerIndex): void {
+  indexCache.set(ops, { length: ops.length, size: index.size, index });
+}
+
+/**
+ * Get the projection for a commitment id, including ops that arrived
+ * before (or without) the commit itself.
+ */
+export function getProjection(index: LedgerIndex, cmtId: string): CommitmentProjection {
+  return index.projections.get(cmtId) ?? initialProjection();
+}
+
+/**
+ * List commitments in ledger order.
+ */
+export function listCommitments(index: LedgerIndex): Commitment[] {
+  return index.commitmentIds.map(id => index.commitments.get(id)!);
+}
+
+/**
+ * List memories in ledger order.
+ */
+export function listMemories(index: LedgerIndex): Memory[] {
+  return index.memoryIds.map(id => index.memories.get(id)!);
+}
@@ -0,0 +1,402 @@
+// Incremental ledger store
+// Holds one live LedgerIndex per workspace. The initial fetch seeds it and
+// realtime inserts are applied one operation at a time, so a new operation
+// never triggers a full replay or a copy of the cached ledger.
+
+import type { OperationRow, Commitment, Memory, WorkspaceStats } from './types';
+import {
+  applyOperation,
+  buildLedgerIndex,
+  primeLedgerIndex,
+  type LedgerIndex,
+} from './ledger-index';
+
+/**
+ * Immutable view of a workspace ledger at one version.
+ * Records and stats are captured when the snapshot is taken; later
+ * operations never change an existing snapshot.
+ */
+export interface LedgerSnapshot {
+  version: number;
+  /** Number of operations in the ledger. */
+  size: number;
+  /** Number of operations per operation type. */
+  opCounts: Readonly<Record<string, number>>;
+  stats: WorkspaceStats;
+  /** Commitments in ledger order, flattened on first access. */
+  readonly commitments: Commitment[];
+  /** Memories in ledger order, flattened on first access. */
+  readonly memories: Memory[];
+  getCommitment(id: string): Commitment | null;
+  getMemory(id: string): Memory | null;
+  /** The operation log, copied on first access. */
+  readonly operations: OperationRow[];
+}
+
+interface ChangedRecords {
+  commitments: Set<string>;
+  memories: Set<string>;
+}
+
+// Records per chunk of a RecordList
+const CHUNK_SIZE = 256;
+
+/**
+ * Persistent list of records in ledger order. Chunks are never modified
+ * once a snapshot holds them; a change copies only the chunk it touches.
+ */
+interface RecordList<T> {
+  chunks: T[][];
+  length: number;
+}
+
+/**
+ * Running counters behind WorkspaceStats, updated from changed records.
+ */
+interface StatsTracker {
+  states: Record<string, number>;
+  /** Closed commitments with evidence -> first close time (ms), if within the last week. */
+  recentlyClosed: Map<string, number>;
+  activeActors: Set<string>;
+}
+
+interface WorkspaceLedger {
+  index: LedgerIndex;
+  /** Append-only operation log (deduplicated). */
+  ops: OperationRow[];
+  /** Array the ledger was last seeded from, to make seeding idempotent. */
+  seededFrom: OperationRow[] | null;
+  version: number;
+  /** Last snapshot taken; stale once its version is behind. */
+  snapshot: LedgerSnapshot | null;
+  /** Record lists of `snapshot`. */
+  commitmentList: RecordList<Commitment>;
+  memoryList: RecordList<Memory>;
+  stats: StatsTracker;
+  /** Records changed since `snapshot` was taken, or null after a full reseed. */
+  changed: ChangedRecords | null;
+  listeners: Set<() => void>;
+  notifyScheduled: boolean;
+}
+
+const ledgers = new Map<string, WorkspaceLedger>();
+
+function emptyList<T>(): RecordList<T> {
+  return { chunks: [], length: 0 };
+}
+
+function emptyStats(): StatsTracker {
+  return { states: {}, recentlyClosed: new Map(), activeActors: new Set() };
+}
+
+function getOrCreate(workspaceId: string): WorkspaceLedger {
+  let ledger = ledgers.get(workspaceId);
+  if (!ledger) {
+    ledger = {
+      index: buildLedgerIndex([]),
+      ops: [],
+      seededFrom: null,
+      version: 0,
+      snapshot: null,
+      commitmentList: emptyList(),
+      memoryList: emptyList(),
+      stats: emptyStats(),
+      changed: null,
+      listeners: new Set(),
+      notifyScheduled: false,
+    };
+    ledgers.set(workspaceId, ledger);
+  }
+  return ledger;
+}
+
+// Bursts of inserts are coalesced into one notification per microtask
+function scheduleNotify(ledger: WorkspaceLedger): void {
+  if (ledger.notifyScheduled) return;
+  ledger.notifyScheduled = true;
+  queueMicrotask(() => {
+    ledger.notifyScheduled = false;
+    ledger.listeners.forEach(listener => listener());
+  });
+}
+
+function recordChanges(
+  ledger: WorkspaceLedger,
+  changed: { commitments: string[]; memories: string[] }
+): void {
+  if (!ledger.changed) return;
+  changed.commitments.forEach(id => ledger.changed!.commitments.add(id));
+  changed.memories.forEach(id => ledger.changed!.memories.add(id));
+}
+
+function listAt<T>(list: RecordList<T>, position: number | undefined): T | null {
+  if (position === undefined || position >= list.length) return null;
+  return list.chunks[Math.floor(position / CHUNK_SIZE)][position % CHUNK_SIZE];
+}
+
+function flattenList<T>(list: RecordList<T>): T[] {
+  const items: T[] = [];
+  for (const chunk of list.chunks) {
+    for (const item of chunk) items.push(item);
+  }
+  return items;
+}
+
+/**
+ * Derive a record list from the previous one. Records are appended in
+ * ledger order and keep their position, so only the chunks holding new or
+ * changed records are copied.
+ */
+function patchList<T>(
+  previous: RecordList<T>,
+  ids: string[],
+  order: Map<string, number>,
+  records: Map<string, T>,
+  changed: Set<string> | null
+): RecordList<T> {
+  const chunks = changed ? previous.chunks.slice() : [];
+  const copied = new Set<number>();
+  const set = (position: number, record: T) => {
+    const c = Math.floor(position / CHUNK_SIZE);
+    if (!copied.has(c)) {
+      chunks[c] = chunks[c] ? chunks[c].slice() : [];
+      copied.add(c);
+    }
+    chunks[c][position % CHUNK_SIZE] = record;
+  };
+
+  for (let i = changed ? previous.length : 0; i < ids.length; i++) {
+    set(i, records.get(ids[i])!);
+  }
+  changed?.forEach(id => {
+    const position = order.get(id);
+    if (position !== undefined && position < previous.length) set(position, records.get(id)!);
+  });
+  if (copied.size === 0 && previous.length === ids.length) return previous;
+  return { chunks, length: ids.length };
+}
+
+function weekAgo(): number {
+  const oneWeekAgo = new Date();
+  oneWeekAgo.setDate(oneWeekAgo.getDate() - 7);
+  return oneWeekAgo.getTime();
+}
+
+/**
+ * Move a commitment's contribution to the stats from `before` to `after`.
+ * Mirrors computeStatsFromIndex in state.ts.
+ */
+function trackCommitment(
+  stats: StatsTracker,
+  index: LedgerIndex,
+  before: Commitment | null,
+  after: Commitment,
+  since: number
+): void {
+  if (before) stats.states[before.state]--;
+  stats.states[after.state] = (stats.states[after.state] || 0) + 1;
+
+  // Closed-this-week is measured from the first close operation
+  const closedAt = index.projections.get(after.id)?.closed_at;
+  const closedTime = closedAt ? new Date(closedAt).getTime() : NaN;
+  if (after.state === 'closed' && after.evidence && closedTime >= since) {
+    stats.recentlyClosed.set(after.id, closedTime);
+  } else {
+    stats.recentlyClosed.delete(after.id);
+  }
+}
+
+function createSnapshot(ledger: WorkspaceLedger): LedgerSnapshot {
+  const { index, version, changed } = ledger;
+  const ops = ledger.ops;
+  const size = ops.length;
+  const since = weekAgo();
+
+  // Stats are adjusted from the records the previous lists held
+  if (!changed) ledger.stats = emptyStats();
+  const stats = ledger.stats;
+  const previousCommitments = ledger.commitmentList;
+  const changedCommitments = changed ? changed.commitments : index.commitmentIds;
+  changedCommitments.forEach(id => {
+    const position = index.commitmentOrder.get(id);
+    const before = changed ? listAt(previousCommitments, position) : null;
+    const after = index.commitments.get(id);
+    if (after) trackCommitment(stats, index, before, after, since);
+  });
+  stats.recentlyClosed.forEach((closedTime, id) => {
+    if (closedTime < since) stats.recentlyClosed.delete(id);
+  });
+  if (stats.activeActors.size !== index.actors.size) stats.activeActors = new Set(index.actors);
+
+  const commitmentList = patchList(
+    previousCommitments,
+    index.commitmentIds,
+    index.commitmentOrder,
+    index.commitments,
+    changed?.commitments ?? null
+  );
+  const memoryList = patchList(
+    ledger.memoryList,
+    index.memoryIds,
+    index.memoryOrder,
+    index.memories,
+    changed?.memories ?? null
+  );
+  ledger.commitmentList = commitmentList;
+  ledger.memoryList = memoryList;
+  ledger.changed = { commitments: new Set(), memories: new Set() };
+
+  let commitments: Commitment[] | null = null;
+  let memories: Memory[] | null = null;
+  let operations: OperationRow[] | null = null;
+
+  return {
+    version,
+    size,
+    opCounts: { ...index.opCounts },
+    stats: {
+      openCount: stats.states.open || 0,
+      claimedCount: stats.states.claimed || 0,
+      closedCount: stats.states.closed || 0,
+      closedThisWeek: stats.recentlyClosed.size,
+      totalMemories: memoryList.length,
+      // Replaced, never mutated, when a new actor appears
+      activeActors: stats.activeActors,
+    },
+    get commitments() {
+      return (commitments ??= flattenList(commitmentList));
+    },
+    get memories() {
+      return (memories ??= flattenList(memoryList));
+    },
+    // Positions are assigned once and never move, so they also locate
+    // records in older lists; ids added later fall outside the list
+    getCommitment(id) {
+      return listAt(commitmentList, index.commitmentOrder.get(id));
+    },
+    getMemory(id) {
+      return listAt(memoryList, index.memoryOrder.get(id));
+    },
+    get operations() {
+      if (!operations) {
+        // A reseed replaces `ledger.ops`, so `ops` is only ever appended to
+        operations = ops.slice(0, size);
+        // Let state.ts lookups on this array reuse the live index
+        if (index.size === size) primeLedgerIndex(operations, index);
+      }
+      return operations;
+    },
+  };
+}
+
+function dedupeById(ops: OperationRow[]): OperationRow[] {
+  const ids = new Set<string>();
+  return ops.filter(op => {
+    if (ids.has(op.id)) return false;
+    ids.add(op.id);
+    return true;
+  });
+}
+
+/**
+ * Replace a workspace ledger with a freshly fetched operation list.
+ * Calling it again with the same array is a no-op, and an array that
+ * extends the previously seeded one only applies the appended operations.
+ */
+export function seedLedger(workspaceId: string, ops: OperationRow[]): void {
+  const ledger = getOrCreate(workspaceId);
+  const previous = ledger.seededFrom;
+  if (previous === ops) return;
+
+  // Delta fetches extend the previous array; apply just the new tail
+  if (
+    previous &&
+    previous.length > 0 &&
+    ops.length > previous.length &&
+    ops[previous.length - 1] === previous[previous.length - 1]
+  ) {
+    let applied = false;
+    for (let i = previous.length; i < ops.length; i++) {
+      const changed = applyOperation(ledger.index, ops[i]);
+      if (changed) {
+        ledger.ops.push(ops[i]);
+        recordChanges(ledger, changed);
+        applied = true;
+      }
+    }
+    ledger.seededFrom = ops;
+    if (applied) {
+      ledger.version++;
+      scheduleNotify(ledger);
+    }
+    return;
+  }
+
+  // A full build appends annotations in place instead of copying per op
+  const index = buildLedgerIndex(ops);
+  const deduped = index.size === ops.length ? ops.slice() : dedupeById(ops);
+  // Keep realtime inserts the fetch did not include yet
+  for (const op of ledger.ops) {
+    if (applyOperation(index, op)) deduped.push(op);
+  }
+
+  ledger.index = index;
+  ledger.ops = deduped;
+  ledger.seededFrom = ops;
+  ledger.version++;
+  ledger.changed = null;
+  scheduleNotify(ledger);
+}
+
+/**
+ * Apply a single (possibly duplicate) operation in O(1).
+ * Returns false if the operation was already in the ledger.
+ */
+export function applyLedgerOperation(workspaceId: string, op: OperationRow): boolean {
+  const ledger = getOrCreate(workspaceId);
+  const changed = applyOperation(ledger.index, op);
+  if (!changed) return false;
+
+  ledger.ops.push(op);
+  recordChanges(ledger, changed);
+  ledger.version++;
+  scheduleNotify(ledger);
+  return true;
+}
+
+/**
+ * Get the current snapshot for a workspace (stable until the next change).
+ */
+export function getLedgerSnapshot(workspaceId: string): LedgerSnapshot {
+  const ledger = getOrCreate(workspaceId);
+  if (!ledger.snapshot || ledger.snapshot.version !== ledger.version) {
+    ledger.snapshot = createSnapshot(ledger);
+  }
+  return ledger.snapshot;
+}
+
+/**
+ * Whether a workspace ledger has been seeded from a fetch yet.
+ */
+export function isLedgerSeeded(workspaceId: string): boolean {
+  return ledgers.get(workspaceId)?.seededFrom != null;
+}
+
+/**
+ * Subscribe to changes of a workspace ledger.
+ */
+export function subscribeLedger(workspaceId: string, listener: () => void): () => void {
+  const ledger = getOrCreate(workspaceId);
+  ledger.listeners.add(listener);
+  return () => {
+    ledger.listeners.delete(listener);
+  };
+}
+
+/**
+ * Drop a workspace ledger (e.g. on sign-out).
+ */
+export function resetLedger(workspaceId?: string): void {
+  if (workspaceId) ledgers.delete(workspaceId);
+  else ledgers.clear();
+}
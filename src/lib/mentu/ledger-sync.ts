@@ -0,0 +1,93 @@
+// Ledger sync helpers
+// Keyset arithmetic behind useOperations: splitting a cold load into
+// windows, tracking the (synced_at, id) high-water mark and merging
+// overlapping delta fetches into a loaded ledger.
+
+import type { OperationRow } from './types';
+import type { LedgerCursor } from './ledger-cache';
+
+/**
+ * Lower bound of a keyset range. Without an id it is a plain
+ * `synced_at > ts` bound.
+ */
+export interface KeysetBound {
+  synced_at: string;
+  id?: string;
+}
+
+/**
+ * One range of a cold load: rows strictly after `after` and, unless
+ * `until` is null, with synced_at <= `until`.
+ */
+export interface KeysetWindow {
+  after: KeysetBound;
+  until: string | null;
+}
+
+/**
+ * Split the rows after the first page into up to `count` contiguous
+ * windows between the first page's last row and the newest synced_at.
+ * The last window is open-ended to pick up rows inserted meanwhile.
+ */
+export function keysetWindows(last: LedgerCursor, newest: string | null, count: number): KeysetWindow[] {
+  // +1ms keeps every window bound strictly after the first page's last row,
+  // whose synced_at may carry sub-millisecond precision
+  const start = new Date(last.synced_at).getTime() + 1;
+  const end = new Date(newest ?? last.synced_at).getTime();
+
+  const bounds: string[] = [];
+  const span = Math.max(end - start, 0);
+  for (let i = 1; i < count && span > 0; i++) {
+    bounds.push(new Date(start + Math.floor((span * i) / count)).toISOString());
+  }
+
+  return [null, ...bounds].map((lower, i) => ({
+    after: lower === null ? { synced_at: last.synced_at, id: last.id } : { synced_at: lower },
+    until: bounds[i] ?? null,
+  }));
+}
+
+/**
+ * Cursor of the newest synced operation in a ledger ordered by (synced_at, id).
+ */
+export function highWaterMark(ops: OperationRow[]): LedgerCursor | null {
+  for (let i = ops.length - 1; i >= 0; i--) {
+    const { synced_at, id } = ops[i];
+    if (synced_at) return { synced_at, id };
+  }
+  return null;
+}
+
+/**
+ * The later of two keyset cursors.
+ */
+export function laterCursor(a: LedgerCursor, b: LedgerCursor): LedgerCursor {
+  const ta = new Date(a.synced_at).getTime();
+  const tb = new Date(b.synced_at).getTime();
+  if (ta !== tb) return ta > tb ? a : b;
+  return a.id > b.id ? a : b;
+}
+
+/**
+ * Start of a delta fetch: `overlapMs` before the high-water mark, so rows
+ * that committed late with an earlier synced_at are read again.
+ */
+export function deltaStart(cursor: LedgerCursor, overlapMs: number): KeysetBound {
+  return { synced_at: new Date(new Date(cursor.synced_at).getTime() - overlapMs).toISOString() };
+}
+
+/**
+ * Rows of a delta fetch that are not in the ledger yet, in fetch order.
+ * `known` holds the ids of the ledger and is extended with the new rows.
+ */
+export function mergeDelta(known: Set<string>, fetched: OperationRow[][]): OperationRow[] {
+  const delta: OperationRow[] = [];
+  for (const rows of fetched) {
+    for (const op of rows) {
+      if (known.has(op.id)) continue;
+      known.add(op.id);
+      delta.push(op);
+    }
+  }
+  return delta;
+}
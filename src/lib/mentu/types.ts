@@ -337,8 +337,10 @@ export interface PanoramaWorkspace extends WorkspaceRegistryEntry {
     open: number;
     claimed: number;
     in_review: number;
+    closed?: number;
     closed_this_week: number;
     memories: number;
+    active_actors?: number;
   };
   active_sequences: PanoramaSequence[];
 }
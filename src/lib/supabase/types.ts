@@ -367,7 +367,43 @@ export interface Database {
       };
     };
     Views: Record<string, never>;
-    Functions: Record<string, never>;
+    Functions: {
+      get_panorama_summary: {
+        Args: Record<string, never>;
+        Returns: {
+          workspace_id: string;
+          open_count: number;
+          claimed_count: number;
+          in_review_count: number;
+          closed_count: number;
+          closed_this_week: number;
+          memories: number;
+          active_actors: number;
+          last_activity_at: string | null;
+          updated_at: string | null;
+        }[];
+      };
+      get_bridge_output_tail: {
+        Args: {
+          p_command_id: string;
+          p_stdout_offset?: number;
+          p_stderr_offset?: number;
+        };
+        Returns: {
+          id: string;
+          command_id: string;
+          status: 'success' | 'failed' | 'timeout' | 'cancelled';
+          exit_code: number | null;
+          error_message: string | null;
+          started_at: string;
+          completed_at: string;
+          stdout_chunk: string;
+          stderr_chunk: string;
+          stdout_length: number;
+          stderr_length: number;
+        }[];
+      };
+    };
     Enums: Record<string, never>;
   };
 }
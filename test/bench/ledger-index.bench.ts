@@ -0,0 +1,86 @@
+import { bench, describe } from 'vitest';
+import { buildLedgerIndex } from '@/lib/mentu/ledger-index';
+import { computeCommitments, computeStats } from '@/lib/mentu/state';
+import type { OperationRow, Payload } from '@/lib/mentu/types';
+
+/**
+ * Synthetic ledger: one commitment per `opsPerCommitment` operations, each
+ * followed by claims, annotations and (for most) a close.
+ */
+function syntheticLedger(totalOps: number, opsPerCommitment = 50): OperationRow[] {
+  const ops: OperationRow[] = [];
+  const base = Date.UTC(2026, 0, 1);
+  let cmt = 0;
+
+  const push = (op: OperationRow['op'], payload: Record<string, unknown>, id = `op_${ops.length}`) => {
+    ops.push({
+      id,
+      workspace_id: 'ws_bench',
+      op,
+      ts: new Date(base + ops.length * 1000).toISOString(),
+      actor: `agent:${ops.length % 7}`,
+      payload: payload as unknown as Payload,
+      client_id: null,
+      synced_at: null,
+    });
+  };
+
+  while (ops.length < totalOps) {
+    if (ops.length % opsPerCommitment === 0) {
+      push('capture', { body: `memory ${cmt}` }, `mem_${cmt}`);
+      push('commit', { body: `commitment ${cmt}`, source: `mem_${cmt}` }, `cmt_${cmt}`);
+      cmt++;
+      continue;
+    }
+    const target = `cmt_${Math.floor(Math.random() * cmt)}`;
+    const roll = ops.length % 10;
+    if (roll < 4) push('annotate', { target, body: 'progress note' });
+    else if (roll < 7) push('claim', { commitment: target });
+    else if (roll < 9) push('release', { commitment: target });
+    else push('close', { commitment: target, evidence: `mem_${cmt - 1}` });
+  }
+
+  return ops;
+}
+
+// Previous implementation: one full ledger scan per commitment
+function quadraticCommitmentStates(ops: OperationRow[]): number {
+  let closed = 0;
+  let annotated = 0;
+  for (const op of ops) {
+    if (op.op !== 'commit') continue;
+    let state = 'open';
+    let annotations = 0;
+    for (const other of ops) {
+      const payload = other.payload as { commitment?: string; target?: string };
+      if (payload.commitment === op.id) {
+        if (other.op === 'claim') state = 'claimed';
+        else if (other.op === 'release') state = 'open';
+        else if (other.op === 'close') state = 'closed';
+      } else if (other.op === 'annotate' && payload.target === op.id) {
+        annotations++;
+      }
+    }
+    if (state === 'closed') closed++;
+    annotated += annotations;
+  }
+  return closed + annotated;
+}
+
+describe('ledger replay (100k ops)', () => {
+  const ledger = syntheticLedger(100_000);
+
+  bench('quadratic replay (baseline)', () => {
+    quadraticCommitmentStates(ledger);
+  }, { iterations: 1, time: 0 });
+
+  bench('single-pass LedgerIndex', () => {
+    buildLedgerIndex(ledger);
+  });
+
+  bench('computeCommitments + computeStats (fresh array)', () => {
+    const ops = ledger.slice();
+    computeCommitments(ops);
+    computeStats(ops);
+  });
+});
@@ -0,0 +1,68 @@
+import { describe, it, expect } from 'vitest';
+import { render, screen } from '@testing-library/react';
+import { VirtualList } from '@/components/ui/virtual-list';
+
+interface Row {
+  id: string;
+  label: string;
+}
+
+const rows: Row[] = Array.from({ length: 10_000 }, (_, i) => ({ id: `row_${i}`, label: `Row ${i}` }));
+const getKey = (row: Row) => row.id;
+const renderRow = (row: Row) => <span>{row.label}</span>;
+
+describe('VirtualList', () => {
+  it('mounts only a window of rows', () => {
+    const { container } = render(
+      <VirtualList items={rows} getKey={getKey} renderItem={renderRow} estimateSize={40} />
+    );
+
+    expect(screen.getByText('Row 0')).toBeDefined();
+    expect(screen.queryByText('Row 9999')).toBeNull();
+    expect(container.querySelectorAll('[data-key]').length).toBeLessThan(100);
+  });
+
+  it('reserves the estimated height of rows outside the window', () => {
+    const { container } = render(
+      <VirtualList items={rows} getKey={getKey} renderItem={renderRow} estimateSize={40} />
+    );
+
+    const spacers = Array.from(container.firstElementChild!.children)
+      .filter((el) => !el.hasAttribute('data-key')) as HTMLElement[];
+    const mounted = container.querySelectorAll('[data-key]').length;
+    const bottom = spacers[spacers.length - 1];
+    expect(parseFloat(bottom.style.height)).toBe((rows.length - mounted) * 40);
+  });
+
+  it('keeps the reserved height in step as rows are appended, replaced and removed', () => {
+    const bottomSpacer = (container: HTMLElement) => {
+      const children = Array.from(container.firstElementChild!.children) as HTMLElement[];
+      return parseFloat(children[children.length - 1].style.height);
+    };
+    const mountedCount = (container: HTMLElement) => container.querySelectorAll('[data-key]').length;
+
+    const { container, rerender } = render(
+      <VirtualList items={rows.slice(0, 5_000)} getKey={getKey} renderItem={renderRow} estimateSize={40} />
+    );
+    expect(bottomSpacer(container)).toBe((5_000 - mountedCount(container)) * 40);
+
+    rerender(<VirtualList items={rows} getKey={getKey} renderItem={renderRow} estimateSize={40} />);
+    expect(bottomSpacer(container)).toBe((rows.length - mountedCount(container)) * 40);
+
+    const replaced = [...rows.slice(0, 100), { id: 'inserted', label: 'Inserted' }, ...rows.slice(2_000)];
+    rerender(<VirtualList items={replaced} getKey={getKey} renderItem={renderRow} estimateSize={40} />);
+    expect(bottomSpacer(container)).toBe((replaced.length - mountedCount(container)) * 40);
+
+    rerender(<VirtualList items={rows.slice(0, 10)} getKey={getKey} renderItem={renderRow} estimateSize={25} />);
+    expect(mountedCount(container)).toBe(10);
+    expect(bottomSpacer(container)).toBe(0);
+    expect(screen.queryByText('Row 10')).toBeNull();
+  });
+
+  it('renders the empty state when there are no items', () => {
+    render(
+      <VirtualList items={[] as Row[]} getKey={getKey} renderItem={renderRow} empty={<p>Nothing here</p>} />
+    );
+    expect(screen.getByText('Nothing here')).toBeDefined();
+  });
+});
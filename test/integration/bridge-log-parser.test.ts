@@ -0,0 +1,84 @@
+import { describe, it, expect } from 'vitest';
+import { classifyLogLine, createLogParser } from '@/lib/mentu/bridge-log-parser';
+
+describe('classifyLogLine', () => {
+  it('applies the rules in precedence order', () => {
+    expect(classifyLogLine('[ERROR] boom')).toBe('error');
+    expect(classifyLogLine('TypeError: x is undefined')).toBe('error');
+    expect(classifyLogLine('Starting build')).toBe('system');
+    expect(classifyLogLine('[SYSTEM] ready')).toBe('system');
+    expect(classifyLogLine('Using tool Read')).toBe('tool');
+    expect(classifyLogLine('[12:00] tick')).toBe('tool');
+    expect(classifyLogLine('- [ ] write tests')).toBe('todo');
+    expect(classifyLogLine('TODO: cleanup')).toBe('todo');
+    expect(classifyLogLine('running migrations')).toBe('task');
+    expect(classifyLogLine('Task: deploy')).toBe('task');
+    expect(classifyLogLine('Editing src/app.ts now')).toBe('file');
+    expect(classifyLogLine('wrote package.json: ok')).toBe('file');
+    expect(classifyLogLine('All done')).toBe('agent');
+  });
+
+  it('keeps case-sensitive rules case-sensitive', () => {
+    expect(classifyLogLine('todo later')).toBe('agent');
+    expect(classifyLogLine('starting over')).toBe('agent');
+    expect(classifyLogLine('ERROR: disk full')).toBe('error');
+  });
+
+  it('matches across carriage returns left by progress output', () => {
+    expect(classifyLogLine('50%\rerror: failed')).toBe('error');
+    expect(classifyLogLine('progress\rStarting build')).toBe('system');
+    expect(classifyLogLine('10%\r20%\rdone')).toBe('agent');
+  });
+});
+
+describe('createLogParser', () => {
+  it('produces the same entries regardless of chunk boundaries', () => {
+    const output = 'Starting agent\n\nReading src/index.ts\nAll done\n';
+
+    const whole = createLogParser({ prefix: 'stdout' });
+    const expected = whole.push(output).map(({ id, type, content }) => ({ id, type, content }));
+
+    const chunked = createLogParser({ prefix: 'stdout' });
+    const entries = [];
+    for (let i = 0; i < output.length; i += 3) {
+      entries.push(...chunked.push(output.slice(i, i + 3)));
+    }
+
+    expect(entries.map(({ id, type, content }) => ({ id, type, content }))).toEqual(expected);
+    expect(expected.map((e) => e.id)).toEqual(['stdout-0', 'stdout-2', 'stdout-3']);
+  });
+
+  it('holds the trailing line as a provisional entry until it completes', () => {
+    const parser = createLogParser({ prefix: 'stdout' });
+
+    expect(parser.push('Using tool')).toEqual([]);
+    const first = parser.pending();
+    expect(first).toMatchObject({ id: 'stdout-0', content: 'Using tool', type: 'tool' });
+    expect(parser.pending()).toBe(first);
+
+    const [entry] = parser.push(' Bash\nnext');
+    expect(entry).toMatchObject({ id: 'stdout-0', content: 'Using tool Bash', timestamp: first!.timestamp });
+    expect(parser.pending()).toMatchObject({ id: 'stdout-1', content: 'next' });
+
+    expect(parser.flush()).toMatchObject([{ id: 'stdout-1', content: 'next' }]);
+    expect(parser.pending()).toBeNull();
+  });
+
+  it('forks an independent parser from the current state', () => {
+    const parser = createLogParser({ prefix: 'stdout' });
+    parser.push('first\nsec');
+
+    const fork = parser.fork();
+    expect(fork.push('ond\n')).toMatchObject([{ id: 'stdout-1', content: 'second' }]);
+    expect(fork.pending()).toBeNull();
+
+    // The original still holds its own trailing line
+    expect(parser.pending()).toMatchObject({ id: 'stdout-1', content: 'sec' });
+    expect(parser.push('tion\n')).toMatchObject([{ id: 'stdout-1', content: 'section' }]);
+  });
+
+  it('forces a fixed type when configured', () => {
+    const parser = createLogParser({ prefix: 'stderr', type: 'error' });
+    expect(parser.push('warning: deprecated\n')).toMatchObject([{ id: 'stderr-0', type: 'error' }]);
+  });
+});
@@ -0,0 +1,156 @@
+import { describe, it, expect, beforeAll, beforeEach } from 'vitest';
+import { appendCachedLedger, clearCachedLedger, loadCachedLedger } from '@/lib/mentu/ledger-cache';
+import type { OperationRow, Payload } from '@/lib/mentu/types';
+
+// Minimal in-memory IndexedDB: just the calls ledger-cache.ts makes, with
+// the spec's key ordering (numbers < strings < arrays, arrays element-wise)
+type Key = number | string | Key[];
+
+function compareKeys(a: Key, b: Key): number {
+  const rank = (key: Key) => (Array.isArray(key) ? 2 : typeof key === 'string' ? 1 : 0);
+  if (rank(a) !== rank(b)) return rank(a) - rank(b);
+  if (Array.isArray(a) && Array.isArray(b)) {
+    for (let i = 0; i < Math.min(a.length, b.length); i++) {
+      const c = compareKeys(a[i], b[i]);
+      if (c !== 0) return c;
+    }
+    return a.length - b.length;
+  }
+  return a < b ? -1 : a > b ? 1 : 0;
+}
+
+class FakeKeyRange {
+  constructor(readonly lower: Key, readonly upper: Key) {}
+  static bound(lower: Key, upper: Key) {
+    return new FakeKeyRange(lower, upper);
+  }
+  includes(key: Key) {
+    return compareKeys(this.lower, key) <= 0 && compareKeys(key, this.upper) <= 0;
+  }
+}
+
+function request<T>(run: () => T) {
+  const req: { result?: T; onsuccess?: () => void; onerror?: () => void } = {};
+  queueMicrotask(() => {
+    req.result = run();
+    req.onsuccess?.();
+  });
+  return req;
+}
+
+class FakeStore {
+  rows = new Map<string, { key: Key; value: Record<string, unknown> }>();
+  constructor(readonly keyPath: string | string[]) {}
+
+  private keyOf(value: Record<string, unknown>): Key {
+    return Array.isArray(this.keyPath)
+      ? this.keyPath.map(path => value[path] as Key)
+      : (value[this.keyPath] as Key);
+  }
+
+  private matching(query: Key | FakeKeyRange) {
+    return [...this.rows.values()]
+      .filter(row => (query instanceof FakeKeyRange ? query.includes(row.key) : compareKeys(row.key, query) === 0))
+      .sort((a, b) => compareKeys(a.key, b.key));
+  }
+
+  get(query: Key) {
+    return request(() => this.matching(query)[0]?.value);
+  }
+  getAll(query: FakeKeyRange) {
+    return request(() => this.matching(query).map(row => row.value));
+  }
+  put(value: Record<string, unknown>) {
+    const key = this.keyOf(value);
+    return request(() => this.rows.set(JSON.stringify(key), { key, value: structuredClone(value) }));
+  }
+  delete(query: Key | FakeKeyRange) {
+    return request(() => this.matching(query).forEach(row => this.rows.delete(JSON.stringify(row.key))));
+  }
+  clear() {
+    return request(() => this.rows.clear());
+  }
+}
+
+function installFakeIndexedDB() {
+  const stores = new Map<string, FakeStore>();
+  const db = {
+    objectStoreNames: { contains: (name: string) => stores.has(name) },
+    createObjectStore(name: string, { keyPath }: { keyPath: string | string[] }) {
+      stores.set(name, new FakeStore(keyPath));
+    },
+    transaction() {
+      const tx: { oncomplete?: () => void; objectStore: (name: string) => FakeStore } = {
+        objectStore: (name: string) => stores.get(name)!,
+      };
+      // Requests settle in microtasks, so the transaction completes after them
+      setTimeout(() => tx.oncomplete?.(), 0);
+      return tx;
+    },
+  };
+
+  Object.assign(globalThis, {
+    IDBKeyRange: FakeKeyRange,
+    indexedDB: {
+      open() {
+        const req: { result?: typeof db; onupgradeneeded?: () => void; onsuccess?: () => void } = {};
+        queueMicrotask(() => {
+          req.result = db;
+          req.onupgradeneeded?.();
+          req.onsuccess?.();
+        });
+        return req;
+      },
+    },
+  });
+}
+
+function op(id: string, syncedAt: string | null, workspaceId = 'ws_cache'): OperationRow {
+  return {
+    id,
+    workspace_id: workspaceId,
+    op: 'capture',
+    ts: '2026-01-01T00:00:00.000Z',
+    actor: 'agent:bridge',
+    payload: { body: id } as unknown as Payload,
+    client_id: null,
+    synced_at: syncedAt,
+  };
+}
+
+describe('Persistent ledger cache', () => {
+  beforeAll(() => installFakeIndexedDB());
+  beforeEach(() => clearCachedLedger());
+
+  it('returns null for a workspace without a cached ledger', async () => {
+    expect(await loadCachedLedger('ws_cache')).toBeNull();
+  });
+
+  it('loads appended rows in ledger order with unsynced rows first', async () => {
+    await appendCachedLedger(
+      'ws_cache',
+      [op('b', '2026-01-01T00:00:02.000Z'), op('a', '2026-01-01T00:00:01.000Z'), op('u', null)],
+      { synced_at: '2026-01-01T00:00:02.000Z', id: 'b' }
+    );
+    await appendCachedLedger('ws_cache', [op('c', '2026-01-01T00:00:03.000Z')], {
+      synced_at: '2026-01-01T00:00:03.000Z',
+      id: 'c',
+    });
+
+    const cached = await loadCachedLedger('ws_cache');
+    expect(cached?.ops.map(o => o.id)).toEqual(['u', 'a', 'b', 'c']);
+    expect(cached?.cursor).toEqual({ synced_at: '2026-01-01T00:00:03.000Z', id: 'c' });
+  });
+
+  it('keeps workspaces apart and clears one at a time', async () => {
+    const cursor = { synced_at: '2026-01-01T00:00:01.000Z', id: 'a' };
+    await appendCachedLedger('ws_cache', [op('a', cursor.synced_at)], cursor);
+    await appendCachedLedger('ws_other', [op('x', cursor.synced_at, 'ws_other')], cursor);
+
+    expect((await loadCachedLedger('ws_other'))?.ops.map(o => o.id)).toEqual(['x']);
+
+    await clearCachedLedger('ws_cache');
+    expect(await loadCachedLedger('ws_cache')).toBeNull();
+    expect((await loadCachedLedger('ws_other'))?.ops.map(o => o.id)).toEqual(['x']);
+  });
+});
@@ -0,0 +1,111 @@
+import { describe, it, expect } from 'vitest';
+import {
+  computeCommitments,
+  computeMemories,
+  computeStats,
+  getCommitment,
+  getCommitmentTimeline,
+  getCommitmentsFromSource,
+  getCommitmentsWithEvidence,
+  getExternalRefs,
+} from '@/lib/mentu/state';
+import { applyOperation, buildLedgerIndex } from '@/lib/mentu/ledger-index';
+import type { OperationRow, OperationType, Payload } from '@/lib/mentu/types';
+
+let seq = 0;
+function op(kind: OperationType, payload: Record<string, unknown>, overrides: Partial<OperationRow> = {}): OperationRow {
+  seq++;
+  return {
+    id: overrides.id ?? `op_${seq}`,
+    workspace_id: 'ws_test',
+    op: kind,
+    ts: overrides.ts ?? new Date(Date.UTC(2026, 0, 1, 0, seq)).toISOString(),
+    actor: overrides.actor ?? 'user:test',
+    payload: payload as unknown as Payload,
+    client_id: null,
+    synced_at: null,
+  };
+}
+
+describe('Ledger state projection', () => {
+  const ledger: OperationRow[] = [
+    op('capture', { body: 'Bug: login fails', kind: 'bug' }, { id: 'mem_1' }),
+    op('commit', { body: 'Fix login', source: 'mem_1' }, { id: 'cmt_1' }),
+    op('commit', { body: 'Write docs', source: 'mem_1' }, { id: 'cmt_2' }),
+    op('claim', { commitment: 'cmt_1' }, { actor: 'agent:claude' }),
+    op('annotate', { target: 'cmt_1', body: 'PR #12', kind: 'external_ref' }),
+    op('capture', { body: 'Tests pass', kind: 'evidence' }, { id: 'mem_2' }),
+    op('close', { commitment: 'cmt_1', evidence: 'mem_2' }, { actor: 'agent:claude' }),
+    op('claim', { commitment: 'cmt_2' }),
+    op('submit', { commitment: 'cmt_2' }),
+  ];
+
+  it('replays commitment lifecycle', () => {
+    const [first, second] = computeCommitments(ledger);
+    expect(first.state).toBe('closed');
+    expect(first.evidence).toBe('mem_2');
+    expect(first.closed_by).toBe('agent:claude');
+    expect(first.owner).toBeNull();
+    expect(second.state).toBe('in_review');
+    expect(second.owner).toBe('user:test');
+  });
+
+  it('applies operations that arrive before their commit', () => {
+    const outOfOrder = [
+      op('claim', { commitment: 'cmt_late' }, { actor: 'agent:bridge' }),
+      op('commit', { body: 'Late', source: 'mem_x' }, { id: 'cmt_late' }),
+    ];
+    const commitment = getCommitment(outOfOrder, 'cmt_late');
+    expect(commitment?.state).toBe('claimed');
+    expect(commitment?.owner).toBe('agent:bridge');
+  });
+
+  it('attaches annotations and external refs', () => {
+    expect(getCommitment(ledger, 'cmt_1')?.annotations).toHaveLength(1);
+    expect(getExternalRefs(ledger, 'cmt_1').map(a => a.body)).toEqual(['PR #12']);
+    expect(computeMemories(ledger).map(m => m.id)).toEqual(['mem_1', 'mem_2']);
+  });
+
+  it('keeps built records immutable when annotations arrive later', () => {
+    const noisy = [
+      ...ledger,
+      ...Array.from({ length: 50 }, () => op('annotate', { target: 'cmt_2', body: 'ping', kind: 'bot' })),
+    ];
+    const index = buildLedgerIndex(noisy);
+    const before = index.commitments.get('cmt_2')!;
+    expect(before.annotations).toHaveLength(50);
+
+    applyOperation(index, op('annotate', { target: 'cmt_2', body: 'late', kind: 'bot' }));
+    expect(before.annotations).toHaveLength(50);
+    expect(index.commitments.get('cmt_2')!.annotations).toHaveLength(51);
+  });
+
+  it('returns a chronological timeline', () => {
+    const timeline = getCommitmentTimeline(ledger, 'cmt_1');
+    expect(timeline.map(o => o.op)).toEqual(['commit', 'claim', 'annotate', 'close']);
+  });
+
+  it('looks up commitments by source and evidence', () => {
+    expect(getCommitmentsFromSource(ledger, 'mem_1').map(c => c.id)).toEqual(['cmt_1', 'cmt_2']);
+    expect(getCommitmentsWithEvidence(ledger, 'mem_2').map(c => c.id)).toEqual(['cmt_1']);
+  });
+
+  it('ignores duplicate operation rows', () => {
+    const duplicated = [...ledger, ledger[4]];
+    expect(getCommitment(duplicated, 'cmt_1')?.annotations).toHaveLength(1);
+  });
+
+  it('computes workspace stats', () => {
+    const recent = new Date().toISOString();
+    const stats = computeStats([
+      ...ledger,
+      op('commit', { body: 'Ship it', source: 'mem_1' }, { id: 'cmt_3', ts: recent }),
+      op('close', { commitment: 'cmt_3', evidence: 'mem_2' }, { ts: recent }),
+    ]);
+    expect(stats.openCount).toBe(0);
+    expect(stats.closedCount).toBe(2);
+    expect(stats.closedThisWeek).toBe(1);
+    expect(stats.totalMemories).toBe(2);
+    expect(stats.activeActors.has('agent:claude')).toBe(true);
+  });
+});
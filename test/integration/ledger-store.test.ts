@@ -0,0 +1,170 @@
+import { describe, it, expect, beforeEach } from 'vitest';
+import {
+  applyLedgerOperation,
+  getLedgerSnapshot,
+  resetLedger,
+  seedLedger,
+  subscribeLedger,
+} from '@/lib/mentu/ledger-store';
+import { computeStats, getCommitmentTimeline } from '@/lib/mentu/state';
+import type { OperationRow, OperationType, Payload } from '@/lib/mentu/types';
+
+function op(id: string, kind: OperationType, payload: Record<string, unknown>, minute: number): OperationRow {
+  return {
+    id,
+    workspace_id: 'ws_store',
+    op: kind,
+    ts: new Date(Date.UTC(2026, 0, 1, 0, minute)).toISOString(),
+    actor: 'agent:bridge',
+    payload: payload as unknown as Payload,
+    client_id: null,
+    synced_at: null,
+  };
+}
+
+describe('Incremental ledger store', () => {
+  beforeEach(() => resetLedger());
+
+  const seed = [
+    op('cmt_1', 'commit', { body: 'First', source: 'mem_1' }, 1),
+    op('cmt_2', 'commit', { body: 'Second', source: 'mem_1' }, 2),
+  ];
+
+  it('applies realtime operations without touching unrelated commitments', () => {
+    seedLedger('ws_store', seed);
+    const before = getLedgerSnapshot('ws_store');
+    const [first, second] = before.commitments;
+
+    expect(applyLedgerOperation('ws_store', op('op_1', 'claim', { commitment: 'cmt_1' }, 3))).toBe(true);
+
+    const after = getLedgerSnapshot('ws_store');
+    expect(after).not.toBe(before);
+    expect(after.version).toBeGreaterThan(before.version);
+    expect(after.commitments[0]).not.toBe(first);
+    expect(after.commitments[0].state).toBe('claimed');
+    expect(after.commitments[1]).toBe(second);
+    expect(before.commitments[0].state).toBe('open');
+  });
+
+  it('deduplicates operations by id', () => {
+    seedLedger('ws_store', seed);
+    const claim = op('op_1', 'claim', { commitment: 'cmt_1' }, 3);
+    expect(applyLedgerOperation('ws_store', claim)).toBe(true);
+    expect(applyLedgerOperation('ws_store', claim)).toBe(false);
+    expect(applyLedgerOperation('ws_store', seed[0])).toBe(false);
+    expect(getLedgerSnapshot('ws_store').operations).toHaveLength(3);
+  });
+
+  it('keeps realtime operations across a reseed and ignores repeated seeds', () => {
+    seedLedger('ws_store', seed);
+    applyLedgerOperation('ws_store', op('op_1', 'close', { commitment: 'cmt_2', evidence: 'mem_1' }, 3));
+    const version = getLedgerSnapshot('ws_store').version;
+
+    seedLedger('ws_store', seed);
+    expect(getLedgerSnapshot('ws_store').version).toBe(version);
+
+    seedLedger('ws_store', [...seed]);
+    expect(getLedgerSnapshot('ws_store').getCommitment('cmt_2')?.state).toBe('closed');
+  });
+
+  it('applies only the appended tail when a delta fetch extends the ledger', () => {
+    seedLedger('ws_store', seed);
+    const [first] = getLedgerSnapshot('ws_store').commitments;
+
+    seedLedger('ws_store', seed.concat([op('op_1', 'claim', { commitment: 'cmt_2' }, 3)]));
+
+    const snapshot = getLedgerSnapshot('ws_store');
+    expect(snapshot.commitments[0]).toBe(first);
+    expect(snapshot.getCommitment('cmt_2')?.state).toBe('claimed');
+    expect(snapshot.operations).toHaveLength(3);
+  });
+
+  it('keeps earlier snapshots unchanged by later operations', () => {
+    seedLedger('ws_store', seed);
+    const before = getLedgerSnapshot('ws_store');
+
+    applyLedgerOperation('ws_store', op('op_1', 'annotate', { target: 'cmt_1', body: 'Note' }, 3));
+    applyLedgerOperation('ws_store', op('cmt_3', 'commit', { body: 'Third', source: 'mem_1' }, 4));
+    applyLedgerOperation('ws_store', op('mem_2', 'capture', { body: 'Later' }, 5));
+    const after = getLedgerSnapshot('ws_store');
+
+    expect(before.commitments).toHaveLength(2);
+    expect(before.memories).toHaveLength(0);
+    expect(before.getCommitment('cmt_1')?.annotations).toHaveLength(0);
+    expect(before.getCommitment('cmt_3')).toBeNull();
+    expect(before.getMemory('mem_2')).toBeNull();
+    expect(before.size).toBe(2);
+
+    expect(after.commitments.map(c => c.id)).toEqual(['cmt_1', 'cmt_2', 'cmt_3']);
+    expect(after.getCommitment('cmt_1')?.annotations).toHaveLength(1);
+    expect(after.getMemory('mem_2')?.body).toBe('Later');
+    expect(after.opCounts).toEqual({ commit: 3, annotate: 1, capture: 1 });
+  });
+
+  it('maintains stats incrementally, matching a full computation', () => {
+    const recent = (minute: number) => new Date(Date.now() - (60 - minute) * 60 * 1000).toISOString();
+    const live = (id: string, kind: OperationType, payload: Record<string, unknown>, minute: number) => ({
+      ...op(id, kind, payload, minute),
+      ts: recent(minute),
+    });
+
+    seedLedger('ws_store', seed);
+    const before = getLedgerSnapshot('ws_store');
+    const ops = [
+      live('mem_2', 'capture', { body: 'Evidence' }, 1),
+      live('op_1', 'claim', { commitment: 'cmt_1' }, 2),
+      live('op_2', 'close', { commitment: 'cmt_1', evidence: 'mem_2' }, 3),
+      live('op_3', 'reopen', { commitment: 'cmt_2' }, 4),
+      live('op_4', 'close', { commitment: 'cmt_2', evidence: 'mem_2' }, 5),
+      live('op_5', 'reopen', { commitment: 'cmt_2' }, 6),
+    ];
+    for (const next of ops) {
+      applyLedgerOperation('ws_store', { ...next, actor: `agent:${next.id}` });
+      getLedgerSnapshot('ws_store');
+    }
+
+    const after = getLedgerSnapshot('ws_store');
+    expect(after.stats).toEqual(computeStats(after.operations));
+    expect(after.stats.closedCount).toBe(1);
+    expect(after.stats.closedThisWeek).toBe(1);
+    expect(before.stats.openCount).toBe(2);
+    expect(before.stats.activeActors.size).toBe(1);
+  });
+
+  it('copies only the chunks holding changed records', () => {
+    const many = Array.from({ length: 600 }, (_, i) =>
+      op(`cmt_${i}`, 'commit', { body: `Commitment ${i}`, source: 'mem_1' }, 1)
+    );
+    seedLedger('ws_store', many);
+    const before = getLedgerSnapshot('ws_store');
+
+    applyLedgerOperation('ws_store', op('op_1', 'claim', { commitment: 'cmt_599' }, 2));
+    const after = getLedgerSnapshot('ws_store');
+
+    expect(after.getCommitment('cmt_599')?.state).toBe('claimed');
+    expect(before.getCommitment('cmt_599')?.state).toBe('open');
+    expect(after.getCommitment('cmt_0')).toBe(before.getCommitment('cmt_0'));
+    expect(after.commitments).toHaveLength(600);
+  });
+
+  it('reuses the live index for state lookups on snapshot operations', () => {
+    seedLedger('ws_store', seed);
+    applyLedgerOperation('ws_store', op('op_1', 'claim', { commitment: 'cmt_1' }, 3));
+    const { operations } = getLedgerSnapshot('ws_store');
+    expect(getCommitmentTimeline(operations, 'cmt_1').map(o => o.op)).toEqual(['commit', 'claim']);
+  });
+
+  it('coalesces notifications for a burst of inserts', async () => {
+    seedLedger('ws_store', seed);
+    await Promise.resolve();
+
+    let calls = 0;
+    const unsubscribe = subscribeLedger('ws_store', () => calls++);
+    applyLedgerOperation('ws_store', op('op_1', 'claim', { commitment: 'cmt_1' }, 3));
+    applyLedgerOperation('ws_store', op('op_2', 'claim', { commitment: 'cmt_2' }, 4));
+    await Promise.resolve();
+    unsubscribe();
+
+    expect(calls).toBe(1);
+  });
+});
@@ -0,0 +1,89 @@
+import { describe, it, expect } from 'vitest';
+import {
+  deltaStart,
+  highWaterMark,
+  keysetWindows,
+  laterCursor,
+  mergeDelta,
+} from '@/lib/mentu/ledger-sync';
+import type { OperationRow, Payload } from '@/lib/mentu/types';
+
+function op(id: string, syncedAt: string | null): OperationRow {
+  return {
+    id,
+    workspace_id: 'ws_sync',
+    op: 'capture',
+    ts: '2026-01-01T00:00:00.000Z',
+    actor: 'agent:bridge',
+    payload: { body: id } as unknown as Payload,
+    client_id: null,
+    synced_at: syncedAt,
+  };
+}
+
+describe('Ledger keyset windows', () => {
+  const last = { synced_at: '2026-01-01T00:00:00.000Z', id: 'op_999' };
+
+  it('splits the remaining span into contiguous windows, the last open-ended', () => {
+    const windows = keysetWindows(last, '2026-01-01T00:00:04.001Z', 4);
+
+    expect(windows).toHaveLength(4);
+    // The first window continues right after the first page's last row
+    expect(windows[0].after).toEqual(last);
+    for (let i = 1; i < windows.length; i++) {
+      expect(windows[i].after).toEqual({ synced_at: windows[i - 1].until });
+    }
+    expect(windows.slice(0, 3).map(w => w.until)).toEqual([
+      '2026-01-01T00:00:01.001Z',
+      '2026-01-01T00:00:02.001Z',
+      '2026-01-01T00:00:03.001Z',
+    ]);
+    expect(windows[3].until).toBeNull();
+  });
+
+  it('uses one open-ended window when there is no span to split', () => {
+    expect(keysetWindows(last, last.synced_at, 4)).toEqual([{ after: last, until: null }]);
+    expect(keysetWindows(last, null, 4)).toEqual([{ after: last, until: null }]);
+  });
+});
+
+describe('Ledger delta merge', () => {
+  it('tracks the newest synced row as the high-water mark', () => {
+    const ops = [op('a', '2026-01-01T00:00:01.000Z'), op('b', '2026-01-01T00:00:02.000Z'), op('c', null)];
+    expect(highWaterMark(ops)).toEqual({ synced_at: '2026-01-01T00:00:02.000Z', id: 'b' });
+    expect(highWaterMark([op('c', null)])).toBeNull();
+  });
+
+  it('orders cursors by synced_at, then id', () => {
+    const a = { synced_at: '2026-01-01T00:00:01.000Z', id: 'b' };
+    const b = { synced_at: '2026-01-01T00:00:01.000Z', id: 'a' };
+    const c = { synced_at: '2026-01-01T00:00:00.500Z', id: 'z' };
+    expect(laterCursor(a, b)).toBe(a);
+    expect(laterCursor(c, a)).toBe(a);
+  });
+
+  it('starts the delta an overlap window behind the mark', () => {
+    expect(deltaStart({ synced_at: '2026-01-01T00:00:10.000Z', id: 'x' }, 5000)).toEqual({
+      synced_at: '2026-01-01T00:00:05.000Z',
+    });
+  });
+
+  it('drops overlapping rows and keeps late and unsynced ones once', () => {
+    const base = [op('a', '2026-01-01T00:00:08.000Z'), op('b', '2026-01-01T00:00:10.000Z'), op('u1', null)];
+    const known = new Set(base.map(o => o.id));
+
+    const unsynced = [op('u1', null), op('u2', null)];
+    const synced = [
+      op('late', '2026-01-01T00:00:07.000Z'),
+      op('a', '2026-01-01T00:00:08.000Z'),
+      op('b', '2026-01-01T00:00:10.000Z'),
+      // Synced between the two queries: also returned as unsynced
+      op('u2', '2026-01-01T00:00:11.000Z'),
+      op('new', '2026-01-01T00:00:12.000Z'),
+    ];
+
+    const delta = mergeDelta(known, [unsynced, synced]);
+    expect(delta.map(o => o.id)).toEqual(['u2', 'late', 'new']);
+    expect(known.size).toBe(6);
+  });
+});
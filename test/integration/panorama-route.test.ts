@@ -0,0 +1,109 @@
+// @vitest-environment node
+import { describe, it, expect, beforeEach, vi } from 'vitest';
+
+type Result = { data: unknown; error: { message: string } | null };
+
+// Queries issued by the route, as "<table>:<columns>"
+const queries: string[] = [];
+let results: Record<string, Result>;
+
+function query(table: string) {
+  let columns = '';
+  const builder = {
+    select(selected: string) {
+      columns = selected;
+      queries.push(`${table}:${selected}`);
+      return builder;
+    },
+    eq: () => builder,
+    in: () => builder,
+    not: () => builder,
+    order: () => builder,
+    then(resolve: (result: Result) => void) {
+      resolve(results[`${table}:${columns}`] ?? { data: [], error: null });
+    },
+  };
+  return builder;
+}
+
+vi.mock('@/lib/supabase/server', () => ({
+  createClient: async () => ({
+    auth: { getUser: async () => ({ data: { user: { id: 'user_1' } } }) },
+    rpc: async (name: string) => {
+      queries.push(`rpc:${name}`);
+      return results[`rpc:${name}`];
+    },
+    from: query,
+  }),
+}));
+
+const { GET } = await import('@/app/api/panorama/route');
+
+function summary(openCount: number) {
+  return {
+    workspace_id: 'ws_1',
+    open_count: openCount,
+    claimed_count: 0,
+    in_review_count: 0,
+    closed_count: 0,
+    closed_this_week: 0,
+    memories: 2,
+    active_actors: 1,
+    last_activity_at: '2026-01-01T00:00:00.000Z',
+    updated_at: '2026-01-01T00:00:00.000Z',
+  };
+}
+
+function get(etag?: string) {
+  return GET(
+    new Request('http://localhost/api/panorama', {
+      headers: etag ? { 'If-None-Match': etag } : {},
+    })
+  );
+}
+
+describe('Panorama route ETags', () => {
+  beforeEach(() => {
+    queries.length = 0;
+    results = {
+      'rpc:get_panorama_summary': { data: [summary(1)], error: null },
+      'workspaces:id, name, display_name': {
+        data: [{ id: 'ws_1', name: 'alpha', display_name: 'Alpha' }],
+        error: null,
+      },
+      'workflow_instances:id, updated_at': { data: [], error: null },
+    };
+  });
+
+  it('answers a matching If-None-Match with 304 before reading instance details', async () => {
+    const first = await get();
+    expect(first.status).toBe(200);
+    const etag = first.headers.get('ETag')!;
+    expect(etag).toMatch(/^W\/".+"$/);
+    expect((await first.json()).workspaces[0].stats.open).toBe(1);
+
+    queries.length = 0;
+    const second = await get(etag);
+    expect(second.status).toBe(304);
+    expect(second.headers.get('ETag')).toBe(etag);
+    expect(queries).not.toContain('workflow_instances:*, workflows(name, workspace_id)');
+  });
+
+  it('changes the ETag when the summary changes', async () => {
+    const etag = (await get()).headers.get('ETag')!;
+
+    results['rpc:get_panorama_summary'] = { data: [summary(2)], error: null };
+    const changed = await get(etag);
+    expect(changed.status).toBe(200);
+    expect(changed.headers.get('ETag')).not.toBe(etag);
+    expect((await changed.json()).workspaces[0].stats.open).toBe(2);
+  });
+
+  it('fails instead of caching when the workflow version query fails', async () => {
+    results['workflow_instances:id, updated_at'] = { data: null, error: { message: 'timeout' } };
+
+    const response = await get();
+    expect(response.status).toBe(500);
+    expect(response.headers.get('ETag')).toBeNull();
+  });
+});